@@ -76,7 +76,10 @@
 
 # import  required libraries
 import pandas as pd
-import re
+
+from superstore.models import Customer, Category, Product, Shipment, Order
+from superstore.scenarios import (create_customer_orders, display_order_summaries,
+                                  create_sample_orders, analyse_regional_sales)
 
 # Load CSV File
 csv_file_path = "Sample - Superstore.csv"  # Load the Superstore dataset from the current project folder
@@ -205,144 +208,36 @@ print("\nData Profiling Complete.")
 print("="*80)
 
 # ======================================================
-# Class 1: Customer
-# Demonstrates Encapsulation and Abstraction
-# ======================================================
-
-class Customer:
-    def __init__(self, customer_id, customer_name, region):
-        self.customer_id = customer_id
-        self.customer_name = customer_name
-        self.region = region
-
-    def get_customer_name(self):  # Getter method to access private attribute (Encapsulation)
-        return self.customer_name
-
-    def get_region(self):
-        return self.region
-
-    # Example of abstraction: hiding how info is formatted
-    def get_customer_info(self):
-        return f"{self.customer_name} (ID: {self.customer_id}) - Region: {self.region}"
-        # Returns formatted customer info without shouwing how it's constructed
-
-    # Example of a class method: counts total unique customers
-    @classmethod
-    def count_customers(cls, dataframe):  # Uses pandas to count unique Customer IDs in the dataset
-        return dataframe["Customer ID"].nunique()
-
-    @staticmethod
-    def validate_customer_id(customer_id):
-        """
-        Validates that the customer ID follows the format 'AA-12345'
-          - Starts with two uppercase letters
-          - Followed by a hyphen '-'
-          - Followed by exactly 5 digits
-        """
-        pattern = r"^[A-Z]{2}-\d{5}$"
-        return bool(re.match(pattern, customer_id))
-
-
-# ======================================================
-# CLASS 2: Category
-# Demonstrates simple data grouping
-# ======================================================
-class Category:
-    def __init__(self, category_name, sub_category):  # Store category and sub-category names
-
-        self.category_name = category_name
-        self.sub_category = sub_category
-
-    def show_info(self):
-        # Returns formatted category info
-        return f"Category: {self.category_name} | Sub-category: {self.sub_category}"
-
-
-# ======================================================
-# CLASS 3: Product
-# Demonstrates Constructors, Instance Methods, and Abstraction
-# ======================================================
-class Product:
-    # Store key attributes about the product
-    def __init__(self, product_id, category, sub_category, name, sales, quantity, discount, profit):
-        self.product_id = product_id
-        self.category = category
-        self.sub_category = sub_category
-        self.name = name
-        self.sales = sales
-        self.quantity = quantity
-        self.discount = discount
-        self.profit = profit
-
-    def total_sales(self):
-        # Calculates total sales value
-        return self.sales * self.quantity
-
-    def profit_margin(self):
-        # Calculates profit percentage safely
-        return (self.profit / self.sales) * 100 if self.sales > 0 else 0
-
-    def show_info(self):
-        # Polymorphism: similar method name used in other classes but with different meaning
-        return f"Product: {self.name} | Sales: ${self.sales:.2f} | Profit Margin: {self.profit_margin():.2f}%"
-
-
-# ======================================================
-# CLASS 4: Shipment
-# Demonstrates basic data representation and Abstraction
-# ======================================================
-
-class Shipment:
-    def __init__(self, ship_mode, ship_date, city):
-        # Store delivery information
-        self.ship_mode = ship_mode
-        self.ship_date = ship_date
-        self.city = city
-
-    def show_info(self):
-        # Returns formatted delivery information
-        return f"Shipped via {self.ship_mode} to {self.city} on {self.ship_date}"
-
-
-# ======================================================
-# CLASS 5: Order (inherits from Product)
-# Demonstrates Inheritance and Polymorphism
-
+# CLASS DEFINITIONS
+# The classes were first written in this script. They now live in
+# superstore/models.py (imported at the top) so the other Task scripts and the
+# command line tool reuse the same code. Their outline, and where each OOP
+# concept appears:
+#
+# class Customer:                                  Encapsulation and Abstraction
+#     __init__(customer_id, customer_name, region)
+#     get_customer_name(), get_region()            getters (Encapsulation)
+#     get_customer_info()                          hides the formatting (Abstraction)
+#     @classmethod count_customers(dataframe)      class method
+#     @staticmethod validate_customer_id(id)       static method, 'AA-12345' format
+#
+# class Category:                                  simple data grouping
+#     __init__(category_name, sub_category), show_info()
+#
+# class Product:                                   Constructors and Instance Methods
+#     __init__(product_id, category, sub_category, name, sales, quantity, discount, profit)
+#     total_sales(), profit_margin(), show_info()
+#
+# class Shipment:                                  basic data representation
+#     __init__(ship_mode, ship_date, city), show_info()
+#
+# class Order(Product):                            Inheritance and Polymorphism
+#     __init__(order_id, order_date, customer, ...product fields)  calls super().__init__()
+#     total_sales()                                overrides Product.total_sales()
+#     discounted_total(), order_summary()
+#     @classmethod from_dataset(row)               builds the Customer and the Order from one row
 # ======================================================
 
-class Order(Product):
-    def __init__(self, order_id, order_date, customer: Customer, product_id, category, sub_category,
-                 name, sales, quantity, discount, profit):
-        # Reuse attributes from Product using inheritance
-        super().__init__(product_id, category, sub_category, name, sales, quantity, discount, profit)
-        # Add orderspecific attributes
-        self.order_id = order_id
-        self.order_date = order_date
-        self.customer = customer
-
-    def discounted_total(self):
-        # Abstraction: hides formula logic, just gives result
-        return self.sales * self.quantity * (1 - self.discount)
-
-    def total_sales(self):
-        # Polymorphism: overrides total_sales() method in Product
-        return self.sales * self.quantity * (1 - self.discount)
-
-    def order_summary(self):
-        # Returns full order summary
-        return (f"Order ID: {self.order_id} | Customer: {self.customer.get_customer_name()} | "
-                f"Product: {self.name} | Total after discount: ${self.total_sales():.2f}")
-
-    @classmethod
-    def from_dataset(cls, row):
-        # Creates customer automatically from dataset row
-        customer = Customer(row['Customer ID'], row['Customer Name'], row['Region'])
-        # Create order using dataset info
-        return cls(row['Order ID'], row['Order Date'], customer,
-                   row['Product ID'], row['Category'], row['Sub-Category'],
-                   row['Product Name'], row['Sales'], row['Quantity'],
-                   row['Discount'], row['Profit'])
-
 
 # ==================================
 # CREATE OBJECTS FROM EACH CLASS
@@ -393,67 +288,7 @@ print("BUSINESS SCENARIO 1: PRODUCT PERFOMANCE ANALYSIS")
 # ==========================================================
 
 
-def create_customer_orders(dataframe):
-    """Creates and returns a list of Order objects with linked Customer and Product details."""
-    orders = []
-
-    # Use the first 5 rows to create sample orders for demonstration
-    for _, row in dataframe.head(5).iterrows():
-        # Create a Customer object
-        customer = Customer(row['Customer ID'], row['Customer Name'], row['Region'])
-
-        # Create an Order object using inherited Product attributes
-        order = Order(
-            order_id=row['Order ID'],
-            order_date=row['Order Date'],
-            customer=customer,
-            product_id=row['Product ID'],
-            category=row['Category'],
-            sub_category=row['Sub-Category'],
-            name=row['Product Name'],
-            sales=row['Sales'],
-            quantity=row['Quantity'],
-            discount=row['Discount'],
-            profit=row['Profit']
-        )
-
-        # Add the new order to the list
-        orders.append(order)
-
-    return orders
-
-
-def display_order_summaries(orders):
-    """Prints a summary of each order, showing customer info, sales, discount, and profit margin."""
-    print("\n*** CUSTOMER ORDER SUMMARY AND PROFIT ANALYSIS ***\n")
-
-    total_sales = 0
-    total_profit = 0
-
-    # Loop through each order object
-    for order in orders:
-        # Print readable summary for each order
-        print(f"Order ID: {order.order_id}")
-        print(f"Customer: {order.customer.get_customer_info()}")  # Uses encapsulated getter
-        print(f"Product: {order.name} ({order.category} - {order.sub_category})")
-        print(f"Quantity: {order.quantity}")
-        print(f"Sales (before discount): ${order.sales * order.quantity:.2f}")
-        print(f"Discount Applied: {order.discount * 100:.0f}%")
-        print(f"Final Total (after discount): ${order.discounted_total():.2f}")
-        print(f"Profit Margin: {order.profit_margin():.2f}%")
-        print("-" * 80)
-
-        # Keep running totals for business reporting
-        total_sales += order.discounted_total()
-        total_profit += order.profit
-
-    # Display overall totals
-    print("\n *** OVERALL BUSINESS PERFORMANCE ***")
-    print(f"Total Orders: {len(orders)}")
-    print(f"Total Sales (after discount): ${total_sales:.2f}")
-    print(f"Total Profit: ${total_profit:.2f}")
-    print(f"Average Profit Margin: {(total_profit / total_sales) * 100:.2f}%")
-    print("====================================================================\n")
+# create_customer_orders() and display_order_summaries() are defined in superstore/scenarios.py
 
 
 # RUN THE SCENARIO ==============
@@ -469,83 +304,7 @@ display_order_summaries(customer_orders)
 # SCENARIO 2: Regional Sales and Shipping Efficiency Report
 # ==========================================================
 
-import datetime
-
-
-# Function to simulate creation of Order and Shipment objects from a few dataset rows
-def create_sample_orders(dataframe):
-    """Creates a list of Order objects using sample rows from the dataset."""
-    sample_orders = []
-
-    # Take only the first 10 rows for demonstration purposes
-    for _, row in dataframe.head(10).iterrows():
-        # Create a Customer object
-        customer = Customer(row["Customer ID"], row["Customer Name"], row["Region"])
-
-        # Create a Shipment object
-        shipment = Shipment(row["Ship Mode"], row["Ship Date"], row["City"])
-
-        # Create an Order object (inherits Product details)
-        order = Order(
-            order_id=row["Order ID"],
-            order_date=row["Order Date"],
-            customer=customer,
-            product_id=row["Product ID"],
-            category=row["Category"],
-            sub_category=row["Sub-Category"],
-            name=row["Product Name"],
-            sales=row["Sales"],
-            quantity=row["Quantity"],
-            discount=row["Discount"],
-            profit=row["Profit"]
-        )
-
-        # Attach shipment to the order (composition relationship)
-        order.shipment = shipment
-
-        # Add to the list
-        sample_orders.append(order)
-
-    return sample_orders
-
-
-# Function to calculate regional performance
-def analyse_regional_sales(orders):
-    """Groups orders by region and calculates key metrics (total sales, order count, average shipping delay)."""
-
-    region_data = {}
-
-    for order in orders:
-        region = order.customer.get_region()  # Get region from Customer object
-        ship_date = pd.to_datetime(order.shipment.ship_date)
-        order_date = pd.to_datetime(order.order_date)
-
-        # Calculate shipping delay in days
-        shipping_delay = (ship_date - order_date).days
-
-        # Add region data if not already
-        if region not in region_data:
-            region_data[region] = {
-                "total_sales": 0,
-                "order_count": 0,
-                "total_shipping_delay": 0
-            }
-
-        # Update metrics for the region
-        region_data[region]["total_sales"] += order.total_sales()
-        region_data[region]["order_count"] += 1
-        region_data[region]["total_shipping_delay"] += shipping_delay
-
-    # Print region-wise summary
-    print("\n *** REGIONAL SALES AND SHIPPING EFFICIENCY REPORT ***\n")
-    print("*" * 50)
-    for region, stats in region_data.items():
-        avg_delay = stats["total_shipping_delay"] / stats["order_count"]
-        print(f"Region: {region}")
-        print(f"  Total Orders: {stats['order_count']}")
-        print(f"  Total Sales: ${stats['total_sales']:.2f}")
-        print(f"  Average Shipping Delay: {avg_delay:.1f} days")
-        print("-" * 55)
+# create_sample_orders() and analyse_regional_sales() are defined in superstore/scenarios.py
 
 
 # ============= RUN THE SCENARIO ==============
@@ -53,6 +53,9 @@
 import pandas as pd
 import numpy as np
 
+from superstore import reports
+from superstore.loader import prepare_dataset
+
 # Load CSV File
 csv_file_path = "Sample - Superstore.csv"  # Load the Superstore dataset from the current project folder
 github_url = "https://github.com/AviPerera/ANA203_Assignment2/blob/master/Sample%20-%20Superstore.csv"
@@ -181,9 +184,11 @@ print("="*80)
 print("\nDataset loaded successfully for NumPy analysis!")
 print("=" * 50)
 
-# Convert the date columns so we can work with them properly
-df['Order Date'] = pd.to_datetime(df['Order Date'])
-df['Ship Date'] = pd.to_datetime(df['Ship Date'])
+# Convert the date columns so we can work with them properly.
+# prepare_dataset detects the date format once and parses each distinct date string only once,
+# stores the dates as compact day numbers (plus the shipping delay in days), and stores
+# compact int8 bin codes for every registered band (discount, sales size, quantity)
+prepare_dataset(df)
 
 print("="*50)
 print("SUPERSTORE DATA EXPLORATION")
@@ -196,20 +201,9 @@ print("\n" + "="*80)
 print("1. Sales and Profit by Category and Region")
 print("="*80)
 
-# Group the data by category and region, then add up sales and profit
-category_region_analysis = df.groupby(['Category', 'Region']).agg({
-    'Sales': 'sum',      # Add up all the sales
-    'Profit': 'sum',     # Add up all the profit
-    'Order ID': 'count'  # Count how many orders there were
-}).round(2)
-
-# Make the column name clearer
-category_region_analysis.rename(columns={'Order ID': 'Order Count'}, inplace=True)
-
-# Calculate profit margin - this shows us how much profit we make per dollar of sales
-category_region_analysis['Profit Margin (%)'] = (
-    (category_region_analysis['Profit'] / category_region_analysis['Sales']) * 100
-).round(2)
+# Group the data by category and region, then add up sales, profit and the number of orders,
+# and calculate profit margin - this shows us how much profit we make per dollar of sales
+category_region_analysis = reports.category_region(df)
 
 print(category_region_analysis)
 
@@ -227,24 +221,9 @@ print("\n" + "="*80)
 print("2. TOP 10 MOST PROFITABLE PRODUCTS")
 print("="*80)
 
-# Group by product name and calculate totals
-product_profitability = df.groupby('Product Name').agg({
-    'Profit': 'sum',  # Total profit from this product
-    'Sales': 'sum',  # Total sales revenue
-    'Quantity': 'sum', # Total units sold
-    'Order ID': 'count' # Number of times ordered
-}).round(2)
-
-# Rename for clarity
-product_profitability.rename(columns={'Order ID': 'Times Ordered'}, inplace=True)
-
-# Sort by profit in descending order and select top 10
-top_10_products = product_profitability.sort_values('Profit', ascending=False).head(10)
-
-# Calculate profit per unit
-top_10_products['Profit per Unit'] = (
-    top_10_products['Profit'] / top_10_products['Quantity']
-).round(2)
+# Group by product name and calculate total profit, sales, units sold and times ordered,
+# then sort by profit, select the top 10 and calculate profit per unit
+top_10_products = reports.product_profitability(df, top_n=10)
 
 print(top_10_products)
 
@@ -261,26 +240,10 @@ print("\n" + "="*50)
 print("3. AVERAGE ORDER VALUE  BY CUSTOMER SEGMENT")
 print("="*50)
 
-# Group by Segment and calculate comprehensive order metrics
-segment_analysis = df.groupby('Segment').agg({
-    'Sales': ['sum', 'mean', 'median'],    # Total, average, and median sales
-    'Profit': ['sum', 'mean'],         # Total and average profit
-    'Quantity': 'mean',            # Average quantity per order
-    'Discount': 'mean',    # Average discount applied
-    'Order ID': 'count'   # Total number of orders
-}).round(2)
-
-# Simplify the column names for readbility
-segment_analysis.columns = ['Total Sales', 'Avg Order Value', 'Median Order Value',
-                             'Total Profit', 'Avg Profit per Order',
-                             'Avg Quantity per Order', 'Avg Discount (%)', 'Total Orders']
-
-# Calculate Total Profit vs Number of Unique Customers
-customers_per_segment = df.groupby('Segment')['Customer ID'].nunique()
-segment_analysis['Unique Customers'] = customers_per_segment
-segment_analysis['Avg Profit per Customer'] = (
-    segment_analysis['Total Profit'] / segment_analysis['Unique Customers']
-).round(2)
+# Group by Segment and calculate comprehensive order metrics (total, average and median sales,
+# profit, quantity, discount, order count), plus unique customers and profit per customer.
+# Unique customers are counted exactly by default, with a HyperLogLog sketch on very large data
+segment_analysis = reports.segment(df)
 
 print(segment_analysis)
 
@@ -297,31 +260,15 @@ print("\n" + "="*50)
 print("4. CATEGORY PERFORMANCE BY SEGMENT (PIVOT TABLE ANALYSIS)")
 print("="*50)
 
-# Create a pivot table showing profit by Category and Segment
-pivot_profit = pd.pivot_table(
-    df,
-    values='Profit', # The metric we're analyzing
-    index='Category',# Rows: Product categories
-    columns='Segment', # Columns: Customer segments
-    aggfunc='sum',# Aggregation function
-    margins=True, # Add row and column totals
-    margins_name='Total' # Label for the totals
-).round(2)
+# Build both pivot tables from one grouped pass over the data:
+# - profit by Category and Segment (sum)
+# - average order value by Category and Segment (mean of Sales)
+# The Total row/column (margins) are worked out from the cell totals instead of re-scanning the data
+pivot_profit, pivot_aov = reports.category_segment_pivots(df)
 
 print("\nProfit by Category and Segment:")
 print(pivot_profit)
 
-# Create a second pivot showing average order value
-pivot_aov = pd.pivot_table(
-    df,
-    values='Sales',
-    index='Category',
-    columns='Segment',
-    aggfunc='mean',# Mean shows average order value
-    margins=True,
-    margins_name='Total'
-).round(2)
-
 print("\n\nAverage Order Value by Category and Segment:")
 print(pivot_aov)
 
@@ -338,27 +285,19 @@ print("\n" + "="*80)
 print("5. TEMPORAL ANALYSIS: MONTHLY PROFIT TRENDS BY CATEGORY")
 print("="*80)
 
-# Extract year and month from Order Date for time-series analysis
-df['Year-Month'] = df['Order Date'].dt.to_period('M')
-
-# Group by Year-Month and Category to see profit trends
-monthly_profit = (df.groupby(['Year-Month', 'Category'])['Profit']
-                  .sum().round(2))
-
-
-# Unstack to create a wide format showing categories as columns
-monthly_profit_wide = monthly_profit.unstack(fill_value=0)
+# Group by month and Category to see profit trends, with categories as columns, and calculate
+# the month-over-month growth rate for every month and category at once.
+# The time-series engine fills in missing months and returns NaN (instead of
+# dividing by zero) when a category had zero profit in the previous month.
+monthly_profit_wide, monthly_growth = reports.monthly_trend(df)
 
 # Display the last 12 months of data for recent trend analysis
 print("\nLast 12 Months of Profit by Category:")
 print(monthly_profit_wide.tail(12))
 
-# Calculate month-over-month growth rate for the most recent period
-recent_months = monthly_profit_wide.tail(2)
-if len(recent_months) >= 2:
-    mom_growth = ((recent_months.iloc[1] - recent_months.iloc[0]) / recent_months.iloc[0] * 100).round(2)
+if len(monthly_growth) >= 2:
     print("\n\nGrowth Rate from Last Month (%):")
-    print(mom_growth)
+    print(monthly_growth.iloc[-1].rename(None).round(2))  # Same output as before: no period label
 
 print("\n INTERPRETATION:")
 
@@ -390,28 +329,10 @@ print("\n" + "="*80)
 print("6. DISCOUNT IMPACT ON PROFITABILITY")
 print("="*80)
 
-# Create discount bins to analyze discount level impact
-df['Discount Bin'] = pd.cut(
-    df['Discount'],
-    bins=[0, 0.1, 0.2, 0.3, 1.0],   # Discount ranges
-    labels=['0-10%', '10-20%', '20-30%', '30%+'],# Bin labels
-    include_lowest=True
-)
-
-# Group by discount bin and calculate key metrics
-discount_analysis = df.groupby('Discount Bin', observed = True).agg({ # observed=True means pandas will only show groups that actually exist in your data
-    'Profit': ['sum', 'mean'],# Total and average profit
-    'Sales': ['sum', 'mean'],# Total and average sales
-    'Order ID': 'count'  # Number of orders
-}).round(2)
-
-# Flatten column names
-discount_analysis.columns = ['Total Profit', 'Avg Profit', 'Total Sales', 'Avg Sales', 'Order Count']
-
-# Calculate profit margin by discount level
-discount_analysis['Profit Margin (%)'] = (
-    (discount_analysis['Total Profit'] / discount_analysis['Total Sales']) * 100
-).round(2)
+# Discount bins (0-10%, 10-20%, 20-30%, 30%+) are a registered bin scheme, and their int8 codes
+# were stored at ingest by add_bin_codes(), so no pd.cut() is needed here.
+# Total and average profit and sales, number of orders and profit margin per discount bin
+discount_analysis = reports.discount(df)
 
 print(discount_analysis)
 
@@ -431,26 +352,9 @@ print("\n" + "="*80)
 print("7. SUB-CATEGORY ANALYSIS: TOP AND BOTTOM PERFORMERS")
 print("="*80)
 
-# Comprehensive sub-category analysis
-subcategory_performance = df.groupby('Sub-Category').agg({
-    'Profit': 'sum',  # Total profit
-    'Sales': 'sum',  # Total sales
-    'Quantity': 'sum',# Total units sold
-    'Order ID': 'count' # Number of orders
-}).round(2)
-
-# Rename columns
-subcategory_performance.rename(columns={'Order ID': 'Order Count'}, inplace=True)
-
-# Calculate profit margin and profit per order
-subcategory_performance['Profit Margin (%)'] = (
-    (subcategory_performance['Profit'] / subcategory_performance['Sales']) * 100).round(2)
-
-subcategory_performance['Profit per Order'] = (
-    subcategory_performance['Profit'] / subcategory_performance['Order Count']).round(2)
-
-# Sort by profit to see top and bottom performers
-subcategory_performance_sorted = subcategory_performance.sort_values('Profit', ascending=False)
+# Comprehensive sub-category analysis: profit, sales, units, order count, profit margin and
+# profit per order, sorted by profit to see top and bottom performers
+subcategory_performance_sorted = reports.subcategory(df)
 
 print("\nTop 5 Most Profitable Sub-Categories:")
 print(subcategory_performance_sorted.head(5))
@@ -478,12 +382,14 @@ print("8. KEY BUSINESS METRICS SUMMARY")
 print("="*80)
 
 # Calculate overall business metrics
-total_revenue = df['Sales'].sum()
-total_profit = df['Profit'].sum()
-total_orders = df['Order ID'].nunique()
-total_customers = df['Customer ID'].nunique()
-avg_order_value = df['Sales'].mean()
-overall_profit_margin = (total_profit / total_revenue) * 100
+# compute_kpis collects every KPI's running totals in one pass over the data instead of five separate scans
+kpis = reports.kpi(df)
+total_revenue = kpis['Total Revenue']
+total_profit = kpis['Total Profit']
+total_orders = kpis['Total Orders']
+total_customers = kpis['Total Customers']
+avg_order_value = kpis['Average Order Value']
+overall_profit_margin = kpis['Overall Profit Margin']
 
 print(f"\nTotal Revenue: ${total_revenue:,.2f}")
 print(f"Total Profit: ${total_profit:,.2f}")
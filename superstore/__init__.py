@@ -0,0 +1,38 @@
+# Superstore analysis helpers
+# ============================================================================
+# Project: Comprehensive Exploratory Data Analysis of Superstore Sales Dataset
+# Unit: ANA203 Data Wrangling and Analysis with Python
+
+# CODE REPOSITORY:
+# Available on GitHub: https://github.com/AviPerera/ANA203_Assignment2
+
+# This package holds the reusable building blocks that the Task scripts share.
+# Each module focuses on one job so the Task files can stay readable:
+# - backends: interchangeable pandas / NumPy-on-codes / SQLite / DuckDB engines for the aggregations
+# - benchmark: end-to-end scaling matrix over data sizes and worker counts (rows/s, peak RSS, efficiency)
+# - binning: registered bin schemes stored as int8 codes, banded reports via bincount
+# - bitmap: compressed per-value bitmap indexes on the low-cardinality columns for compound filters
+# - cli: `python -m superstore <command>` runs one analysis, reading only its columns
+# - dateindex: date columns sorted once so start/end windows are binary searches (every report takes them)
+# - dates: fast date parsing through unique-value codes and int32 day numbers
+# - extsort: external merge sort (sorted runs spilled to disk, k-way merge) for full product and customer rankings
+# - ingest: append-only batch store with materialized views updated from each batch only
+# - kpi: declared KPIs computed together in one pass, incrementally or over chunks
+# - loader: loads the dataset (one CSV, or pruned partitions parsed in parallel) and runs the shared ingest steps
+# - memo: disk-backed memoization keyed by data fingerprint, arguments and code version, LRU-evicted
+# - models: Customer, Category, Product, Shipment and Order classes (from Task 1)
+# - orders: order-header rollup (one row per Order ID) via segment reductions, basket statistics
+# - parallel: shared-memory multi-process group-by over disjoint row ranges, merged partials
+# - pipeline: memoized DAG of analysis stages, run concurrently on a thread pool
+# - pivot: several pivot tables from one grouped pass, margins from cell partials
+# - quality: declarative data-quality rules checked in one vectorized pass per chunk (counts and sample Row IDs)
+# - reports: every Task 2-4 analysis as a function returning its tables
+# - scenarios: the two Task 1 business scenarios
+# - schema: star schema of dictionary-encoded dimensions and an int32-keyed fact table
+# - service: asyncio HTTP service answering cached queries on localhost
+# - sketches: mergeable HyperLogLog distinct counts and Space-Saving top-K heavy hitters
+# - synthetic: seeded Superstore-shaped data generator, streamed to CSV/Parquet in parallel
+# - timeseries: growth rates, rolling windows and seasonality over period tables
+# - tracing: optional per-stage wall/CPU time, peak memory and row counts, exported as JSON or Chrome traces
+# - watch: watch mode that re-hashes changed chunks and recomputes only the reports reading changed columns
+# ============================================================================
@@ -0,0 +1,4 @@
+# Allows running the command line tool with: python -m superstore <command>
+from superstore.cli import main
+
+main()
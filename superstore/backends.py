@@ -0,0 +1,596 @@
+# Pluggable execution backends for the aggregation operations
+# ============================================================================
+# The reports only need a handful of operations:
+# - filter: keep rows matching values (and numeric ranges)
+# - groupby_agg: named aggregations (sum, mean, count, min, max, nunique) per group
+# - pivot: one measure by index x columns
+# - nlargest: the n rows with the largest values in a column
+# - nunique: distinct values, overall or per group
+#
+# Each backend implements them differently:
+# - pandas: the DataFrame methods used so far (the default)
+# - numpy: pandas only factorizes the keys into integer codes, all the work is
+#   NumPy bincount / reduceat over those codes
+# - sqlite: the DataFrame is copied once into an in-memory SQLite database and
+#   every operation runs as SQL (standard library, always available)
+# - duckdb: the same SQL run by DuckDB directly on the DataFrame (optional,
+#   only registered when the duckdb package is installed)
+# - parallel: group-bys split over worker processes reading the columns from
+#   shared memory (see parallel.py); large tables only, small ones use pandas
+# - bitmap: filters on Region, Segment, Category, ... answered from bitmap
+#   indexes built once per DataFrame (see bitmap.py); everything else is pandas
+#
+# Every backend returns the same shapes, index order and dtypes, so the results
+# are interchangeable. Sums can differ in the last floating-point digits because
+# each engine adds in a different order; compare_backends() checks agreement.
+#
+# Example:
+#   backend = get_backend('numpy')
+#   backend.groupby_agg(df, ['Category', 'Region'], {'Sales': ('Sales', 'sum')})
+#   time_backends(df, 'groupby_agg', ['Category'], {'Profit': ('Profit', 'mean')})
+#   check_backends(df)  # every backend against pandas on the standard checks
+# ============================================================================
+
+import atexit
+import datetime
+import math
+import sqlite3
+import threading
+import time
+import weakref
+
+import numpy as np
+import pandas as pd
+
+from superstore.bitmap import BitmapIndex
+from superstore.parallel import PARALLEL_THRESHOLD, SharedFrame, default_workers, make_pool
+
+try:
+    import duckdb
+except ImportError:
+    duckdb = None
+
+AGGFUNCS = ('sum', 'mean', 'count', 'min', 'max', 'nunique')
+
+# Largest number of key combinations the numpy backend numbers with ravel_multi_index
+MAX_FLAT_GROUPS = np.iinfo(np.int64).max
+
+# Registry of backends: name -> backend class (or any callable returning a backend).
+# Each backend is created on first use, so importing this module (every Task
+# script does, through reports) opens no database and builds no backend.
+BACKENDS = {}
+_INSTANCES = {}  # name -> backend created by get_backend()
+_INSTANCES_LOCK = threading.Lock()
+
+
+def register_backend(name, factory):
+    """Adds a backend class (or factory) to the registry; it is instantiated by the first get_backend(name)."""
+    with _INSTANCES_LOCK:
+        BACKENDS[name] = factory
+        _INSTANCES.pop(name, None)
+    return factory
+
+
+def get_backend(name=None):
+    """Looks up a backend by name (None gives the pandas backend); backend objects pass through."""
+    if name is None:
+        name = 'pandas'
+    if not isinstance(name, str):
+        return name
+    if name not in BACKENDS:
+        raise KeyError(f"Unknown backend '{name}'. Available: {', '.join(BACKENDS)}")
+    with _INSTANCES_LOCK:
+        if name not in _INSTANCES:
+            _INSTANCES[name] = BACKENDS[name]()
+        return _INSTANCES[name]
+
+
+def _as_list(columns):
+    return [columns] if isinstance(columns, str) else list(columns)
+
+
+def _check_aggregations(aggregations):
+    for name, (column, aggfunc) in aggregations.items():
+        if aggfunc not in AGGFUNCS:
+            raise ValueError(f"Unsupported aggregation '{aggfunc}' for '{name}'. Choose from {AGGFUNCS}")
+
+
+def _finish_groupby(result, dataframe, by, aggregations):
+    # Shared last step: same column order, dtypes and sorted index for every backend
+    result = result[list(aggregations)]
+    for name, (column, aggfunc) in aggregations.items():
+        if aggfunc in ('count', 'nunique'):
+            result[name] = result[name].astype('int64')
+        elif aggfunc == 'mean':
+            result[name] = result[name].astype('float64')
+        elif not result[name].isna().any():
+            result[name] = result[name].astype(dataframe[column].dtype)  # sum/min/max keep the column type
+    if len(by) == 1:
+        result.index = pd.Index(result.index.get_level_values(0), name=by[0])
+    return result.sort_index()
+
+
+def _row_mask(dataframe, equals=None, ranges=None):
+    # Boolean mask for equality/membership and inclusive (low, high) range conditions
+    mask = np.ones(len(dataframe), dtype=bool)
+    for column, value in (equals or {}).items():
+        values = dataframe[column].to_numpy()
+        if isinstance(value, (list, tuple, set)):
+            mask &= np.isin(values, list(value))
+        else:
+            mask &= values == value
+    for column, (low, high) in (ranges or {}).items():
+        values = dataframe[column].to_numpy()
+        if low is not None:
+            mask &= values >= low
+        if high is not None:
+            mask &= values <= high
+    return mask
+
+
+# ============================================================================
+# pandas backend
+# ============================================================================
+
+class PandasBackend:
+    """The operations as plain pandas calls (the reference every other backend must match)."""
+
+    name = 'pandas'
+
+    def filter(self, dataframe, equals=None, ranges=None):
+        """Rows matching every condition, in their original order and with their original index."""
+        mask = pd.Series(True, index=dataframe.index)
+        for column, value in (equals or {}).items():
+            if isinstance(value, (list, tuple, set)):
+                mask &= dataframe[column].isin(list(value))
+            else:
+                mask &= dataframe[column] == value
+        for column, (low, high) in (ranges or {}).items():
+            # Each side only when given, so one-sided ranges also work on date columns
+            if low is not None:
+                mask &= dataframe[column] >= low
+            if high is not None:
+                mask &= dataframe[column] <= high
+        return dataframe[mask]
+
+    def groupby_agg(self, dataframe, by, aggregations):
+        """Named aggregations {output: (column, aggfunc)} per group, sorted by the group keys."""
+        by = _as_list(by)
+        _check_aggregations(aggregations)
+        result = dataframe.groupby(by, sort=True, observed=True).agg(
+            **{name: pd.NamedAgg(column=column, aggfunc=aggfunc)
+               for name, (column, aggfunc) in aggregations.items()})
+        return _finish_groupby(result, dataframe, by, aggregations)
+
+    def pivot(self, dataframe, index, columns, value, aggfunc='sum'):
+        """One measure with `index` values as rows and `columns` values as columns."""
+        table = self.groupby_agg(dataframe, [index, columns], {value: (value, aggfunc)})[value]
+        return table.unstack(columns)
+
+    def nlargest(self, dataframe, n, column):
+        """The n rows with the largest values (ties keep the earlier row)."""
+        return dataframe.nlargest(n, column, keep='first')
+
+    def nunique(self, dataframe, column, by=None):
+        """Distinct non-missing values: a number, or a Series per group when `by` is given."""
+        if by is None:
+            return int(dataframe[column].nunique())
+        return self.groupby_agg(dataframe, by, {column: (column, 'nunique')})[column]
+
+
+# ============================================================================
+# NumPy-on-codes backend
+# ============================================================================
+
+class NumpyBackend(PandasBackend):
+    """Group keys become integer codes; aggregations are bincount / reduceat over the codes."""
+
+    name = 'numpy'
+
+    def filter(self, dataframe, equals=None, ranges=None):
+        return dataframe[_row_mask(dataframe, equals, ranges)]
+
+    def _group_codes(self, dataframe, by):
+        # One code per row for the combination of key values (-1 where any key is missing)
+        codes, uniques = [], []
+        for column in by:
+            column_codes, column_uniques = pd.factorize(dataframe[column], sort=True)
+            codes.append(column_codes)
+            uniques.append(column_uniques)
+        valid = np.logical_and.reduce([c >= 0 for c in codes])
+        shape = tuple(len(u) for u in uniques)
+        if math.prod(shape) <= MAX_FLAT_GROUPS:
+            # Every key combination fits one int64 position
+            flat = np.ravel_multi_index([c[valid] for c in codes], shape) if valid.any() else np.array([], dtype=np.int64)
+            groups, inverse = np.unique(flat, return_inverse=True)
+            key_codes = np.unravel_index(groups, shape)
+        else:
+            # Too many combinations (several high-cardinality keys): factorize the observed
+            # code tuples instead; rows of codes sort in the same order as the key values
+            rows = np.column_stack([c[valid] for c in codes]).astype(np.int64)
+            combinations, inverse = np.unique(rows, axis=0, return_inverse=True)
+            inverse = inverse.reshape(-1)
+            groups = combinations
+            key_codes = combinations.T
+
+        # Index built from the key values of each observed group (already in sorted order)
+        arrays = [u.take(c) for u, c in zip(uniques, key_codes)]
+        index = pd.MultiIndex.from_arrays(arrays, names=by)
+        return valid, inverse, len(groups), index
+
+    def _reduce(self, ufunc, groups, values, group_count):
+        # ufunc.reduceat per group over rows sorted by group; NaN for groups without values
+        out = np.full(group_count, np.nan)
+        if len(values) == 0:
+            return out
+        order = np.argsort(groups, kind='stable')
+        sorted_groups = groups[order]
+        starts = np.flatnonzero(np.r_[True, sorted_groups[1:] != sorted_groups[:-1]])
+        out[sorted_groups[starts]] = ufunc.reduceat(values[order], starts)
+        return out
+
+    def groupby_agg(self, dataframe, by, aggregations):
+        by = _as_list(by)
+        _check_aggregations(aggregations)
+        valid, groups, group_count, index = self._group_codes(dataframe, by)
+
+        columns = {}
+        for name, (column, aggfunc) in aggregations.items():
+            series = dataframe[column][valid]
+            present = series.notna().to_numpy()
+            if aggfunc == 'nunique':
+                value_codes, value_uniques = pd.factorize(series)
+                pairs = np.unique(groups[present] * len(value_uniques) + value_codes[present])
+                columns[name] = np.bincount(pairs // max(len(value_uniques), 1), minlength=group_count)
+                continue
+            if aggfunc == 'count':
+                columns[name] = np.bincount(groups[present], minlength=group_count)
+                continue
+
+            values = series.to_numpy(dtype=float, na_value=np.nan)
+            if aggfunc in ('sum', 'mean'):
+                totals = np.bincount(groups[present], weights=values[present], minlength=group_count)
+                if aggfunc == 'sum':
+                    columns[name] = totals
+                else:
+                    counts = np.bincount(groups[present], minlength=group_count)
+                    with np.errstate(invalid='ignore', divide='ignore'):
+                        columns[name] = np.where(counts > 0, totals / np.maximum(counts, 1), np.nan)
+            else:
+                ufunc = np.minimum if aggfunc == 'min' else np.maximum
+                columns[name] = self._reduce(ufunc, groups[present], values[present], group_count)
+
+        return _finish_groupby(pd.DataFrame(columns, index=index), dataframe, by, aggregations)
+
+    def nlargest(self, dataframe, n, column):
+        values = dataframe[column].to_numpy(dtype=float, na_value=np.nan)
+        candidates = np.flatnonzero(~np.isnan(values))
+        # Stable sort on the negated values keeps the earlier row first among ties
+        order = candidates[np.argsort(-values[candidates], kind='stable')]
+        return dataframe.iloc[order[:n]]
+
+    def nunique(self, dataframe, column, by=None):
+        if by is None:
+            codes, _ = pd.factorize(dataframe[column])
+            return int(np.unique(codes[codes >= 0]).size)
+        return self.groupby_agg(dataframe, by, {column: (column, 'nunique')})[column]
+
+
+# ============================================================================
+# Shared-memory multi-process backend
+# ============================================================================
+
+class ParallelBackend(PandasBackend):
+    """Group-bys (and so pivots) aggregated by worker processes over disjoint row ranges."""
+
+    name = 'parallel'
+
+    def __init__(self, workers=None, threshold=PARALLEL_THRESHOLD):
+        self.workers = workers or default_workers()
+        self.threshold = threshold  # Tables smaller than this use the pandas group-by
+        self._frames = {}  # id(DataFrame) -> (weak reference, SharedFrame)
+        self._pool = None
+        self._lock = threading.RLock()  # Threads must not create the same SharedFrame or pool twice
+
+    def _shared(self, dataframe):
+        # One SharedFrame per DataFrame; its shared memory is freed when the DataFrame is garbage collected
+        with self._lock:
+            entry = self._frames.get(id(dataframe))
+            if entry is not None and entry[0]() is dataframe:
+                return entry[1]
+            frame = SharedFrame(len(dataframe))
+            self._frames[id(dataframe)] = (weakref.ref(dataframe), frame)
+            weakref.finalize(dataframe, self._release, id(dataframe), frame)
+            return frame
+
+    def _release(self, key, frame):
+        with self._lock:
+            entry = self._frames.get(key)
+            if entry is not None and entry[1] is frame:
+                del self._frames[key]
+        frame.close()
+
+    def close(self):
+        """Shuts the worker pool down; the next large group-by starts a new one."""
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            atexit.unregister(self.close)
+            pool.shutdown(wait=True, cancel_futures=True)
+
+    def groupby_agg(self, dataframe, by, aggregations):
+        by = _as_list(by)
+        _check_aggregations(aggregations)
+        if len(dataframe) < self.threshold:
+            return super().groupby_agg(dataframe, by, aggregations)
+        with self._lock:
+            if self._pool is None and self.workers > 1:
+                self._pool = make_pool(self.workers)
+                atexit.register(self.close)  # Stop the workers before the interpreter shuts down
+            pool = self._pool
+        result = self._shared(dataframe).groupby(dataframe, by, aggregations, pool, self.workers)
+        return _finish_groupby(result, dataframe, by, aggregations)
+
+
+# ============================================================================
+# Bitmap-index backend
+# ============================================================================
+
+class BitmapBackend(PandasBackend):
+    """Equality filters on the indexed columns resolved with bitmap AND/OR instead of string scans."""
+
+    name = 'bitmap'
+
+    def __init__(self):
+        self._indexes = {}  # id(DataFrame) -> (weak reference, BitmapIndex)
+
+    def index(self, dataframe):
+        """The DataFrame's BitmapIndex, built on first use and dropped with the DataFrame."""
+        entry = self._indexes.get(id(dataframe))
+        if entry is not None and entry[0]() is dataframe:
+            return entry[1]
+        index = BitmapIndex(dataframe)
+        self._indexes[id(dataframe)] = (weakref.ref(dataframe), index)
+        weakref.finalize(dataframe, self._release, id(dataframe), index)
+        return index
+
+    def _release(self, key, index):
+        entry = self._indexes.get(key)
+        if entry is not None and entry[1] is index:
+            del self._indexes[key]
+
+    def filter(self, dataframe, equals=None, ranges=None):
+        index = self.index(dataframe)
+        if any(column not in index.bitmaps for column in equals or {}):
+            return super().filter(dataframe, equals, ranges)  # A condition on a column without bitmaps
+        return index.filter(dataframe, equals, ranges)
+
+
+# ============================================================================
+# SQL backends (SQLite from the standard library, DuckDB when installed)
+# ============================================================================
+
+def _quote(column):
+    # Column names like "Sub-Category" need quoting in SQL
+    return '"' + column.replace('"', '""') + '"'
+
+
+def _sql_value(value):
+    # sqlite3 cannot bind NumPy scalars or Timestamps: dates become the text to_sql() stores
+    # (e.g. '2016-11-08 00:00:00'), which sorts in date order
+    if isinstance(value, (datetime.date, np.datetime64)):
+        return pd.Timestamp(value).to_pydatetime().isoformat(' ')
+    return value.item() if hasattr(value, 'item') else value
+
+
+_SQL_AGGREGATES = {
+    'sum': 'COALESCE(SUM({0}), 0)',  # pandas sums of empty groups are 0, SQL gives NULL
+    'mean': 'AVG({0})',
+    'count': 'COUNT({0})',
+    'min': 'MIN({0})',
+    'max': 'MAX({0})',
+    'nunique': 'COUNT(DISTINCT {0})',
+}
+
+
+class SQLBackend(PandasBackend):
+    """Runs every operation as a SQL query; subclasses provide the connection and table loading."""
+
+    name = 'sql'
+    ROW_COLUMN = '__row'  # Original row position, so results map back onto the DataFrame
+
+    def __init__(self):
+        self._tables = {}  # id(DataFrame) -> (weak reference, table name)
+        self._next_table = 0
+        # One connection is shared by every thread (service, pipeline), so each use of it is serialized.
+        # Re-entrant because a table can be dropped by a finalizer while the same thread holds the lock.
+        self._lock = threading.RLock()
+
+    def _table(self, dataframe):
+        # Load each DataFrame once; the table is dropped again when the DataFrame is garbage collected
+        with self._lock:
+            entry = self._tables.get(id(dataframe))
+            if entry is not None and entry[0]() is dataframe:
+                return entry[1]
+            name = f"superstore_{self._next_table}"
+            self._next_table += 1
+            self._load(dataframe.assign(**{self.ROW_COLUMN: np.arange(len(dataframe))}), name)
+            self._tables[id(dataframe)] = (weakref.ref(dataframe), name)
+            weakref.finalize(dataframe, self._drop, id(dataframe), name)
+            return name
+
+    def _drop(self, key, name):
+        entry = self._tables.get(key)
+        if entry is not None and entry[1] == name:
+            del self._tables[key]
+        self._execute(f"DROP TABLE IF EXISTS {_quote(name)}")
+
+    def _where(self, equals=None, ranges=None):
+        clauses, params = [], []
+        for column, value in (equals or {}).items():
+            if isinstance(value, (list, tuple, set)):
+                value = list(value)
+                clauses.append(f"{_quote(column)} IN ({', '.join('?' * len(value))})")
+                params.extend(_sql_value(v) for v in value)
+            else:
+                clauses.append(f"{_quote(column)} = ?")
+                params.append(_sql_value(value))
+        for column, (low, high) in (ranges or {}).items():
+            if low is not None:
+                clauses.append(f"{_quote(column)} >= ?")
+                params.append(_sql_value(low))
+            if high is not None:
+                clauses.append(f"{_quote(column)} <= ?")
+                params.append(_sql_value(high))
+        return (' WHERE ' + ' AND '.join(clauses)) if clauses else '', params
+
+    def _row_positions(self, sql, params=()):
+        return np.array([row[0] for row in self._execute(sql, params)], dtype=np.int64)
+
+    def filter(self, dataframe, equals=None, ranges=None):
+        where, params = self._where(equals, ranges)
+        sql = f"SELECT {self.ROW_COLUMN} FROM {_quote(self._table(dataframe))}{where} ORDER BY {self.ROW_COLUMN}"
+        return dataframe.iloc[self._row_positions(sql, params)]
+
+    def groupby_agg(self, dataframe, by, aggregations):
+        by = _as_list(by)
+        _check_aggregations(aggregations)
+        keys = ', '.join(_quote(column) for column in by)
+        selects = [_SQL_AGGREGATES[aggfunc].format(_quote(column)) + f" AS a{position}"
+                   for position, (column, aggfunc) in enumerate(aggregations.values())]
+        not_null = ' AND '.join(f"{_quote(column)} IS NOT NULL" for column in by)
+        sql = (f"SELECT {keys}, {', '.join(selects)} FROM {_quote(self._table(dataframe))} "
+               f"WHERE {not_null} GROUP BY {keys}")
+        rows = self._execute(sql)
+        result = pd.DataFrame(rows, columns=by + list(aggregations)).set_index(by)
+        return _finish_groupby(result.astype({name: float for name in aggregations
+                                              if aggregations[name][1] not in ('count', 'nunique')}),
+                               dataframe, by, aggregations)
+
+    def nlargest(self, dataframe, n, column):
+        sql = (f"SELECT {self.ROW_COLUMN} FROM {_quote(self._table(dataframe))} "
+               f"WHERE {_quote(column)} IS NOT NULL ORDER BY {_quote(column)} DESC, {self.ROW_COLUMN} LIMIT ?")
+        return dataframe.iloc[self._row_positions(sql, (int(n),))]
+
+    def nunique(self, dataframe, column, by=None):
+        if by is None:
+            sql = f"SELECT COUNT(DISTINCT {_quote(column)}) FROM {_quote(self._table(dataframe))}"
+            return int(self._execute(sql)[0][0])
+        return self.groupby_agg(dataframe, by, {column: (column, 'nunique')})[column]
+
+
+class SQLiteBackend(SQLBackend):
+    """SQL on an in-memory SQLite database (each DataFrame is copied in on first use)."""
+
+    name = 'sqlite'
+
+    def __init__(self):
+        super().__init__()
+        self.connection = sqlite3.connect(':memory:', check_same_thread=False)
+
+    def _load(self, dataframe, name):
+        # Dates become text; the reports never aggregate them
+        with self._lock:
+            dataframe.to_sql(name, self.connection, index=False)
+
+    def _execute(self, sql, params=()):
+        with self._lock:
+            return self.connection.execute(sql, list(params)).fetchall()
+
+
+class DuckDBBackend(SQLBackend):
+    """SQL run by DuckDB, which scans the DataFrame in place instead of copying it."""
+
+    name = 'duckdb'
+
+    def __init__(self):
+        super().__init__()
+        self.connection = duckdb.connect(':memory:')
+
+    def _load(self, dataframe, name):
+        with self._lock:
+            self.connection.register(name, dataframe)
+
+    def _drop(self, key, name):
+        with self._lock:
+            self._tables.pop(key, None)
+            self.connection.unregister(name)
+
+    def _execute(self, sql, params=()):
+        with self._lock:
+            return self.connection.execute(sql, list(params)).fetchall()
+
+
+register_backend('pandas', PandasBackend)
+register_backend('numpy', NumpyBackend)
+register_backend('sqlite', SQLiteBackend)
+register_backend('parallel', ParallelBackend)
+register_backend('bitmap', BitmapBackend)
+if duckdb is not None:
+    register_backend('duckdb', DuckDBBackend)
+
+
+# ============================================================================
+# Comparing backends
+# ============================================================================
+
+def _assert_same(expected, actual):
+    if isinstance(expected, pd.DataFrame):
+        pd.testing.assert_frame_equal(expected, actual, check_exact=False)
+    elif isinstance(expected, pd.Series):
+        pd.testing.assert_series_equal(expected, actual, check_exact=False)
+    elif expected != actual:
+        raise AssertionError(f"{expected!r} != {actual!r}")
+
+
+def compare_backends(dataframe, operation, *args, backends=None, **kwargs):
+    """Runs one operation on every backend and raises AssertionError if any differs from pandas."""
+    expected = getattr(get_backend('pandas'), operation)(dataframe, *args, **kwargs)
+    for name in backends or BACKENDS:
+        _assert_same(expected, getattr(get_backend(name), operation)(dataframe, *args, **kwargs))
+    return expected
+
+
+# Operations every backend must agree on: (operation, args, kwargs), run by check_backends()
+STANDARD_CHECKS = [
+    ('filter', (), {'equals': {'Region': 'West', 'Category': ['Technology', 'Furniture']}}),
+    ('filter', (), {'ranges': {'Profit': (500, None)}}),
+    ('filter', (), {'ranges': {'Discount': (None, 0.2)}}),
+    ('filter', (), {'ranges': {'Order Date': (pd.Timestamp('2016-01-01'), pd.Timestamp('2016-12-31'))}}),
+    ('filter', (), {'ranges': {'Order Date': (pd.Timestamp('2017-06-01'), None)}}),
+    ('filter', (), {'equals': {'Segment': 'Consumer'}, 'ranges': {'Ship Date': (None, pd.Timestamp('2015-01-31'))}}),
+    ('groupby_agg', (['Category', 'Region'], {'Sales': ('Sales', 'sum'), 'Orders': ('Order ID', 'nunique')}), {}),
+    ('groupby_agg', ('Segment', {'Profit': ('Profit', 'mean'), 'Lines': ('Order ID', 'count'),
+                                 'Low': ('Discount', 'min'), 'High': ('Discount', 'max')}), {}),
+    ('pivot', ('Category', 'Segment', 'Profit'), {}),
+    ('nlargest', (5, 'Profit'), {}),
+    ('nunique', ('Customer ID',), {}),
+    ('nunique', ('Customer ID',), {'by': 'Region'}),
+]
+
+
+def check_backends(dataframe, backends=None, checks=None):
+    """Runs every standard check (or `checks`) through compare_backends(); returns how many ran."""
+    checks = STANDARD_CHECKS if checks is None else checks
+    for operation, args, kwargs in checks:
+        compare_backends(dataframe, operation, *args, backends=backends, **kwargs)
+    return len(checks)
+
+
+def time_backends(dataframe, operation, *args, backends=None, repeat=3, **kwargs):
+    """Best-of-`repeat` seconds per backend for one operation (after checking they agree).
+
+    The first call per backend is a warm-up, so the SQL backends' one-off
+    table load is not counted.
+    """
+    compare_backends(dataframe, operation, *args, backends=backends, **kwargs)
+    timings = {}
+    for name in backends or BACKENDS:
+        method = getattr(get_backend(name), operation)
+        best = np.inf
+        for _ in range(repeat):
+            started = time.perf_counter()
+            method(dataframe, *args, **kwargs)
+            best = min(best, time.perf_counter() - started)
+        timings[name] = best
+    return pd.Series(timings, name='Seconds').sort_values()
@@ -0,0 +1,168 @@
+# Scaling benchmark matrix across data sizes and worker counts
+# ============================================================================
+# Runs every Task 1-4 analysis end to end (load, prepare, scenarios, NumPy
+# statistics, customer tiering, exports, groupbys, pivots and KPIs) through the
+# memoized pipeline, for every combination of:
+# - dataset size: synthetic datasets generated once per size and seed
+# - worker count: threads used by the pipeline
+#
+# Every configuration runs in a fresh process, so the peak RSS (resident
+# memory) recorded for it is not inflated by earlier runs, and nothing is
+# shared between runs through caches.
+#
+# For each configuration the benchmark records:
+# - total seconds and throughput (rows per second)
+# - peak RSS in MB
+# - speedup and scaling efficiency compared with the smallest worker count
+#   (efficiency 1.0 = perfect scaling, lower = extra workers are wasted)
+# - seconds and rows per second for each stage, to see which analysis stops scaling
+#
+# Example:
+#   results = run_benchmark(sizes=[10_000, 100_000, 1_000_000], worker_counts=[1, 2, 4])
+#   print(results_table(results))
+#   save_json(results, 'benchmark.json')
+# ============================================================================
+
+import json
+import multiprocessing
+import os
+import platform
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from superstore.pipeline import build_pipeline
+from superstore.synthetic import GENERATOR_VERSION, SyntheticProfile, write_synthetic
+
+try:
+    import resource  # Unix only; peak RSS is reported as None elsewhere
+except ImportError:
+    resource = None
+
+DEFAULT_SIZES = (10_000, 100_000, 1_000_000)
+
+
+def default_worker_counts():
+    """1, 2, 4, ... up to the number of CPUs (always including the CPU count itself)."""
+    cpus = os.cpu_count() or 1
+    counts = [1]
+    while counts[-1] * 2 <= cpus:
+        counts.append(counts[-1] * 2)
+    if counts[-1] != cpus:
+        counts.append(cpus)
+    return counts
+
+
+def _peak_rss_mb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS reports bytes
+    return peak / 1024**2 if platform.system() == 'Darwin' else peak / 1024
+
+
+def prepare_datasets(sizes, data_dir, seed=0, workers=None):
+    """Generates one synthetic CSV per size (reusing files from earlier runs); returns {rows: path}.
+
+    A file is reused only if it has the same rows, seed and generator version in its name. Files are
+    renamed into place only when complete (see write_synthetic), so an interrupted run is never reused.
+    """
+    os.makedirs(data_dir, exist_ok=True)
+    paths = {}
+    profile = None
+    for rows in sizes:
+        path = os.path.join(data_dir, f"synthetic_{rows}_seed{seed}_v{GENERATOR_VERSION}.csv")
+        if not os.path.exists(path):
+            profile = profile or SyntheticProfile.from_csv()
+            write_synthetic(path, rows, seed=seed, workers=workers, profile=profile)
+        paths[rows] = path
+    return paths
+
+
+def _run_configuration(csv_file_path, workers):
+    # Runs inside a fresh process: one full pipeline run with the given number of threads
+    with tempfile.TemporaryDirectory() as output_dir:
+        pipeline = build_pipeline(csv_file_path, max_workers=workers, output_dir=output_dir)
+        started = time.perf_counter()
+        pipeline.run()
+        seconds = time.perf_counter() - started
+    return {
+        'seconds': seconds,
+        'peak_rss_mb': _peak_rss_mb(),
+        'stages': {name: stats['seconds'] for name, stats in pipeline.stats.items()},
+    }
+
+
+def run_benchmark(sizes=DEFAULT_SIZES, worker_counts=None, data_dir='benchmark_data', seed=0, repeat=1):
+    """Runs the whole matrix and returns one result dictionary per (size, workers) configuration.
+
+    With `repeat` > 1 each configuration runs several times and the fastest run is kept.
+    """
+    worker_counts = sorted(worker_counts or default_worker_counts())
+    datasets = prepare_datasets(sizes, data_dir, seed)
+    # 'spawn' starts every run from a clean interpreter so peak RSS is per configuration
+    context = multiprocessing.get_context('spawn')
+
+    results = []
+    for rows, path in datasets.items():
+        baseline = None
+        for workers in worker_counts:
+            runs = []
+            for _ in range(repeat):
+                with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+                    runs.append(pool.submit(_run_configuration, path, workers).result())
+            best = min(runs, key=lambda run: run['seconds'])
+            if baseline is None:
+                baseline = (workers, best['seconds'])
+
+            # Speedup against the smallest worker count, efficiency = speedup per extra worker
+            speedup = baseline[1] / best['seconds']
+            results.append({
+                'rows': rows,
+                'workers': workers,
+                'seconds': best['seconds'],
+                'rows_per_second': rows / best['seconds'],
+                'peak_rss_mb': best['peak_rss_mb'],
+                'speedup': speedup,
+                'efficiency': speedup * baseline[0] / workers,
+                'stages': {name: {'seconds': seconds, 'rows_per_second': rows / seconds if seconds else None}
+                           for name, seconds in best['stages'].items()},
+            })
+    return results
+
+
+# ============================================================================
+# Reporting
+# ============================================================================
+
+def results_table(results):
+    """One row per configuration: seconds, rows/s, peak RSS, speedup and efficiency."""
+    table = pd.DataFrame([{key: value for key, value in result.items() if key != 'stages'}
+                          for result in results])
+    return table.set_index(['rows', 'workers']).round(3)
+
+
+def stage_table(results, workers=None):
+    """Rows per second of every stage (rows) for each dataset size (columns).
+
+    Uses the smallest worker count by default, where stages do not compete for the CPU.
+    """
+    workers = workers or min(result['workers'] for result in results)
+    table = pd.DataFrame({result['rows']: {name: stage['rows_per_second'] for name, stage in result['stages'].items()}
+                          for result in results if result['workers'] == workers})
+    table.columns.name = 'Rows'
+    return table.sort_index().round(0)
+
+
+def save_json(results, path):
+    """Writes the benchmark results, plus the machine they ran on, to a JSON file."""
+    report = {
+        'machine': {'platform': platform.platform(), 'python': platform.python_version(),
+                    'cpus': os.cpu_count()},
+        'results': results,
+    }
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump(report, file, indent=2)
+    return path
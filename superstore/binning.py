@@ -0,0 +1,133 @@
+# Reusable binning for banded reports
+# ============================================================================
+# Task 4 used pd.cut() to put Discount into bands (0-10%, 10-20%, ...) and then
+# grouped on the resulting categorical every time the report ran.
+
+# This module lets us register a bin scheme once (column, bin edges, labels),
+# compute the bin codes for every registered scheme together at ingest with
+# np.searchsorted(), and keep them as small int8 columns. A banded report is
+# then just np.bincount() over those codes, which avoids hashing strings or
+# categoricals in a groupby.
+
+# Bins follow the same rule as pd.cut(..., include_lowest=True): each bin
+# covers (left, right], and the very first edge is included in the first bin.
+# Values outside every bin (or missing values) get code -1.
+# ============================================================================
+
+import numpy as np
+import pandas as pd
+
+# Largest number of bins that still fits in an int8 code
+MAX_BINS = np.iinfo(np.int8).max
+
+
+class BinScheme:
+    """Describes how one numeric column is split into labelled bands."""
+
+    def __init__(self, name, column, edges, labels):
+        if len(edges) != len(labels) + 1:
+            raise ValueError(f"Bin scheme '{name}' needs exactly one more edge than labels")
+        if len(labels) > MAX_BINS:
+            raise ValueError(f"Bin scheme '{name}' has more than {MAX_BINS} bins")
+        if np.any(np.diff(edges) <= 0):
+            raise ValueError(f"Bin scheme '{name}' edges must be strictly increasing")
+
+        self.name = name
+        self.column = column
+        self.edges = np.asarray(edges, dtype=float)
+        self.labels = list(labels)
+
+    @property
+    def code_column(self):
+        # Name of the int8 column that stores this scheme's codes
+        return f"{self.name} Code"
+
+    def codes(self, values):
+        """Returns the int8 bin code for every value (-1 if it falls outside all bins)."""
+        values = np.asarray(values, dtype=float)
+        # side='left' finds the first edge >= value, which matches right-closed bins
+        codes = np.searchsorted(self.edges, values, side='left') - 1
+        codes[values == self.edges[0]] = 0  # include_lowest
+        codes[(codes < 0) | (codes >= len(self.labels)) | np.isnan(values)] = -1
+        return codes.astype(np.int8)
+
+    def to_labels(self, codes):
+        """Turns bin codes back into a labelled categorical (code -1 becomes NaN)."""
+        return pd.Categorical.from_codes(codes, categories=self.labels)
+
+
+# ============================================================================
+# Registry of bin schemes
+# ============================================================================
+
+BIN_SCHEMES = {}
+
+
+def register_bin_scheme(name, column, edges, labels):
+    """Registers (or replaces) a bin scheme so add_bin_codes() computes it at ingest."""
+    scheme = BinScheme(name, column, edges, labels)
+    BIN_SCHEMES[name] = scheme
+    return scheme
+
+
+def get_bin_scheme(name):
+    """Looks up a registered bin scheme by name."""
+    if name not in BIN_SCHEMES:
+        raise KeyError(f"No bin scheme registered as '{name}'")
+    return BIN_SCHEMES[name]
+
+
+# Default schemes used by the reports
+register_bin_scheme('Discount Bin', 'Discount',
+                    edges=[0, 0.1, 0.2, 0.3, 1.0],
+                    labels=['0-10%', '10-20%', '20-30%', '30%+'])
+register_bin_scheme('Sales Band', 'Sales',
+                    edges=[0, 50, 200, 1000, np.inf],
+                    labels=['Under $50', '$50-$200', '$200-$1000', 'Over $1000'])
+register_bin_scheme('Quantity Band', 'Quantity',
+                    edges=[0, 2, 5, np.inf],
+                    labels=['1-2 units', '3-5 units', '6+ units'])
+
+
+# ============================================================================
+# Computing codes and banded reports
+# ============================================================================
+
+def add_bin_codes(dataframe, names=None):
+    """Adds an int8 code column for every registered scheme whose source column is present."""
+    schemes = BIN_SCHEMES.values() if names is None else [get_bin_scheme(n) for n in names]
+    for scheme in schemes:
+        if scheme.column in dataframe.columns:
+            dataframe[scheme.code_column] = scheme.codes(dataframe[scheme.column].to_numpy())
+    return dataframe
+
+
+def banded_summary(dataframe, name, measures=('Profit', 'Sales'), count_name='Order Count'):
+    """Total, average and row count of each measure per band, computed with np.bincount.
+
+    Uses the stored code column if add_bin_codes() has already run, otherwise computes the codes.
+    Only bands that actually contain rows are returned (like groupby(observed=True)).
+    """
+    scheme = get_bin_scheme(name)
+    if scheme.code_column in dataframe.columns:
+        codes = dataframe[scheme.code_column].to_numpy()
+    else:
+        codes = scheme.codes(dataframe[scheme.column].to_numpy())
+
+    # Drop rows outside every bin, bincount needs non-negative codes
+    in_range = codes >= 0
+    codes = codes[in_range].astype(np.intp)
+    n_bins = len(scheme.labels)
+
+    counts = np.bincount(codes, minlength=n_bins)
+    summary = {}
+    for measure in measures:
+        totals = np.bincount(codes, weights=dataframe[measure].to_numpy(dtype=float)[in_range], minlength=n_bins)
+        averages = np.full(n_bins, np.nan)
+        np.divide(totals, counts, out=averages, where=counts > 0)
+        summary[f'Total {measure}'] = totals
+        summary[f'Avg {measure}'] = averages
+    summary[count_name] = counts
+
+    result = pd.DataFrame(summary, index=pd.CategoricalIndex(scheme.labels, categories=scheme.labels, name=name))
+    return result[counts > 0]
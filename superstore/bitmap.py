@@ -0,0 +1,194 @@
+# Bitmap indexes on the low-cardinality columns
+# ============================================================================
+# A filter like df[df['Region'] == 'West'] compares every string in the column
+# and allocates a new boolean array each time. A BitmapIndex is built once per
+# DataFrame and stores, for every value of Region, Segment, Category,
+# Sub-Category, Ship Mode and State, which rows hold that value:
+# - values covering many rows keep a packed bitmap (np.packbits, one bit per
+#   row, 8x smaller than a boolean array)
+# - rare values (fewer rows than 1 in 32) keep the sorted row ids instead,
+#   which is smaller than a bitmap at that density (the idea behind "Roaring"
+#   compressed bitmaps)
+#
+# A compound filter (West AND Technology AND Consumer) is then bitwise AND/OR
+# on these bitmaps or id lists, and the result is a list of row positions;
+# the strings are never looked at again. Numeric ranges (Profit > 500) are
+# only checked on the rows the bitmaps already selected.
+#
+# Example:
+#   index = BitmapIndex(df)
+#   rows = index.row_ids({'Region': 'West', 'Category': 'Technology', 'Segment': 'Consumer'})
+#   index.filter(df, {'Region': ['West', 'East']}, ranges={'Profit': (500, None)})
+#   index.save('bitmaps.pkl')
+# ============================================================================
+
+import os
+import pickle
+
+import numpy as np
+
+# Columns indexed by default (only those present in the DataFrame are used)
+INDEXED_COLUMNS = ['Region', 'Segment', 'Category', 'Sub-Category', 'Ship Mode', 'State']
+
+# A value keeps sorted row ids instead of a bitmap when it covers fewer rows than length / SPARSE_RATIO
+# (4 bytes per row id against 1/8 byte per row for a bitmap)
+SPARSE_RATIO = 32
+
+
+class Bitmap:
+    """Set of row positions out of `length`, stored as packed bits or as sorted row ids."""
+
+    __slots__ = ('length', 'bits', 'ids')
+
+    def __init__(self, length, bits=None, ids=None):
+        self.length = length
+        self.bits = bits  # np.packbits output (uint8), or None
+        self.ids = ids  # sorted uint32 row ids, or None
+
+    @classmethod
+    def from_ids(cls, ids, length):
+        """Picks the smaller storage for a sorted array of row ids."""
+        if len(ids) * SPARSE_RATIO < length:
+            return cls(length, ids=np.asarray(ids, dtype=np.uint32))
+        mask = np.zeros(length, dtype=bool)
+        mask[ids] = True
+        return cls(length, bits=np.packbits(mask))
+
+    @classmethod
+    def from_mask(cls, mask):
+        return cls.from_ids(np.flatnonzero(mask), len(mask))
+
+    @property
+    def sparse(self):
+        return self.ids is not None
+
+    def _as_bits(self):
+        if self.bits is not None:
+            return self.bits
+        mask = np.zeros(self.length, dtype=bool)
+        mask[self.ids] = True
+        return np.packbits(mask)
+
+    def _contains(self, ids):
+        # Whether each row id is set in this (dense) bitmap; packbits puts row 0 in the highest bit
+        return (self.bits[ids >> 3] >> (7 - (ids & 7)).astype(np.uint8)) & 1 == 1
+
+    def __and__(self, other):
+        if self.sparse and other.sparse:
+            return Bitmap(self.length, ids=np.intersect1d(self.ids, other.ids, assume_unique=True))
+        if self.sparse or other.sparse:
+            sparse, dense = (self, other) if self.sparse else (other, self)
+            return Bitmap(self.length, ids=sparse.ids[dense._contains(sparse.ids)])
+        return Bitmap(self.length, bits=self.bits & other.bits)
+
+    def __or__(self, other):
+        if self.sparse and other.sparse:
+            return Bitmap.from_ids(np.union1d(self.ids, other.ids), self.length)
+        return Bitmap(self.length, bits=self._as_bits() | other._as_bits())
+
+    def count(self):
+        """Number of rows in the set."""
+        if self.sparse:
+            return len(self.ids)
+        return int(np.unpackbits(self.bits, count=self.length).sum())
+
+    def row_ids(self):
+        """Sorted row positions in the set."""
+        if self.sparse:
+            return self.ids.astype(np.int64)
+        return np.flatnonzero(np.unpackbits(self.bits, count=self.length))
+
+    @property
+    def nbytes(self):
+        return (self.ids if self.sparse else self.bits).nbytes
+
+
+class BitmapIndex:
+    """One Bitmap per value of each indexed column of a DataFrame."""
+
+    def __init__(self, dataframe, columns=None):
+        self.length = len(dataframe)
+        self.bitmaps = {}  # column -> {value: Bitmap}
+        for column in columns or INDEXED_COLUMNS:
+            if column in dataframe.columns:
+                self.bitmaps[column] = self._build(dataframe[column])
+
+    def _build(self, series):
+        # A stable sort of the value codes lists each value's rows together, already in row order
+        codes, uniques = series.factorize(sort=True)
+        order = np.argsort(codes, kind='stable')
+        counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+        start = int((codes < 0).sum())  # Missing values (code -1) sort first and are not indexed
+        bitmaps = {}
+        for value, count in zip(uniques, counts):
+            bitmaps[value] = Bitmap.from_ids(order[start:start + count], self.length)
+            start += count
+        return bitmaps
+
+    def empty(self):
+        return Bitmap(self.length, ids=np.zeros(0, dtype=np.uint32))
+
+    def lookup(self, column, value):
+        """Rows where the column equals the value, or any of a list of values."""
+        if column not in self.bitmaps:
+            raise KeyError(f"Column '{column}' is not indexed")
+        values = value if isinstance(value, (list, tuple, set)) else [value]
+        result = None
+        for value in values:
+            bitmap = self.bitmaps[column].get(value)
+            if bitmap is not None:
+                result = bitmap if result is None else result | bitmap
+        return self.empty() if result is None else result
+
+    def select(self, equals):
+        """AND of the lookups {column: value or list of values}; None when there are no conditions."""
+        result = None
+        # Start from the smallest set so the intersections stay small
+        lookups = sorted((self.lookup(column, value) for column, value in equals.items()), key=Bitmap.count)
+        for bitmap in lookups:
+            result = bitmap if result is None else result & bitmap
+        return result
+
+    def row_ids(self, equals, dataframe=None, ranges=None):
+        """Row positions matching every condition; ranges {column: (low, high)} need the DataFrame."""
+        selected = self.select(equals) if equals else None
+        ids = np.arange(self.length) if selected is None else selected.row_ids()
+        for column, (low, high) in (ranges or {}).items():
+            # Only the rows already selected are compared
+            values = dataframe[column].to_numpy()[ids]
+            keep = np.ones(len(ids), dtype=bool)
+            if low is not None:
+                keep &= values >= low
+            if high is not None:
+                keep &= values <= high
+            ids = ids[keep]
+        return ids
+
+    def filter(self, dataframe, equals=None, ranges=None):
+        """The matching rows of the DataFrame the index was built from, in their original order."""
+        if len(dataframe) != self.length:
+            raise ValueError("The DataFrame does not match the index (different number of rows)")
+        return dataframe.iloc[self.row_ids(equals or {}, dataframe, ranges)]
+
+    def memory_usage(self):
+        """Bytes used by each column's bitmaps, and how many values are stored sparsely."""
+        return {column: {'bytes': sum(bitmap.nbytes for bitmap in bitmaps.values()),
+                         'values': len(bitmaps),
+                         'sparse_values': sum(bitmap.sparse for bitmap in bitmaps.values())}
+                for column, bitmaps in self.bitmaps.items()}
+
+    # ------------------------------------------------------------------
+    # Keeping an index on disk
+    # ------------------------------------------------------------------
+
+    def save(self, path):
+        """Writes the index to a file (replaced in one step)."""
+        with open(path + '.tmp', 'wb') as file:
+            pickle.dump(self, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(path + '.tmp', path)
+        return path
+
+    @staticmethod
+    def load(path):
+        with open(path, 'rb') as file:
+            return pickle.load(file)
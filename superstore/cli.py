@@ -0,0 +1,581 @@
+# Command line entry point: python -m superstore <command>
+# ============================================================================
+# Runs one analysis at a time instead of a whole Task script. Every command
+# declares the columns it needs, and the loader only parses those columns from
+# the CSV (column projection). For example `python -m superstore kpi` reads
+# Order ID, Customer ID, Sales and Profit and never parses Product Name.
+
+# Examples:
+#   python -m superstore --help
+#   python -m superstore kpi
+#   python -m superstore products --top 5
+#   python -m superstore export --output-dir exports
+#   python -m superstore run-all --cache-dir .superstore_cache
+#   python -m superstore serve --port 8765
+#   python -m superstore benchmark --sizes 10000 100000 --workers 1 2 4 --json benchmark.json
+#   python -m superstore ingest superstore_store new_orders.csv --view category_region
+#   python -m superstore validate --chunksize 500000
+#   python -m superstore top-items --key "Customer Name" --measure Sales --capacity 200
+#   python -m superstore rank customers --output customer_ranking.csv --run-rows 500000
+#   python -m superstore watch --report discount --report kpi
+#   python -m superstore generate --rows 10000000 --output synthetic.csv --workers 8
+#   python -m superstore --csv exports/ --partition year=2016,2017 kpi
+#   python -m superstore --start 2017-01-01 --end 2017-06-30 category-region
+#   python -m superstore --result-cache .superstore_results task4
+#   python -m superstore --trace spans.json --chrome-trace trace.json task4
+# ============================================================================
+
+import argparse
+import time
+
+from superstore import memo, reports, tracing
+from superstore.backends import BACKENDS
+from superstore.benchmark import DEFAULT_SIZES, results_table, run_benchmark, save_json, stage_table
+from superstore.dateindex import date_window
+from superstore.extsort import DEFAULT_CHUNK_ROWS as RANK_CHUNK_ROWS, DEFAULT_RUN_ROWS, RANKINGS, write_csv
+from superstore.ingest import VIEWS, IncrementalStore
+from superstore.kpi import KPIS
+from superstore.loader import CSV_FILE_PATH, load_superstore, prepare_dataset
+from superstore.orders import LINE_COLUMNS, ORDER_COLUMNS, OrderHeaders
+from superstore.pipeline import build_pipeline
+from superstore.quality import DEFAULT_SAMPLE_SIZE, RULES, validate_csv
+from superstore.scenarios import (SCENARIO_1_COLUMNS, SCENARIO_1_ROWS, SCENARIO_2_COLUMNS, SCENARIO_2_ROWS,
+                                  analyse_regional_sales, create_customer_orders, create_sample_orders,
+                                  display_order_summaries)
+from superstore.schema import StarSchema
+from superstore.sketches import stream_heavy_hitters
+from superstore.synthetic import DEFAULT_CHUNK_ROWS, FORMATS, SyntheticProfile, write_synthetic
+from superstore.watch import DEFAULT_CHUNK_ROWS as WATCH_CHUNK_ROWS, WATCH_REPORTS, DatasetWatcher
+
+# Registry of commands: name -> (function, columns, rows, help text)
+COMMANDS = {}
+
+
+def command(name, columns, help, rows=None):
+    """Registers a command; `columns=None` means it needs every column."""
+    def register(function):
+        COMMANDS[name] = (function, columns, rows, help)
+        return function
+    return register
+
+
+def _heading(title):
+    print("\n" + "=" * 80)
+    print(title)
+    print("=" * 80)
+
+
+# ============================================================================
+# Task 1-3 commands
+# ============================================================================
+
+@command('profile', reports.REPORT_COLUMNS['profile'], "Data profiling: shape, memory, missing values, duplicates")
+def run_profile(df, args):
+    result = reports.profile(df)
+    _heading("DATA PROFILING: INITIAL DATASET OVERVIEW")
+    print(f"\nDataset Shape: {result['rows']} rows × {result['columns']} columns")
+    print(f"Memory Usage: {result['memory_mb']:.2f} MB")
+    print("\nStatistical Summary (Numerical Columns):")
+    print(result['describe'])
+    print("\nMissing Values Analysis:")
+    if len(result['missing']) > 0:
+        print(result['missing'].to_string(index=False))
+    else:
+        print("No missing values detected in the dataset.")
+    duplicates = result['duplicates']
+    if duplicates > 0:
+        print(f"\nFound {duplicates} duplicate rows ({duplicates / result['rows'] * 100:.2f}%)")
+    else:
+        print("\nNo duplicate rows found.")
+
+
+@command('scenario1', SCENARIO_1_COLUMNS, "Task 1 Scenario 1: customer order summary and profit analysis",
+         rows=SCENARIO_1_ROWS)
+def run_scenario1(df, args):
+    display_order_summaries(create_customer_orders(df))
+
+
+@command('scenario2', SCENARIO_2_COLUMNS, "Task 1 Scenario 2: regional sales and shipping efficiency report",
+         rows=SCENARIO_2_ROWS)
+def run_scenario2(df, args):
+    analyse_regional_sales(create_sample_orders(df))
+
+
+@command('numpy-stats', reports.REPORT_COLUMNS['numpy_stats'], "Task 2: NumPy statistics and insights")
+def run_numpy_stats(df, args):
+    stats = reports.numpy_stats(df)
+    _heading("VECTORISED STATISTICAL CALCULATIONS")
+    print(f"Average Sales: ${stats['Average Sales']:.2f}")
+    print(f"Median Sales: ${stats['Median Sales']:.2f}")
+    print(f"Sales Std. Deviation: ${stats['Sales Std. Deviation']:.2f}")
+    print(f"Average Profit: ${stats['Average Profit']:.2f}")
+    print(f"Profit Std. Deviation: ${stats['Profit Std. Deviation']:.2f}")
+    print(f"Average Discount: {stats['Average Discount'] * 100:.2f}%")
+    print(f"Correlation between Discount and Profit: {stats['Discount/Profit Correlation']:.2f}")
+    print(f"Number of orders with negative profit: {stats['Negative Profit Orders']}")
+    print(f"Total loss from these orders: ${stats['Total Loss']:.2f}")
+
+
+@command('export', reports.REPORT_COLUMNS['export'], "Task 3: export Technology, high-profit and West subsets to CSV")
+def run_export(df, args):
+    for path in reports.export_subsets(df, args.output_dir):
+        print(f"Saved '{path}'")
+
+
+@command('sales-performance', reports.REPORT_COLUMNS['sales_performance'],
+         "Task 3 Scenario 1: total sales and average profit by Category and Region")
+def run_sales_performance(df, args):
+    _heading("Scenario 1: Sales Performance Analysis")
+    print(reports.sales_performance(df, backend=args.backend).head(args.top))
+
+
+@command('customer-segments', reports.REPORT_COLUMNS['customer_segmentation'],
+         "Task 3 Scenario 2: customer spending tiers")
+def run_customer_segments(df, args):
+    _heading("Scenario 2: Customer Segmentation")
+    print(reports.customer_segmentation(df).head(args.top))
+
+
+# ============================================================================
+# Task 4 commands
+# ============================================================================
+
+@command('category-region', reports.REPORT_COLUMNS['category_region'], "Sales and profit by Category and Region")
+def run_category_region(df, args):
+    _heading("Sales and Profit by Category and Region")
+    print(reports.category_region(df, backend=args.backend))
+
+
+@command('products', reports.REPORT_COLUMNS['product_profitability'], "Most profitable products")
+def run_products(df, args):
+    _heading(f"TOP {args.top} MOST PROFITABLE PRODUCTS")
+    print(reports.product_profitability(df, top_n=args.top, backend=args.backend))
+
+
+@command('segments', reports.REPORT_COLUMNS['segment'], "Average order value by customer Segment")
+def run_segments(df, args):
+    _heading("AVERAGE ORDER VALUE BY CUSTOMER SEGMENT")
+    print(reports.segment(df, backend=args.backend))
+
+
+@command('pivots', reports.REPORT_COLUMNS['category_segment_pivots'], "Category x Segment pivot tables")
+def run_pivots(df, args):
+    pivot_profit, pivot_aov = reports.category_segment_pivots(df)
+    _heading("CATEGORY PERFORMANCE BY SEGMENT (PIVOT TABLE ANALYSIS)")
+    print("\nProfit by Category and Segment:")
+    print(pivot_profit)
+    print("\nAverage Order Value by Category and Segment:")
+    print(pivot_aov)
+
+
+@command('trends', reports.REPORT_COLUMNS['monthly_trend'], "Monthly profit trends and growth by Category")
+def run_trends(df, args):
+    monthly_profit_wide, monthly_growth = reports.monthly_trend(df)
+    _heading("MONTHLY PROFIT TRENDS BY CATEGORY")
+    print(f"\nLast {args.top} Months of Profit by Category:")
+    print(monthly_profit_wide.tail(args.top))
+    print("\nGrowth Rate from Last Month (%):")
+    print(monthly_growth.tail(args.top).round(2))
+
+
+@command('discounts', reports.REPORT_COLUMNS['discount'], "Discount impact on profitability")
+def run_discounts(df, args):
+    _heading("DISCOUNT IMPACT ON PROFITABILITY")
+    print(reports.discount(df))
+
+
+@command('subcategories', reports.REPORT_COLUMNS['subcategory'], "Sub-Category top and bottom performers")
+def run_subcategories(df, args):
+    performance = reports.subcategory(df, backend=args.backend)
+    _heading("SUB-CATEGORY ANALYSIS: TOP AND BOTTOM PERFORMERS")
+    print(f"\nTop {args.top} Most Profitable Sub-Categories:")
+    print(performance.head(args.top))
+    print(f"\nBottom {args.top} Sub-Categories (Least Profitable):")
+    print(performance.tail(args.top))
+
+
+@command('kpi', reports.REPORT_COLUMNS['kpi'], "Key business metrics summary")
+def run_kpi(df, args):
+    _heading("KEY BUSINESS METRICS SUMMARY")
+    for name, value in reports.kpi(df).items():
+        print(f"{name}: {KPIS[name].format(value)}")
+
+
+@command('orders', ORDER_COLUMNS + LINE_COLUMNS, "Order-level rollup: basket sizes and whole-order totals")
+def run_orders(df, args):
+    headers = OrderHeaders.from_dataframe(df)
+    _heading("Basket Statistics (one row per Order ID, not per line)")
+    for name, value in headers.basket_stats().items():
+        print(f"{name:<28} {value:,.2f}" if isinstance(value, float) else f"{name:<28} {value:,}")
+    print("\nLines per order:")
+    print(headers.basket_size_distribution())
+    _heading(f"Top {args.top} Orders by Sales")
+    top = headers.table.nlargest(args.top, 'Sales')
+    shown = [c for c in ['Lines', 'Units', 'Sales', 'Profit', 'Ship Delay (days)', 'Customer Name'] if c in top]
+    print(top[shown].round(2))
+    if len(top):
+        print("\n" + headers.order(top.index[0]).order_summary())
+
+
+@command('schema', None, "Build the star schema and compare its memory with the flat table")
+def run_schema(df, args):
+    schema = StarSchema.from_dataframe(df)
+    _heading("STAR SCHEMA")
+    flat_mb = df.memory_usage(deep=True).sum() / 1024**2
+    print(f"Flat table (prepared): {flat_mb:.2f} MB")
+    for name, size in schema.memory_usage().items():
+        rows = len(schema.fact) if name == 'Fact' else len(schema.dimensions[name])
+        print(f"{name:<10} {rows:>10,} rows {size / 1024**2:>8.2f} MB")
+
+
+# Every Task 4 report, reading the union of their columns once
+TASK4_COMMANDS = ['category-region', 'products', 'segments', 'pivots', 'trends', 'discounts', 'subcategories', 'kpi']
+
+
+def _union_columns(names):
+    columns = []
+    for name in names:
+        for column in COMMANDS[name][1]:
+            if column not in columns:
+                columns.append(column)
+    return columns
+
+
+@command('task4', _union_columns(TASK4_COMMANDS), "Run every Task 4 report")
+def run_task4(df, args):
+    for name in TASK4_COMMANDS:
+        COMMANDS[name][0](df, args)
+
+
+def run_pipeline(args):
+    # Every stage of all four Tasks, each unique piece of work done once
+    pipeline = build_pipeline(args.csv, max_workers=args.workers, cache_dir=args.cache_dir,
+                              output_dir=args.output_dir)
+    started = time.perf_counter()
+    pipeline.run()
+    _heading("PIPELINE RUN")
+    for name, stats in pipeline.stats.items():
+        print(f"{name:<32} {stats['source']:<10} {stats['seconds']:.3f}s")
+    print(f"\nTotal: {len(pipeline.stats)} stages in {time.perf_counter() - started:.3f}s")
+
+
+def run_benchmark_matrix(args):
+    results = run_benchmark(args.sizes, args.workers, data_dir=args.data_dir, seed=args.seed, repeat=args.repeat)
+    _heading("SCALING BENCHMARK")
+    print(results_table(results).to_string())
+    print("\nRows per second by stage:")
+    print(stage_table(results).to_string())
+    if args.json:
+        print(f"\nSaved '{save_json(results, args.json)}'")
+
+
+def run_ingest(args):
+    store = IncrementalStore(args.store)
+    for path in args.batches:
+        started = time.perf_counter()
+        rows = store.append(path)
+        print(f"Appended {rows:,} rows from '{path}' in {time.perf_counter() - started:.3f}s")
+    if args.compact:
+        store.compact()
+    else:
+        store.checkpoint()
+    print(f"Store '{args.store}' holds {len(store.batches)} batch file(s)")
+    quality = store.quality.results()
+    failed = quality[quality['Violations'] > 0]
+    print("Data quality: every rule passed" if failed.empty else f"Data quality issues:\n{failed.to_string()}")
+    for name in args.view or []:
+        _heading(f"VIEW: {name}")
+        result = store.result(name)
+        for table in (result if isinstance(result, tuple) else (result,)):
+            print(table)
+
+
+def run_validate(args):
+    started = time.perf_counter()
+    report = validate_csv(args.csv, rules=args.rule, chunksize=args.chunksize, sample_size=args.samples)
+    _heading("DATA QUALITY")
+    print(report.to_string())
+    print(f"\nChecked {len(report)} rules in {time.perf_counter() - started:.3f}s")
+
+
+def run_rank(args):
+    # Complete ranking with bounded memory: sorted runs spill to disk and are merged while streaming out
+    started = time.perf_counter()
+    options = {} if args.by is None else {'by': args.by}
+    ranked = RANKINGS[args.what](args.csv, ascending=args.ascending, chunksize=args.chunksize,
+                                 run_rows=args.run_rows, directory=args.spill_dir, **options)
+    if args.output:
+        rows = write_csv(ranked, args.output)
+        print(f"Wrote {rows:,} ranked {args.what} to '{args.output}' in {time.perf_counter() - started:.1f}s")
+        return
+    _heading(f"{args.what.upper()} RANKING")
+    first = next(ranked, None)
+    print("No rows" if first is None else first.head(args.top).to_string(index=False))
+    rows = 0 if first is None else len(first) + sum(len(chunk) for chunk in ranked)
+    print(f"\nRanked {rows:,} {args.what} in {time.perf_counter() - started:.1f}s")
+
+
+def run_top_items(args):
+    # One pass over the CSV in chunks; memory is `capacity` counters whatever the number of items
+    started = time.perf_counter()
+    hitters = stream_heavy_hitters(args.csv, chunksize=args.chunksize, tracked=[(args.key, args.measure)],
+                                   capacity=args.capacity)
+    _heading(f"TOP {args.top} {args.key.upper()} BY {args.measure.upper()} (Space-Saving, {args.capacity} counters)")
+    print(hitters.top(args.key, args.measure, args.top).round(2).to_string())
+    print(f"\nStreamed '{args.csv}' in {time.perf_counter() - started:.2f}s. The bounds are on each item's "
+          f"positive total (its chunk totals above zero; losses are not subtracted, so for Profit this can "
+          f"exceed the net profit). 'Guaranteed' rows are certainly in the top {args.top} by that total.")
+
+
+def _show(result):
+    # Reports return a table, a tuple of tables or a dict of named values
+    if isinstance(result, dict):
+        for name, value in result.items():
+            print(f"{name}:\n{value}" if hasattr(value, 'shape') and value.ndim > 1 else f"{name}: {value}")
+    else:
+        for table in (result if isinstance(result, tuple) else (result,)):
+            print(table)
+
+
+def run_watch(args):
+    path = args.path or args.csv
+    watcher = DatasetWatcher(path, report_names=args.report, chunk_rows=args.chunk_rows)
+
+    def show_changes(names, watcher):
+        if watcher.dataframe is None:
+            print(f"\n[{time.strftime('%H:%M:%S')}] No data left in '{path}'; cleared {len(names)} report(s)")
+            return
+        print(f"\n[{time.strftime('%H:%M:%S')}] Recomputed {len(names)} of {len(watcher.report_names)} "
+              f"report(s) from {len(watcher.dataframe):,} rows")
+        for name in names:
+            _heading(f"REPORT: {name}")
+            _show(watcher.results[name])
+
+    print(f"Watching '{path}' every {args.interval}s (Ctrl+C to stop)")
+    try:
+        watcher.watch(interval=args.interval, callback=show_changes, polls=args.polls)
+    except KeyboardInterrupt:
+        print("\nStopped watching")
+
+
+def run_generate(args):
+    # Learn the distributions from the --csv file, then stream the synthetic rows to disk
+    started = time.perf_counter()
+    paths = write_synthetic(args.output, args.rows, seed=args.seed, file_format=args.file_format,
+                            partitioned=args.partitioned, workers=args.workers, chunk_rows=args.chunk_rows,
+                            profile=SyntheticProfile.from_csv(args.csv))
+    seconds = time.perf_counter() - started
+    print(f"Wrote {args.rows:,} rows to {len(paths)} file(s) in {seconds:.1f}s ({args.rows / seconds:,.0f} rows/s)")
+
+
+# ============================================================================
+# Argument parsing
+# ============================================================================
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='python -m superstore',
+                                     description="Run individual Superstore analyses.")
+    parser.add_argument('--csv', default=CSV_FILE_PATH, help="Path to the Superstore CSV file")
+    parser.add_argument('--backend', choices=list(BACKENDS), default=None,
+                        help="Engine for the groupby reports (default: pandas; results are identical)")
+    parser.add_argument('--partition', action='append', default=[], metavar='KEY=VALUE[,VALUE]',
+                        help="When --csv is a folder or glob: only read partitions with these keys (repeatable)")
+    parser.add_argument('--start', default=None, help="Only use orders on or after this Order Date")
+    parser.add_argument('--end', default=None, help="Only use orders on or before this Order Date")
+    parser.add_argument('--result-cache', default=None,
+                        help="Folder for memoized report results (reused while data and code are unchanged)")
+    parser.add_argument('--result-cache-mb', type=float, default=memo.DEFAULT_MAX_BYTES / 1024**2,
+                        help="Largest size of the result cache before old entries are evicted")
+    parser.add_argument('--trace', default=None, help="Record per-stage timings and memory to this JSON file")
+    parser.add_argument('--chrome-trace', default=None, help="Also write a Chrome/Perfetto trace to this file")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    for name, (function, columns, rows, help_text) in COMMANDS.items():
+        subparser = subparsers.add_parser(name, help=help_text)
+        subparser.add_argument('--top', type=int, default=10, help="Number of rows to show where relevant")
+        if name == 'export':
+            subparser.add_argument('--output-dir', default='.', help="Folder to write the CSV files to")
+
+    pipeline_parser = subparsers.add_parser('run-all', help="Run every Task analysis once through the memoized pipeline")
+    pipeline_parser.add_argument('--workers', type=int, default=None, help="Number of worker threads")
+    pipeline_parser.add_argument('--cache-dir', default=None, help="Folder for the on-disk result cache")
+    pipeline_parser.add_argument('--output-dir', default=None, help="Also write the Task 3 CSV exports here")
+
+    generate_parser = subparsers.add_parser('generate', help="Write a synthetic Superstore-shaped dataset")
+    generate_parser.add_argument('--rows', type=int, required=True, help="Number of rows to generate")
+    generate_parser.add_argument('--output', required=True, help="CSV file, or folder when partitioned")
+    generate_parser.add_argument('--seed', type=int, default=0)
+    generate_parser.add_argument('--format', dest='file_format', choices=FORMATS, default='csv')
+    generate_parser.add_argument('--partitioned', action='store_true', help="Write one file per chunk")
+    generate_parser.add_argument('--workers', type=int, default=None, help="Number of worker processes")
+    generate_parser.add_argument('--chunk-rows', type=int, default=DEFAULT_CHUNK_ROWS)
+
+    benchmark_parser = subparsers.add_parser('benchmark', help="Scaling benchmark across data sizes and worker counts")
+    benchmark_parser.add_argument('--sizes', type=int, nargs='+', default=list(DEFAULT_SIZES))
+    benchmark_parser.add_argument('--workers', type=int, nargs='+', default=None,
+                                  help="Worker counts to try (default: 1, 2, 4, ... up to the CPU count)")
+    benchmark_parser.add_argument('--data-dir', default='benchmark_data', help="Folder for the generated datasets")
+    benchmark_parser.add_argument('--seed', type=int, default=0)
+    benchmark_parser.add_argument('--repeat', type=int, default=1, help="Runs per configuration (fastest kept)")
+    benchmark_parser.add_argument('--json', default=None, help="Also write the results to this JSON file")
+
+    ingest_parser = subparsers.add_parser('ingest', help="Append CSV batches to a store and update its views")
+    ingest_parser.add_argument('store', help="Store folder (created if missing)")
+    ingest_parser.add_argument('batches', nargs='*', help="CSV files to append, in order")
+    ingest_parser.add_argument('--view', action='append', choices=list(VIEWS),
+                               help="View to print after ingesting (repeatable)")
+    ingest_parser.add_argument('--compact', action='store_true',
+                               help="Fold the checkpoint deltas into one file (rewrites the whole view state)")
+
+    validate_parser = subparsers.add_parser('validate', help="Check the dataset against the data-quality rules")
+    validate_parser.add_argument('--rule', action='append', choices=list(RULES),
+                                 help="Rule to check (repeatable, default: all)")
+    validate_parser.add_argument('--chunksize', type=int, default=1_000_000, help="Rows checked per chunk")
+    validate_parser.add_argument('--samples', type=int, default=DEFAULT_SAMPLE_SIZE,
+                                 help="Row IDs to show per rule")
+
+    rank_parser = subparsers.add_parser('rank', help="Full product or customer ranking, sorted out of core")
+    rank_parser.add_argument('what', choices=list(RANKINGS))
+    rank_parser.add_argument('--by', default=None, help="Column to rank by (default: Profit / total_spent)")
+    rank_parser.add_argument('--ascending', action='store_true', help="Rank the smallest values first")
+    rank_parser.add_argument('--output', default=None, help="Write the whole ranking to this CSV file")
+    rank_parser.add_argument('--top', type=int, default=10, help="Rows to show when there is no --output")
+    rank_parser.add_argument('--chunksize', type=int, default=RANK_CHUNK_ROWS, help="Rows read from the CSV per chunk")
+    rank_parser.add_argument('--run-rows', type=int, default=DEFAULT_RUN_ROWS,
+                             help="Rows sorted in memory before a run is written to disk")
+    rank_parser.add_argument('--spill-dir', default=None, help="Folder for the sorted runs (default: temp folder)")
+
+    top_parser = subparsers.add_parser('top-items', help="Approximate top-K items by a measure in one streamed pass")
+    top_parser.add_argument('--key', default='Product Name',
+                            choices=['Product Name', 'Product ID', 'Customer Name', 'Customer ID', 'Sub-Category',
+                                     'State', 'City'])
+    top_parser.add_argument('--measure', default='Profit', choices=['Profit', 'Sales', 'Quantity'])
+    top_parser.add_argument('--top', type=int, default=10, help="Number of items to show")
+    top_parser.add_argument('--capacity', type=int, default=100, help="Counters kept (more = tighter bounds)")
+    top_parser.add_argument('--chunksize', type=int, default=100_000, help="Rows read from the CSV per chunk")
+
+    watch_parser = subparsers.add_parser('watch', help="Recompute reports whenever the dataset changes")
+    watch_parser.add_argument('path', nargs='?', default=None, help="CSV file or folder of CSV partitions "
+                                                                     "(default: --csv)")
+    watch_parser.add_argument('--report', action='append', choices=list(WATCH_REPORTS),
+                              help="Report to keep up to date (repeatable, default: all)")
+    watch_parser.add_argument('--interval', type=float, default=1.0, help="Seconds between checks")
+    watch_parser.add_argument('--chunk-rows', type=int, default=WATCH_CHUNK_ROWS, help="Rows per hashed chunk")
+    watch_parser.add_argument('--polls', type=int, default=None, help="Stop after this many checks")
+
+    serve_parser = subparsers.add_parser('serve', help="Start the local query service")
+    serve_parser.add_argument('--host', default='127.0.0.1')
+    serve_parser.add_argument('--port', type=int, default=8765)
+    serve_parser.add_argument('--cache-size', type=int, default=256)
+    return parser
+
+
+# Commands that do not go through the column-projecting loader, and the global data options
+# they cannot use: giving one is an error rather than silently ignored
+STANDALONE_COMMANDS = ('serve', 'run-all', 'benchmark', 'ingest', 'validate', 'top-items', 'rank', 'watch',
+                       'generate')
+DATA_OPTIONS = {'start': '--start', 'end': '--end', 'partition': '--partition', 'backend': '--backend'}
+
+
+def _check_options(parser, args):
+    if args.command not in STANDALONE_COMMANDS:
+        return
+    given = [flag for name, flag in DATA_OPTIONS.items() if getattr(args, name) not in (None, [])]
+    if given:
+        parser.error(f"{', '.join(given)} cannot be used with the '{args.command}' command "
+                     f"(only with the report commands, e.g. kpi or task4)")
+
+
+def _partition_filters(options):
+    # ['year=2016,2017', 'region=West'] -> {'year': ['2016', '2017'], 'region': ['West']}
+    filters = {}
+    for option in options:
+        key, _, values = option.partition('=')
+        filters[key.strip()] = [value.strip() for value in values.split(',')]
+    return filters
+
+
+def _run_command(args):
+    if args.command == 'serve':
+        from superstore import service
+        service.main(['--csv', args.csv, '--host', args.host, '--port', str(args.port),
+                      '--cache-size', str(args.cache_size)])
+        return
+
+    if args.command == 'run-all':
+        run_pipeline(args)
+        return
+
+    if args.command == 'benchmark':
+        run_benchmark_matrix(args)
+        return
+
+    if args.command == 'ingest':
+        run_ingest(args)
+        return
+
+    if args.command == 'validate':
+        run_validate(args)
+        return
+
+    if args.command == 'top-items':
+        run_top_items(args)
+        return
+
+    if args.command == 'rank':
+        run_rank(args)
+        return
+
+    if args.command == 'watch':
+        run_watch(args)
+        return
+
+    if args.command == 'generate':
+        run_generate(args)
+        return
+
+    function, columns, rows, help_text = COMMANDS[args.command]
+    windowing = args.start is not None or args.end is not None
+    if windowing and columns is not None and 'Order Date' not in columns:
+        columns = columns + ['Order Date']
+    # A window needs every row read first; sample-row commands then take their rows from the window
+    df = load_superstore(args.csv, columns=columns, nrows=None if windowing else rows,
+                         filters=_partition_filters(args.partition))
+    print(f"Loaded {df.shape[0]} rows × {df.shape[1]} columns from '{args.csv}'")
+    df = prepare_dataset(df)
+    if windowing:
+        df = date_window(df, args.start, args.end)
+        print(f"Order Date window {args.start or '...'} to {args.end or '...'}: {len(df)} rows")
+        if rows is not None:
+            df = df.head(rows)
+    function(df, args)
+
+
+def _write_traces(args):
+    _heading("STAGE TIMINGS")
+    print(tracing.summary().round(4).to_string())
+    if args.trace:
+        print(f"Saved '{tracing.export_json(args.trace)}'")
+    if args.chrome_trace:
+        print(f"Saved '{tracing.export_chrome_trace(args.chrome_trace)}'")
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    _check_options(parser, args)
+    tracing_requested = args.trace or args.chrome_trace
+    if tracing_requested:
+        tracing.enable()
+    if args.result_cache:
+        memo.configure(args.result_cache, max_bytes=int(args.result_cache_mb * 1024**2))
+    try:
+        _run_command(args)
+    finally:
+        if tracing_requested:
+            tracing.disable()
+            _write_traces(args)
+        if memo.result_cache() is not None:
+            stats = memo.result_cache().stats()
+            print(f"\nResult cache: {stats['hits']} hit(s), {stats['misses']} miss(es), "
+                  f"{stats['entries']} entries ({stats['bytes'] / 1024**2:.2f} MB)")
@@ -0,0 +1,184 @@
+# Sorted date index for time-range slicing
+# ============================================================================
+# Restricting an analysis to a date window normally compares every row's
+# Order Date. A DateIndex sorts the int32 day numbers of Order Date and Ship
+# Date once per DataFrame (keeping the row position of each). A window
+# [start, end] is then two binary searches (np.searchsorted) into the sorted
+# days, which give one contiguous range of the sorted positions: the cost
+# grows with the log of the table size plus the rows returned, not with the
+# table size.
+#
+# If the DataFrame is already stored in date order (see sort_by_date()), the
+# window is a plain row slice and no rows are copied at all.
+#
+# The index is cached per DataFrame together with a cheap signature of the
+# date columns it was built from: the identity of each column's memory plus a
+# few sampled values. Sorting the DataFrame in place or assigning a new date
+# column changes the signature, and the index is rebuilt.
+#
+# Every report, scenario and pivot takes `start` / `end` through the
+# @windowed decorator, e.g. reports.category_region(df, start='2017-01-01').
+# Both ends are inclusive and either can be left out.
+#
+# Example:
+#   index = date_index(df)
+#   index.row_ids('2017-01-01', '2017-03-31')       # row positions, in row order
+#   date_window(df, '2017-01-01', '2017-03-31', column='Ship Date')
+# ============================================================================
+
+import functools
+import weakref
+
+import numpy as np
+import pandas as pd
+
+from superstore.dates import DAY_NUMBER_COLUMNS, MISSING_DAY, parse_day_numbers, to_day_numbers
+
+
+def to_day(value):
+    """Day number of a date given as text, Timestamp or date (None stays None)."""
+    if value is None:
+        return None
+    day = to_day_numbers([pd.Timestamp(value)])[0]
+    if day == MISSING_DAY:
+        raise ValueError(f"'{value}' is not a date")
+    return int(day)
+
+
+# Values sampled from each indexed column for the signature
+SIGNATURE_SAMPLES = 16
+
+
+def _source_column(dataframe, date_column):
+    # The column the days are read from: prepare_dataset()'s day numbers when present
+    day_column = DAY_NUMBER_COLUMNS[date_column]
+    if day_column in dataframe.columns:
+        return day_column
+    return date_column if date_column in dataframe.columns else None
+
+
+def signature(dataframe, columns=None):
+    """Cheap fingerprint of the date columns: where their data lives, plus evenly spaced sample values."""
+    parts = [len(dataframe)]
+    samples = np.linspace(0, len(dataframe) - 1, min(SIGNATURE_SAMPLES, len(dataframe))).astype(int)
+    for date_column in columns or DAY_NUMBER_COLUMNS:
+        # The date column too, so assigning new dates is noticed even when the day numbers are stale
+        for column in dict.fromkeys([_source_column(dataframe, date_column), date_column]):
+            if column not in dataframe.columns:
+                continue
+            series = dataframe[column]
+            if isinstance(series.dtype, np.dtype):
+                memory = series.to_numpy().__array_interface__['data'][0]  # No copy for NumPy dtypes
+            else:
+                memory = id(series.array)  # Extension arrays are held by the DataFrame itself
+            parts.append((column, memory, tuple(series.iloc[samples].tolist())))
+    return tuple(parts)
+
+
+class DateIndex:
+    """Row positions of a DataFrame sorted by each date column's day number."""
+
+    def __init__(self, dataframe, columns=None):
+        self.length = len(dataframe)
+        self.signature = signature(dataframe, columns)
+        self.sorted_days = {}  # date column -> day numbers in ascending order
+        self.positions = {}  # date column -> row position of each sorted day (None when already in order)
+        for date_column in columns or DAY_NUMBER_COLUMNS:
+            source = _source_column(dataframe, date_column)
+            if source is None:
+                continue
+            if source != date_column:
+                days = dataframe[source].to_numpy(dtype=np.int32)  # Already computed by prepare_dataset()
+            else:
+                days = np.asarray(parse_day_numbers(dataframe[date_column]))
+            if np.all(days[:-1] <= days[1:]):
+                self.sorted_days[date_column], self.positions[date_column] = days, None
+            else:
+                # A stable sort keeps rows with the same day in their original order
+                order = np.argsort(days, kind='stable')
+                self.sorted_days[date_column], self.positions[date_column] = days[order], order
+
+    def _bounds(self, start, end, column):
+        # Binary search for the first and one-past-last sorted position inside [start, end]
+        if column not in self.sorted_days:
+            raise KeyError(f"No date index on '{column}'")
+        days = self.sorted_days[column]
+        start, end = to_day(start), to_day(end)
+        # Missing dates sort first (MISSING_DAY is the smallest int32) and never fall in a window
+        low = np.searchsorted(days, MISSING_DAY + 1 if start is None else max(start, MISSING_DAY + 1), 'left')
+        high = len(days) if end is None else np.searchsorted(days, end, 'right')
+        return int(low), int(max(high, low))
+
+    def is_contiguous(self, column='Order Date'):
+        """True when the rows are stored in date order, so every window is a row slice."""
+        return self.positions[column] is None
+
+    def row_ids(self, start=None, end=None, column='Order Date'):
+        """Row positions whose date is in [start, end], in their original row order."""
+        low, high = self._bounds(start, end, column)
+        if self.positions[column] is None:
+            return np.arange(low, high)
+        return np.sort(self.positions[column][low:high])
+
+    def count(self, start=None, end=None, column='Order Date'):
+        """Number of rows in the window (binary searches only)."""
+        low, high = self._bounds(start, end, column)
+        return high - low
+
+    def window(self, dataframe, start=None, end=None, column='Order Date'):
+        """The rows of the indexed DataFrame whose date is in [start, end]."""
+        if len(dataframe) != self.length:
+            raise ValueError("The DataFrame does not match the index (different number of rows)")
+        if self.positions[column] is None:
+            low, high = self._bounds(start, end, column)
+            return dataframe.iloc[low:high]
+        return dataframe.iloc[self.row_ids(start, end, column)]
+
+
+def sort_by_date(dataframe, column='Order Date'):
+    """A copy of the DataFrame stored in date order (stable), so date windows are row slices."""
+    day_column = DAY_NUMBER_COLUMNS[column]
+    if day_column in dataframe.columns:
+        days = dataframe[day_column].to_numpy()
+    else:
+        days = np.asarray(parse_day_numbers(dataframe[column]))
+    return dataframe.iloc[np.argsort(days, kind='stable')].reset_index(drop=True)
+
+
+# ============================================================================
+# One index per DataFrame, reused by every windowed call
+# ============================================================================
+
+_INDEXES = {}  # id(DataFrame) -> (weak reference, DateIndex)
+
+
+def _release(key, index):
+    entry = _INDEXES.get(key)
+    if entry is not None and entry[1] is index:
+        del _INDEXES[key]
+
+
+def date_index(dataframe):
+    """The DataFrame's DateIndex, built on first use (or after its dates changed) and dropped with the DataFrame."""
+    entry = _INDEXES.get(id(dataframe))
+    if entry is not None and entry[0]() is dataframe and entry[1].signature == signature(dataframe):
+        return entry[1]
+    index = DateIndex(dataframe)
+    _INDEXES[id(dataframe)] = (weakref.ref(dataframe), index)
+    weakref.finalize(dataframe, _release, id(dataframe), index)
+    return index
+
+
+def date_window(dataframe, start=None, end=None, column='Order Date'):
+    """Rows of the DataFrame with `column` in [start, end]; the whole DataFrame when both are None."""
+    if start is None and end is None:
+        return dataframe
+    return date_index(dataframe).window(dataframe, start, end, column)
+
+
+def windowed(function):
+    """Decorator adding `start`, `end` and `date_column` keyword arguments to a function of a DataFrame."""
+    @functools.wraps(function)
+    def wrapper(dataframe, *args, start=None, end=None, date_column='Order Date', **kwargs):
+        return function(date_window(dataframe, start, end, date_column), *args, **kwargs)
+    return wrapper
@@ -0,0 +1,341 @@
+# Out-of-core external merge sort for complete rankings
+# ============================================================================
+# product_profitability() and customer_segmentation() rank their groups with
+# sort_values(), which needs the whole table in memory, and the product report
+# only keeps the top N. For a full product or customer ranking of a dataset
+# larger than memory, the rows are sorted externally:
+# 1. rows arrive in chunks and are buffered until `run_rows` are held
+# 2. the buffer is sorted and written to disk as a "run" of pickled blocks
+# 3. the runs are merged k ways, a block from each run at a time: every row up
+#    to the smallest last key of the loaded blocks is final, so those rows are
+#    sorted together and yielded, and the used-up blocks are replaced
+#    (with more than `fan_in` runs, groups of runs are first merged into
+#    longer runs, so the open blocks stay bounded)
+# Ties are broken by arrival order, so the sort is stable.
+#
+# The rankings use the sort twice: once by a 64-bit hash of the group columns
+# (so each product's rows arrive together and can be aggregated one chunk at
+# a time), then by the measure being ranked. Memory stays around `run_rows`
+# rows however large the dataset is, and the ranked rows are streamed out in
+# chunks, e.g. into write_csv().
+#
+# Example:
+#   for chunk in product_ranking('big.csv', run_rows=500_000):
+#       ...
+#   write_csv(customer_ranking(df), 'customer_ranking.csv')
+# ============================================================================
+
+import os
+import pickle
+import shutil
+import tempfile
+import weakref
+
+import numpy as np
+import pandas as pd
+
+from superstore.loader import READ_OPTIONS, is_partitioned, partition_files
+from superstore.reports import REPORT_COLUMNS, assign_tier
+from superstore.tracing import traced
+
+# Rows held in memory before a sorted run is written to disk
+DEFAULT_RUN_ROWS = 1_000_000
+
+# Rows per block inside a run file (the unit read back while merging)
+DEFAULT_BLOCK_ROWS = 16_384
+
+# Most runs merged at once: a merge holds about fan_in x block_rows rows
+DEFAULT_FAN_IN = 32
+
+# Rows per chunk read from a CSV file
+DEFAULT_CHUNK_ROWS = 250_000
+
+# Hidden column holding the group hash while rows are sorted by group
+GROUP_KEY = '__group_key'
+
+
+def sort_key(values, ascending=True):
+    """Numeric array whose ascending order is the wanted order of `values` (missing values last)."""
+    values = values.to_numpy() if isinstance(values, pd.Series) else np.asarray(values)
+    if values.dtype.kind in 'iu':
+        # ~x reverses the order of both signed and unsigned integers without overflowing
+        return values if ascending else ~values
+    try:
+        key = values.astype(np.float64)
+    except (TypeError, ValueError):
+        raise TypeError("External sort keys must be numeric (use group_key() for text columns)") from None
+    key = key if ascending else -key
+    return np.where(np.isnan(key), np.inf, key)
+
+
+def group_key(frame, columns):
+    """64-bit hash of each row's values in `columns`: rows of the same group get the same key."""
+    frame = frame[list(columns)]
+    # Numbers are hashed as float64, so a column read as int in one chunk and float in another still matches
+    numeric = frame.select_dtypes('number').columns
+    frame = frame.astype({column: np.float64 for column in numeric})
+    return pd.util.hash_pandas_object(frame, index=False).to_numpy()
+
+
+# ============================================================================
+# Runs on disk and the k-way merge
+# ============================================================================
+
+def _read_run(path):
+    # Blocks of (rows, sort keys, arrival numbers), one pickle after another
+    with open(path, 'rb') as file:
+        while True:
+            try:
+                yield pickle.load(file)
+            except EOFError:
+                return
+
+
+def _merge_blocks(runs):
+    """k-way merge of sorted block streams into sorted blocks."""
+    runs = [iter(run) for run in runs]
+    heads = [next(run, None) for run in runs]
+    while True:
+        live = [i for i, head in enumerate(heads) if head is not None]
+        if not live:
+            return
+        # (key, arrival) pairs are unique, and rows still on disk come after their run's last loaded row,
+        # so every loaded row up to the smallest last row is in its final place
+        cut_key, cut_seq = min((heads[i][1][-1], heads[i][2][-1]) for i in live)
+        parts = []
+        for i in live:
+            frame, key, seq = heads[i]
+            ready = int(np.count_nonzero((key < cut_key) | ((key == cut_key) & (seq <= cut_seq))))
+            if ready:
+                parts.append((frame.iloc[:ready], key[:ready], seq[:ready]))
+            heads[i] = next(runs[i], None) if ready == len(key) else (frame.iloc[ready:], key[ready:], seq[ready:])
+        frame = pd.concat([part[0] for part in parts], ignore_index=True)
+        key = np.concatenate([part[1] for part in parts])
+        seq = np.concatenate([part[2] for part in parts])
+        order = np.lexsort((seq, key))
+        yield frame.iloc[order].reset_index(drop=True), key[order], seq[order]
+
+
+class ExternalSorter:
+    """Sorts a stream of DataFrame chunks by one numeric column, spilling sorted runs to disk.
+
+    Add every chunk with add(), then read the sorted rows once from sorted_chunks().
+    The spill folder is deleted by close() (or when the sorter is garbage collected).
+    """
+
+    def __init__(self, by, ascending=True, run_rows=DEFAULT_RUN_ROWS, block_rows=DEFAULT_BLOCK_ROWS,
+                 fan_in=DEFAULT_FAN_IN, directory=None):
+        self.by = by
+        self.ascending = ascending
+        self.run_rows = run_rows
+        self.block_rows = block_rows
+        self.fan_in = max(fan_in, 2)
+        self.directory = tempfile.mkdtemp(prefix='superstore-sort-', dir=directory)
+        self._cleanup = weakref.finalize(self, shutil.rmtree, self.directory, True)
+        self.runs = []  # Paths of the sorted runs, in the order they were written
+        self.rows = 0
+        self._buffer = []
+        self._buffered = 0
+        self._written = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self._cleanup()
+
+    def add(self, chunk):
+        """Adds rows; a sorted run is written whenever `run_rows` rows are buffered."""
+        if len(chunk):
+            self._buffer.append(chunk)
+            self._buffered += len(chunk)
+            if self._buffered >= self.run_rows:
+                self._spill()
+        return self
+
+    def _sorted_buffer(self):
+        frame = pd.concat(self._buffer, ignore_index=True)
+        key = sort_key(frame[self.by], self.ascending)
+        seq = np.arange(self.rows, self.rows + len(frame))  # Arrival numbers break ties
+        self.rows += len(frame)
+        self._buffer, self._buffered = [], 0
+        order = np.argsort(key, kind='stable')
+        return frame.iloc[order].reset_index(drop=True), key[order], seq[order]
+
+    def _write_run(self, blocks):
+        path = os.path.join(self.directory, f"run-{self._written:05d}.pkl")
+        self._written += 1
+        with open(path, 'wb') as file:
+            for frame, key, seq in blocks:
+                # Merged blocks can be larger than block_rows; cut them back so later merges stay bounded
+                for start in range(0, len(frame), self.block_rows):
+                    stop = start + self.block_rows
+                    block = (frame.iloc[start:stop].reset_index(drop=True), key[start:stop], seq[start:stop])
+                    pickle.dump(block, file, protocol=pickle.HIGHEST_PROTOCOL)
+        self.runs.append(path)
+
+    def _spill(self):
+        self._write_run([self._sorted_buffer()])
+
+    def _reduce_runs(self):
+        # Too many runs to open at once: merge the oldest fan_in runs into one longer run until few enough remain
+        while len(self.runs) > self.fan_in:
+            group, self.runs = self.runs[:self.fan_in], self.runs[self.fan_in:]
+            self._write_run(_merge_blocks([_read_run(path) for path in group]))
+            for path in group:
+                os.remove(path)
+
+    def sorted_chunks(self):
+        """Yields every added row in sorted order, one DataFrame chunk at a time."""
+        if not self.runs:
+            # Everything fitted in memory: no run is written
+            if self._buffered:
+                frame, _, _ = self._sorted_buffer()
+                for start in range(0, len(frame), self.block_rows):
+                    yield frame.iloc[start:start + self.block_rows]
+            return
+        if self._buffered:
+            self._spill()
+        self._reduce_runs()
+        for frame, _, _ in _merge_blocks([_read_run(path) for path in self.runs]):
+            yield frame
+
+
+def external_sort(chunks, by, ascending=True, **options):
+    """Sorted chunks of a stream of DataFrame chunks (options as for ExternalSorter)."""
+    with ExternalSorter(by, ascending, **options) as sorter:
+        for chunk in chunks:
+            sorter.add(chunk)
+        yield from sorter.sorted_chunks()
+
+
+# ============================================================================
+# Streaming groups and ranks
+# ============================================================================
+
+def iter_chunks(source, columns=None, chunksize=DEFAULT_CHUNK_ROWS):
+    """Chunks of rows from a DataFrame, a CSV file, or a partitioned folder / glob (only `columns`)."""
+    if isinstance(source, pd.DataFrame):
+        frame = source if columns is None else source[columns]
+        for start in range(0, len(frame), chunksize):
+            yield frame.iloc[start:start + chunksize]
+        return
+    for path in partition_files(source) if is_partitioned(source) else [source]:
+        if path.endswith('.parquet'):
+            yield pd.read_parquet(path, columns=columns)  # One partition at a time
+        else:
+            for chunk in pd.read_csv(path, usecols=columns, chunksize=chunksize, **READ_OPTIONS):
+                yield chunk if columns is None else chunk[columns]
+
+
+def complete_groups(chunks, key_column):
+    """Re-cuts chunks sorted by a group key so that each group lies entirely inside one chunk."""
+    carry = None
+    for chunk in chunks:
+        if carry is not None:
+            chunk = pd.concat([carry, chunk], ignore_index=True)
+        keys = chunk[key_column].to_numpy()
+        # The last group may continue in the next chunk, so it is held back
+        cut = int(np.searchsorted(keys, keys[-1], 'left'))
+        if cut:
+            yield chunk.iloc[:cut]
+        carry = chunk.iloc[cut:]
+    if carry is not None and len(carry):
+        yield carry
+
+
+def grouped_chunks(chunks, by, aggregations, **options):
+    """Named aggregations {name: (column, function)} per group of a stream of rows, a chunk of groups at a time.
+
+    Groups come out in hash order, not sorted by name.
+    """
+    by = [by] if isinstance(by, str) else list(by)
+    keyed = (chunk.assign(**{GROUP_KEY: group_key(chunk, by)}) for chunk in chunks)
+    for chunk in complete_groups(external_sort(keyed, GROUP_KEY, **options), GROUP_KEY):
+        yield chunk.groupby(by, sort=False).agg(**aggregations)
+
+
+def rank_chunks(chunks, by, ascending=False, rank_column='Rank', **options):
+    """The rows sorted by one column with a 1-based rank (tied values share the lowest rank)."""
+    position = 0
+    previous_key, previous_rank = None, 0
+    for chunk in external_sort(chunks, by, ascending, **options):
+        key = sort_key(chunk[by], ascending)
+        positions = np.arange(position + 1, position + len(chunk) + 1)
+        # A row starts a new rank unless its value equals the row before it (also across chunks)
+        new = np.r_[previous_key is None or key[0] != previous_key, key[1:] != key[:-1]]
+        ranks = np.where(new, positions, 0)
+        ranks[0] = ranks[0] or previous_rank
+        ranks = np.maximum.accumulate(ranks)
+        chunk = chunk.reset_index(drop=True)
+        chunk.insert(0, rank_column, ranks)
+        position += len(chunk)
+        previous_key, previous_rank = key[-1], ranks[-1]
+        yield chunk
+
+
+# ============================================================================
+# Full product and customer rankings
+# ============================================================================
+
+# Same measures as reports.product_profitability() and reports.customer_segmentation()
+PRODUCT_AGGREGATIONS = {
+    'Profit': ('Profit', 'sum'),
+    'Sales': ('Sales', 'sum'),
+    'Quantity': ('Quantity', 'sum'),
+    'Times Ordered': ('Order ID', 'count'),
+}
+CUSTOMER_AGGREGATIONS = {
+    'total_spent': ('Sales', 'sum'),
+    'total_orders': ('Order ID', 'nunique'),
+}
+
+
+def product_ranking(source, by='Profit', ascending=False, chunksize=DEFAULT_CHUNK_ROWS, **options):
+    """Every product ranked by `by` (most profitable first): the full table behind product_profitability()."""
+    rows = iter_chunks(source, REPORT_COLUMNS['product_profitability'], chunksize)
+    groups = (chunk.round(2).reset_index() for chunk in grouped_chunks(rows, 'Product Name', PRODUCT_AGGREGATIONS,
+                                                                      **options))
+    for chunk in rank_chunks(groups, by, ascending, **options):
+        chunk['Profit per Unit'] = (chunk['Profit'] / chunk['Quantity']).round(2)
+        yield chunk
+
+
+def customer_ranking(source, by='total_spent', ascending=False, chunksize=DEFAULT_CHUNK_ROWS, **options):
+    """Every customer ranked by `by` (biggest spenders first) with the customer_segmentation() columns."""
+    rows = iter_chunks(source, REPORT_COLUMNS['customer_segmentation'], chunksize)
+    groups = (chunk.reset_index() for chunk in grouped_chunks(rows, ['Customer ID', 'Customer Name'],
+                                                              CUSTOMER_AGGREGATIONS, **options))
+    for chunk in rank_chunks(groups, by, ascending, **options):
+        chunk['Tier'] = chunk['total_spent'].apply(assign_tier)
+        yield chunk
+
+
+RANKINGS = {
+    'products': product_ranking,
+    'customers': customer_ranking,
+}
+
+
+def write_csv(chunks, path):
+    """Streams chunks into one CSV file (like the Task 3 exports); returns the number of rows written."""
+    rows = 0
+    with open(path, 'w', newline='', encoding='utf-8') as file:
+        for chunk in chunks:
+            chunk.to_csv(file, index=False, header=rows == 0)
+            rows += len(chunk)
+    return rows
+
+
+@traced(category='export')
+def export_rankings(source, output_dir='.', **options):
+    """Writes product_ranking.csv and customer_ranking.csv with bounded memory; returns the paths written."""
+    paths = []
+    for name, ranking in RANKINGS.items():
+        path = os.path.join(output_dir, f"{name[:-1]}_ranking.csv")
+        write_csv(ranking(source, **options), path)
+        paths.append(path)
+    return paths
@@ -0,0 +1,400 @@
+# Append-only incremental ingestion with materialized views
+# ============================================================================
+# A new CSV of orders arrives every day. Instead of concatenating everything
+# and re-running the reports, an IncrementalStore:
+# - appends each batch to the store folder as its own file (batch-00001.csv,
+#   batch-00002.csv, ...), never rewriting earlier data
+# - keeps "materialized views": running totals per group for the reports
+#   (Category x Region, Segment, Sub-Category, customers, monthly profit)
+# - updates every view from the new batch only. The batch is grouped once
+#   (cost proportional to the batch) and each group's partial totals are added
+#   into a dictionary of running totals (cost proportional to the groups in
+#   the batch), so history is never scanned again.
+#
+# Every batch is also run through the data-quality rules (quality.py) as it
+# arrives, so store.quality.results() covers everything ingested. The
+# duplicate rules remember every row ever seen, so they are only checked when
+# asked for (quality_rules=list(RULES)); by default only rules whose state
+# stays the same size are used.
+#
+# checkpoint() saves the views, so reopening the store only replays the
+# batches that arrived after the last checkpoint. It only writes what changed:
+# a delta file (views-00042.pkl) with views built from the batches since the
+# previous checkpoint, so its cost also follows the new batches, not history.
+# Reopening loads the base file (views.pkl) and merges the deltas in order;
+# compact() folds them back into one base file when there are many.
+#
+# Example:
+#   store = IncrementalStore('superstore_store')
+#   store.append('orders_2018_01_01.csv')
+#   store.result('category_region')
+#   store.checkpoint()
+# ============================================================================
+
+import glob
+import os
+import pickle
+import re
+
+import numpy as np
+import pandas as pd
+
+from superstore.dates import parse_dates
+from superstore.loader import READ_OPTIONS, load_superstore
+from superstore.quality import Validator, stateless_rules
+from superstore.reports import assign_tier
+from superstore.timeseries import mom_growth
+from superstore.tracing import traced
+
+BATCH_PATTERN = 'batch-*.csv'
+CHECKPOINT_FILE = 'views.pkl'
+DELTA_PATTERN = 'views-*.pkl'
+
+
+# ============================================================================
+# Materialized views
+# ============================================================================
+
+class MaterializedView:
+    """Running totals per group, updated in place from each batch's grouped partials.
+
+    Subclasses set `by` (group columns), `measures` ({output: (column, 'sum' or
+    'count')}) and `columns` (every column the view reads), and turn the totals
+    into the report table in result().
+    """
+
+    by = []
+    measures = {}
+    columns = []
+
+    def __init__(self):
+        self.totals = {}  # group key -> NumPy array of running totals (in `measures` order)
+
+    def group_keys(self, batch):
+        # The columns (or derived Series) the batch is grouped by
+        return [batch[column] for column in self.by]
+
+    def update(self, batch):
+        """Adds one batch's partial totals into the running totals."""
+        partial = batch.groupby(self.group_keys(batch), sort=False).agg(
+            **{name: pd.NamedAgg(column=column, aggfunc=aggfunc)
+               for name, (column, aggfunc) in self.measures.items()})
+        for key, values in zip(partial.index, partial.to_numpy(dtype=float)):
+            running = self.totals.get(key)
+            if running is None:
+                self.totals[key] = values.copy()
+            else:
+                running += values
+
+    def table(self):
+        """The running totals as a DataFrame sorted by group."""
+        keys = list(self.totals)
+        if len(self.by) > 1:
+            index = pd.MultiIndex.from_tuples(keys, names=self.by)
+        else:
+            index = pd.Index(keys, name=self.by[0])
+        values = np.array(list(self.totals.values())).reshape(len(keys), len(self.measures))
+        return pd.DataFrame(values, index=index, columns=list(self.measures)).sort_index()
+
+    def merge(self, other):
+        """Adds the running totals of another view of the same type (e.g. a checkpoint delta)."""
+        for key, values in other.totals.items():
+            running = self.totals.get(key)
+            if running is None:
+                self.totals[key] = values.copy()
+            else:
+                running += values
+        return self
+
+    def result(self):
+        return self.table()
+
+
+class CategoryRegionView(MaterializedView):
+    """Same table as reports.category_region()."""
+
+    by = ['Category', 'Region']
+    measures = {'Sales': ('Sales', 'sum'), 'Profit': ('Profit', 'sum'), 'Order Count': ('Order ID', 'count')}
+    columns = ['Category', 'Region', 'Sales', 'Profit', 'Order ID']
+
+    def result(self):
+        analysis = self.table().astype({'Order Count': 'int64'}).round(2)
+        analysis['Profit Margin (%)'] = ((analysis['Profit'] / analysis['Sales']) * 100).round(2)
+        return analysis
+
+
+class SubCategoryView(MaterializedView):
+    """Same table as reports.subcategory()."""
+
+    by = ['Sub-Category']
+    measures = {'Profit': ('Profit', 'sum'), 'Sales': ('Sales', 'sum'), 'Quantity': ('Quantity', 'sum'),
+                'Order Count': ('Order ID', 'count')}
+    columns = ['Sub-Category', 'Profit', 'Sales', 'Quantity', 'Order ID']
+
+    def result(self):
+        performance = self.table().astype({'Quantity': 'int64', 'Order Count': 'int64'}).round(2)
+        performance['Profit Margin (%)'] = ((performance['Profit'] / performance['Sales']) * 100).round(2)
+        performance['Profit per Order'] = (performance['Profit'] / performance['Order Count']).round(2)
+        return performance.sort_values('Profit', ascending=False)
+
+
+class SegmentView(MaterializedView):
+    """Same table as reports.segment().
+
+    Means are kept as sums and counts. The median and the distinct customers
+    cannot be added up, so the view also keeps each segment's Sales value counts
+    and its set of customers (both updated from the batch only). The median and
+    customer counts are exact, at the cost of memory that grows with history (one
+    entry per distinct Sales value and per customer).
+    """
+
+    by = ['Segment']
+    measures = {'Total Sales': ('Sales', 'sum'), 'Sales Count': ('Sales', 'count'),
+                'Total Profit': ('Profit', 'sum'), 'Profit Count': ('Profit', 'count'),
+                'Quantity Total': ('Quantity', 'sum'), 'Quantity Count': ('Quantity', 'count'),
+                'Discount Total': ('Discount', 'sum'), 'Discount Count': ('Discount', 'count'),
+                'Total Orders': ('Order ID', 'count')}
+    columns = ['Segment', 'Sales', 'Profit', 'Quantity', 'Discount', 'Order ID', 'Customer ID']
+
+    def __init__(self):
+        super().__init__()
+        self.sales_counts = {}  # segment -> {Sales value: number of rows}
+        self.customers = {}  # segment -> set of Customer IDs
+
+    def update(self, batch):
+        super().update(batch)
+        for (segment, sales), count in batch.groupby(['Segment', 'Sales'], sort=False).size().items():
+            counts = self.sales_counts.setdefault(segment, {})
+            counts[sales] = counts.get(sales, 0) + count
+        for segment, customers in batch.groupby('Segment', sort=False)['Customer ID']:
+            self.customers.setdefault(segment, set()).update(customers.dropna())
+
+    def merge(self, other):
+        super().merge(other)
+        for segment, other_counts in other.sales_counts.items():
+            counts = self.sales_counts.setdefault(segment, {})
+            for sales, count in other_counts.items():
+                counts[sales] = counts.get(sales, 0) + count
+        for segment, customers in other.customers.items():
+            self.customers.setdefault(segment, set()).update(customers)
+        return self
+
+    def _median(self, segment):
+        # Median from the value counts: the middle value(s) of the sorted Sales
+        counts = pd.Series(self.sales_counts[segment]).sort_index()
+        cumulative = counts.cumsum().to_numpy()
+        total = cumulative[-1]
+        lower = counts.index[np.searchsorted(cumulative, (total - 1) // 2 + 1)]
+        upper = counts.index[np.searchsorted(cumulative, total // 2 + 1)]
+        return (lower + upper) / 2
+
+    def result(self):
+        totals = self.table()
+        analysis = pd.DataFrame(index=totals.index)
+        analysis['Total Sales'] = totals['Total Sales']
+        analysis['Avg Order Value'] = totals['Total Sales'] / totals['Sales Count']
+        analysis['Median Order Value'] = [self._median(segment) for segment in totals.index]
+        analysis['Total Profit'] = totals['Total Profit']
+        analysis['Avg Profit per Order'] = totals['Total Profit'] / totals['Profit Count']
+        analysis['Avg Quantity per Order'] = totals['Quantity Total'] / totals['Quantity Count']
+        analysis['Avg Discount (%)'] = totals['Discount Total'] / totals['Discount Count']
+        analysis['Total Orders'] = totals['Total Orders'].astype('int64')
+        analysis = analysis.round(2)
+        analysis['Unique Customers'] = [len(self.customers.get(segment, ())) for segment in totals.index]
+        analysis['Avg Profit per Customer'] = (analysis['Total Profit'] / analysis['Unique Customers']).round(2)
+        return analysis
+
+
+class CustomerView(MaterializedView):
+    """Same table as reports.customer_segmentation(): totals, distinct orders and tier per customer.
+
+    The distinct order count keeps every customer's Order IDs, so it grows with history.
+    """
+
+    by = ['Customer ID', 'Customer Name']
+    measures = {'total_spent': ('Sales', 'sum')}
+    columns = ['Customer ID', 'Customer Name', 'Sales', 'Order ID']
+
+    def __init__(self):
+        super().__init__()
+        self.orders = {}  # (Customer ID, Customer Name) -> set of Order IDs
+
+    def update(self, batch):
+        super().update(batch)
+        for key, orders in batch.groupby(self.by, sort=False)['Order ID']:
+            self.orders.setdefault(key, set()).update(orders.dropna())
+
+    def merge(self, other):
+        super().merge(other)
+        for key, orders in other.orders.items():
+            self.orders.setdefault(key, set()).update(orders)
+        return self
+
+    def result(self):
+        customer_segment = self.table()
+        customer_segment['total_orders'] = [len(self.orders.get(key, ())) for key in customer_segment.index]
+        customer_segment = customer_segment.reset_index()
+        customer_segment['Tier'] = customer_segment['total_spent'].apply(assign_tier)
+        return customer_segment.sort_values(by='total_spent', ascending=False)
+
+
+class MonthlyProfitView(MaterializedView):
+    """Same tables as reports.monthly_trend(): monthly profit by Category and its growth (%)."""
+
+    by = ['Period', 'Category']
+    measures = {'Profit': ('Profit', 'sum')}
+    columns = ['Order Date', 'Category', 'Profit']
+
+    def group_keys(self, batch):
+        # Parse only the batch's dates, then group by calendar month
+        return [parse_dates(batch['Order Date']).dt.to_period('M').rename('Period'), batch['Category']]
+
+    def result(self):
+        table = self.table()['Profit'].unstack('Category', fill_value=0)
+        full_range = pd.period_range(table.index.min(), table.index.max(), freq='M')
+        monthly_profit_wide = table.reindex(full_range, fill_value=0)
+        monthly_profit_wide.index.name = 'Period'
+        monthly_profit_wide = monthly_profit_wide.round(2)
+        return monthly_profit_wide, mom_growth(monthly_profit_wide)
+
+
+# Registry of views: name -> view class
+VIEWS = {}
+
+
+def register_view(name, view_class):
+    """Adds a materialized view type that every new IncrementalStore maintains."""
+    VIEWS[name] = view_class
+    return view_class
+
+
+register_view('category_region', CategoryRegionView)
+register_view('segment', SegmentView)
+register_view('subcategory', SubCategoryView)
+register_view('customer_segmentation', CustomerView)
+register_view('monthly_trend', MonthlyProfitView)
+
+
+# ============================================================================
+# The store
+# ============================================================================
+
+class IncrementalStore:
+    """Append-only folder of batch files plus materialized views kept up to date."""
+
+    def __init__(self, directory, views=None, quality_rules=None):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self.view_names = list(views or VIEWS)
+        self.views = self._new_views()
+        self.quality = Validator(quality_rules or stateless_rules())
+        self.batches = sorted(glob.glob(os.path.join(directory, BATCH_PATTERN)))
+
+        # Start from the last checkpoint (base file plus deltas), then replay only the batches stored after it
+        self.checkpointed = self._load_checkpoint()
+        self._delta = self._new_views()  # Views of the batches since the last checkpoint
+        for path in self.batches[self.checkpointed:]:
+            self._apply(load_superstore(path))
+
+    def _new_views(self):
+        return {name: VIEWS[name]() for name in self.view_names}
+
+    def _read(self, path):
+        with open(path, 'rb') as file:
+            saved = pickle.load(file)
+        usable = list(saved['views']) == self.view_names and saved['batches'] <= len(self.batches)
+        return saved if usable else None
+
+    def _load_checkpoint(self):
+        # Returns how many batches the loaded views already include
+        applied = 0
+        base = os.path.join(self.directory, CHECKPOINT_FILE)
+        saved = self._read(base) if os.path.exists(base) else None
+        if saved is not None:
+            self.views = saved['views']
+            # Checkpoints written before quality checks existed have no validator
+            self.quality = saved.get('quality', self.quality)
+            applied = saved['batches']
+        # Deltas are merged in order while each one continues where the previous stopped
+        for path in self._delta_files():
+            delta = self._read(path)
+            if delta is None or delta['first'] != applied:
+                continue
+            for name, view in self.views.items():
+                view.merge(delta['views'][name])
+            self.quality = delta['quality']
+            applied = delta['batches']
+        return applied
+
+    def _delta_files(self):
+        paths = glob.glob(os.path.join(self.directory, DELTA_PATTERN))
+        return sorted(paths, key=lambda path: int(re.findall(r'\d+', os.path.basename(path))[-1]))
+
+    @property
+    def columns(self):
+        """Every column the views read (a batch must contain them all)."""
+        columns = []
+        for view in self.views.values():
+            columns.extend(column for column in view.columns if column not in columns)
+        return columns
+
+    def _apply(self, batch):
+        for name, view in self.views.items():
+            view.update(batch)
+            self._delta[name].update(batch)
+        self.quality.update(batch)
+
+    @traced(category='ingest')
+    def append(self, batch):
+        """Stores a batch (DataFrame or CSV path) and updates every view; returns the rows added."""
+        if isinstance(batch, str):
+            batch = load_superstore(batch)
+        missing = [column for column in self.columns if column not in batch.columns]
+        if missing:
+            raise ValueError(f"Batch is missing columns: {', '.join(missing)}")
+
+        # Append-only: every batch becomes a new file, earlier files are never touched
+        path = os.path.join(self.directory, f"batch-{len(self.batches) + 1:05d}.csv")
+        batch.to_csv(path, index=False, encoding=READ_OPTIONS['encoding'])
+        self.batches.append(path)
+        self._apply(batch)
+        return len(batch)
+
+    def result(self, name):
+        """The report table(s) of one view, as of the last appended batch."""
+        return self.views[name].result()
+
+    @staticmethod
+    def _write(path, state):
+        with open(path + '.tmp', 'wb') as file:
+            pickle.dump(state, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(path + '.tmp', path)  # Replace in one step so a crash never leaves half a file
+
+    def checkpoint(self):
+        """Saves what changed since the last checkpoint, so reopening the store does not replay the batches.
+
+        Only the views of the new batches are written (a delta file), never the whole history.
+        """
+        if self.checkpointed == len(self.batches):
+            return None
+        path = os.path.join(self.directory, f"views-{len(self.batches):05d}.pkl")
+        self._write(path, {'first': self.checkpointed, 'batches': len(self.batches), 'views': self._delta,
+                           'quality': self.quality})
+        self.checkpointed = len(self.batches)
+        self._delta = self._new_views()
+        return path
+
+    def compact(self):
+        """Folds the base checkpoint and every delta into one base file (its size follows history)."""
+        path = os.path.join(self.directory, CHECKPOINT_FILE)
+        self._write(path, {'batches': len(self.batches), 'views': self.views, 'quality': self.quality})
+        for delta in self._delta_files():
+            os.remove(delta)
+        self.checkpointed = len(self.batches)
+        self._delta = self._new_views()
+        return path
+
+    def load(self, columns=None):
+        """The whole stored dataset (every batch), e.g. for reports without a view."""
+        frames = [load_superstore(path, columns=columns) for path in self.batches]
+        return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=columns)
@@ -0,0 +1,164 @@
+# Single-pass KPI engine for the executive summary
+# ============================================================================
+# The Task 4 summary used five separate scans of the data (Sales sum, Profit
+# sum, Order ID nunique, Customer ID nunique, Sales mean).
+
+# Here every KPI is declared once as a formula over a small set of running
+# totals (row count, Sales total, Profit total, distinct orders, distinct
+# customers). Those totals are collected together in one pass over each chunk
+# of rows, so the same engine works on the full DataFrame or incrementally as
+# new chunks arrive. Two accumulators can also be merged (e.g. from workers).
+
+# Distinct orders/customers are kept exactly in sets by default; on very large
+# data a HyperLogLog sketch from superstore.sketches is used instead.
+# ============================================================================
+
+import datetime
+
+import numpy as np
+import pandas as pd
+
+from superstore.sketches import APPROXIMATE_THRESHOLD, HyperLogLog
+from superstore.tracing import traced
+
+# Columns the running totals are built from
+KPI_COLUMNS = ['Order ID', 'Customer ID', 'Sales', 'Profit']
+
+
+def _ratio(numerator, denominator):
+    # Safe division: an empty dataset gives NaN instead of an error
+    return numerator / denominator if denominator else float('nan')
+
+
+class KPI:
+    """One declared KPI: a name, a formula over the running totals and a display format."""
+
+    def __init__(self, name, formula, display_format):
+        self.name = name
+        self.formula = formula
+        self.display_format = display_format
+
+    def format(self, value):
+        return self.display_format.format(value)
+
+
+# ============================================================================
+# Registry of KPIs (in display order)
+# ============================================================================
+
+KPIS = {}
+
+
+def register_kpi(name, formula, display_format='{:,.2f}'):
+    """Declares (or replaces) a KPI; `formula` receives the totals dictionary."""
+    KPIS[name] = KPI(name, formula, display_format)
+    return KPIS[name]
+
+
+register_kpi('Total Revenue', lambda t: t['sales'], '${:,.2f}')
+register_kpi('Total Profit', lambda t: t['profit'], '${:,.2f}')
+register_kpi('Overall Profit Margin', lambda t: _ratio(t['profit'], t['sales']) * 100, '{:.2f}%')
+register_kpi('Total Orders', lambda t: t['orders'], '{:,}')
+register_kpi('Total Customers', lambda t: t['customers'], '{:,}')
+register_kpi('Average Order Value', lambda t: _ratio(t['sales'], t['rows']), '${:.2f}')
+register_kpi('Average Orders per Customer', lambda t: _ratio(t['orders'], t['customers']), '{:.2f}')
+register_kpi('Customer Lifetime Value (Avg Profit)', lambda t: _ratio(t['profit'], t['customers']), '${:.2f}')
+
+
+# ============================================================================
+# Accumulator
+# ============================================================================
+
+class KPIAccumulator:
+    """Collects the running totals behind every KPI, one chunk at a time."""
+
+    def __init__(self, approximate=False, error=0.01):
+        self.approximate = approximate
+        self.rows = 0
+        self.sales = 0.0
+        self.profit = 0.0
+        if approximate:
+            self.orders = HyperLogLog(error=error)
+            self.customers = HyperLogLog(error=error)
+        else:
+            self.orders = set()
+            self.customers = set()
+        self.refreshed_at = None
+
+    def _add_distinct(self, tracker, values):
+        if self.approximate:
+            tracker.add(values)
+        else:
+            tracker.update(pd.unique(values[pd.notna(values)]))
+
+    def update(self, chunk):
+        """Adds one chunk of rows (a DataFrame with KPI_COLUMNS) to the totals."""
+        # Sales and Profit are summed together over one 2-column block
+        sums = np.nansum(chunk[['Sales', 'Profit']].to_numpy(dtype=float), axis=0)
+        self.rows += len(chunk)
+        self.sales += float(sums[0])
+        self.profit += float(sums[1])
+        self._add_distinct(self.orders, chunk['Order ID'].to_numpy())
+        self._add_distinct(self.customers, chunk['Customer ID'].to_numpy())
+        return self
+
+    def merge(self, other):
+        """Combines the totals of another accumulator (same exact/approximate mode)."""
+        if other.approximate != self.approximate:
+            raise ValueError("Cannot merge exact and approximate KPI accumulators")
+        self.rows += other.rows
+        self.sales += other.sales
+        self.profit += other.profit
+        if self.approximate:
+            self.orders.merge(other.orders)
+            self.customers.merge(other.customers)
+        else:
+            self.orders |= other.orders
+            self.customers |= other.customers
+        return self
+
+    def totals(self):
+        """Current running totals as plain numbers."""
+        count = (lambda tracker: tracker.count()) if self.approximate else len
+        return {'rows': self.rows, 'sales': self.sales, 'profit': self.profit,
+                'orders': count(self.orders), 'customers': count(self.customers)}
+
+    def results(self):
+        """Evaluates every registered KPI against the current totals."""
+        totals = self.totals()
+        return {name: kpi.formula(totals) for name, kpi in KPIS.items()}
+
+    # ------------------------------------------------------------------
+    # Refresh API for the dashboard
+    # ------------------------------------------------------------------
+
+    def refresh(self, chunk=None):
+        """Adds any newly arrived rows and returns a timestamped snapshot of every KPI."""
+        if chunk is not None and len(chunk) > 0:
+            self.update(chunk)
+        self.refreshed_at = datetime.datetime.now()
+        return self.snapshot()
+
+    def snapshot(self):
+        """KPI values plus formatted text, ready to send to a dashboard."""
+        values = self.results()
+        return {
+            'refreshed_at': self.refreshed_at.isoformat() if self.refreshed_at else None,
+            'approximate': self.approximate,
+            'values': values,
+            'display': {name: KPIS[name].format(value) for name, value in values.items()},
+        }
+
+
+@traced(category='kpi')
+def compute_kpis(dataframe, approximate=None, chunksize=None):
+    """Computes every registered KPI in one pass (optionally chunk by chunk) and returns them."""
+    if approximate is None:
+        approximate = len(dataframe) > APPROXIMATE_THRESHOLD
+    accumulator = KPIAccumulator(approximate=approximate)
+    if chunksize is None:
+        accumulator.update(dataframe)
+    else:
+        for start in range(0, len(dataframe), chunksize):
+            accumulator.update(dataframe.iloc[start:start + chunksize])
+    return accumulator.results()
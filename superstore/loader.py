@@ -0,0 +1,184 @@
+# Dataset loader shared by the superstore modules
+# ============================================================================
+# Loads the Superstore dataset the same way the Task scripts do: first from
+# the project folder, then from the GitHub repository as a fallback. The
+# prepare_dataset() step then runs the ingest work (date parsing, day numbers
+# and bin codes) once so every report can reuse it.
+
+# The dataset can also be a folder (or glob pattern) of partition files, e.g.
+# exports per year/month/region. Partition keys are read from the file paths,
+# both folder-style ("year=2016/region=West/part-0.csv") and plain names
+# ("orders_2016_03.csv" gives year=2016, month=03). A filter such as
+# {'year': [2016, 2017]} skips the files whose keys rule them out before any
+# parsing; files that do not encode a key are always read. The remaining
+# files are parsed at the same time in a process pool, checked against the
+# columns of the first file and concatenated once.
+# ============================================================================
+
+import glob
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from superstore.binning import add_bin_codes
+from superstore.dates import add_date_columns
+from superstore.tracing import traced
+
+try:
+    import pyarrow.parquet as parquet
+except ImportError:
+    parquet = None
+
+# Load the Superstore dataset from the current project folder, or GitHub as a fallback
+CSV_FILE_PATH = "Sample - Superstore.csv"
+GITHUB_URL = "https://github.com/AviPerera/ANA203_Assignment2/blob/master/Sample%20-%20Superstore.csv"
+
+# Same read options as the Task scripts
+READ_OPTIONS = {'on_bad_lines': 'skip', 'encoding': 'latin-1'}
+
+# File types accepted as partitions (Parquet needs pyarrow)
+PARTITION_EXTENSIONS = ('.csv', '.parquet')
+
+# Year (and optional month) in a plain file name, e.g. orders_2016_03.csv or sales-2016.csv
+_YEAR_MONTH = re.compile(r'(?<!\d)((?:19|20)\d{2})(?:[-_](0[1-9]|1[0-2]))?(?!\d)')
+
+
+@traced(category='load')
+def load_superstore(csv_file_path=CSV_FILE_PATH, columns=None, nrows=None, filters=None):
+    """Reads the Superstore CSV from the given path, falling back to the GitHub copy.
+
+    `columns` limits parsing to those columns (column projection) and `nrows`
+    stops after that many rows; None reads everything. A folder or glob pattern
+    is loaded with load_partitions(), pruned by `filters`.
+    """
+    if is_partitioned(csv_file_path):
+        return load_partitions(csv_file_path, columns=columns, filters=filters, nrows=nrows)
+    options = dict(READ_OPTIONS, usecols=columns, nrows=nrows)
+    try:
+        return pd.read_csv(csv_file_path, **options)
+    except FileNotFoundError:
+        try:
+            return pd.read_csv(GITHUB_URL, **options)
+        except Exception as e:
+            raise FileNotFoundError(
+                f"Could not load dataset from any source. Error: {str(e)}\n"
+                f"Please ensure the file '{csv_file_path}' is in your project folder "
+                f"or update the GitHub URL."
+            )
+
+
+# ============================================================================
+# Partitioned datasets
+# ============================================================================
+
+def is_partitioned(path):
+    """True for a folder or a glob pattern rather than a single file."""
+    return os.path.isdir(path) or any(character in path for character in '*?[')
+
+
+def partition_files(source):
+    """Every partition file under a folder (recursively) or matching a glob pattern, sorted by path."""
+    if os.path.isdir(source):
+        paths = glob.glob(os.path.join(source, '**', '*'), recursive=True)
+    else:
+        paths = glob.glob(source, recursive=True)
+    return sorted(path for path in paths if path.lower().endswith(PARTITION_EXTENSIONS) and os.path.isfile(path))
+
+
+def partition_keys(path):
+    """Keys encoded in a partition's path: key=value folders/names, else year (and month) from the name."""
+    keys = {}
+    for part in re.split(r'[\\/]', path):
+        if part.lower().endswith(PARTITION_EXTENSIONS):
+            part = os.path.splitext(part)[0]
+        # Several keys in one name are separated by underscores: year=2016_region=West.csv
+        for token in part.split('_') if part.count('=') > 1 else [part]:
+            if '=' in token:
+                key, value = token.split('=', 1)
+                keys[key.lower()] = value
+    if 'year' not in keys:
+        match = _YEAR_MONTH.search(os.path.basename(path))
+        if match:
+            keys['year'] = match.group(1)
+            if match.group(2):
+                keys['month'] = match.group(2)
+    return keys
+
+
+def prune_partitions(paths, filters=None):
+    """Drops partitions whose path keys contradict a filter {key: value or list of values}."""
+    if not filters:
+        return list(paths)
+    allowed = {key.lower(): {str(value) for value in (values if isinstance(values, (list, tuple, set)) else [values])}
+               for key, values in filters.items()}
+    kept = []
+    for path in paths:
+        keys = partition_keys(path)
+        if all(key not in keys or keys[key] in values for key, values in allowed.items()):
+            kept.append(path)
+    return kept
+
+
+def _read_partition(path, columns, nrows=None):
+    # Worker: parse one partition file, with its columns in the shared order
+    missing = [column for column in columns if column not in _header(path)]
+    if missing:
+        raise ValueError(f"Partition '{path}' does not have the shared columns: missing {missing}")
+    if path.lower().endswith('.parquet'):
+        frame = pd.read_parquet(path, columns=columns)
+        frame = frame.head(nrows) if nrows is not None else frame
+    else:
+        frame = pd.read_csv(path, usecols=columns, nrows=nrows, **READ_OPTIONS)
+    return frame[columns]
+
+
+def _header(path):
+    # Column names only: the Parquet schema (footer) or the CSV header line, no rows are read
+    if path.lower().endswith('.parquet'):
+        if parquet is None:
+            raise ImportError(f"Reading the Parquet partition '{path}' needs the pyarrow package")
+        names = parquet.read_schema(path).names
+        return [name for name in names if not name.startswith('__index_level_')]  # Stored pandas index
+    return list(pd.read_csv(path, nrows=0, **READ_OPTIONS).columns)
+
+
+@traced(category='load')
+def load_partitions(source, columns=None, filters=None, nrows=None, workers=None):
+    """Loads a folder or glob of CSV/Parquet partitions into one DataFrame.
+
+    `filters` prunes partitions by their path keys (see partition_keys()).
+    Every partition must have the columns of the first one (or `columns`).
+    """
+    paths = prune_partitions(partition_files(source), filters)
+    if not paths:
+        raise FileNotFoundError(f"No partition files for '{source}'" + (f" match {filters}" if filters else ""))
+
+    # Shared schema: the requested columns, or the first partition's columns, in that order
+    columns = list(columns) if columns is not None else _header(paths[0])
+
+    if nrows is not None or len(paths) == 1 or workers == 1:
+        # Read in order in this process (stopping as soon as nrows rows are read)
+        frames = []
+        for path in paths:
+            remaining = None if nrows is None else nrows - sum(len(frame) for frame in frames)
+            if remaining == 0:
+                break
+            frames.append(_read_partition(path, columns, remaining))
+    else:
+        workers = workers or min(len(paths), os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            frames = list(pool.map(_read_partition, paths, [columns] * len(paths)))
+
+    # A single partition is returned as it is (no copy). Several partitions are concatenated once,
+    # which copies every column: pandas' NumPy-backed columns need one contiguous array each
+    return frames[0] if len(frames) == 1 else pd.concat(frames, ignore_index=True)
+
+
+@traced(category='prepare')
+def prepare_dataset(dataframe):
+    """Runs the ingest steps: parse dates, add day numbers / ship delay and bin codes."""
+    add_date_columns(dataframe)
+    add_bin_codes(dataframe)
+    return dataframe
@@ -0,0 +1,246 @@
+# Persistent memoization of analysis results
+# ============================================================================
+# The reports are recomputed on every run even when neither the data nor the
+# code changed. @memoized stores each result on disk under a key made from:
+# - a fingerprint of the input DataFrame's contents (column names, dtypes and
+#   a 64-bit hash of every row, computed once per DataFrame and reused)
+# - the other arguments (e.g. top_n, start/end, backend)
+# - the function's name, a version tag, a hash of its own bytecode and a hash
+#   of the superstore package's source files. Editing the function, or any
+#   helper it calls (pivot.py, kpi.py, the backends, ...), starts a new entry.
+#   An edit anywhere in the package therefore invalidates every entry, which
+#   costs a recomputation but never returns a stale result.
+#
+# The cache folder is bounded: when it holds more than `max_entries` files or
+# `max_bytes` bytes, the least recently used entries are deleted. A hit
+# touches the file, so its modification time records the last use. A file
+# that cannot be loaded (truncated, or pickled by older code) is a miss.
+#
+# Memoization is off until configure() is called (or the environment variable
+# SUPERSTORE_CACHE_DIR is set), so the Task scripts behave as before.
+#
+# Example:
+#   configure('.superstore_results', max_bytes=200 * 1024**2)
+#   reports.category_region(df)     # computed and stored
+#   reports.category_region(df)     # loaded from disk
+#   result_cache().stats()
+# ============================================================================
+
+import functools
+import hashlib
+import inspect
+import os
+import pickle
+import threading
+import types
+import weakref
+
+import pandas as pd
+
+DEFAULT_MAX_ENTRIES = 512
+DEFAULT_MAX_BYTES = 512 * 1024**2
+
+# Bumped when the key or file layout changes, so old entries are never read
+CACHE_FORMAT = '1'
+
+
+# ============================================================================
+# Fingerprints
+# ============================================================================
+
+_FINGERPRINTS = {}  # id(DataFrame) -> (weak reference, fingerprint)
+
+
+def _forget(key):
+    _FINGERPRINTS.pop(key, None)
+
+
+def data_fingerprint(dataframe):
+    """Content hash of a DataFrame (columns, dtypes, index and values), computed once per DataFrame.
+
+    Like the other per-DataFrame caches, this assumes a DataFrame is not modified after it is used.
+    """
+    entry = _FINGERPRINTS.get(id(dataframe))
+    if entry is not None and entry[0]() is dataframe:
+        return entry[1]
+    digest = hashlib.blake2b(digest_size=20)
+    digest.update(repr([(str(column), str(dtype)) for column, dtype in dataframe.dtypes.items()]).encode('utf-8'))
+    digest.update(pd.util.hash_pandas_object(dataframe, index=True).to_numpy().tobytes())
+    fingerprint = digest.hexdigest()
+    _FINGERPRINTS[id(dataframe)] = (weakref.ref(dataframe), fingerprint)
+    weakref.finalize(dataframe, _forget, id(dataframe))
+    return fingerprint
+
+
+def code_fingerprint(function):
+    """Hash of a function's bytecode, names and constants (changes whenever its body is edited).
+
+    Decorator wrappers are looked through, so the hash is of the original function.
+    """
+    digest = hashlib.blake2b(digest_size=8)
+
+    def add(code):
+        digest.update(code.co_code)
+        digest.update(repr(code.co_names).encode('utf-8'))
+        for constant in code.co_consts:
+            # Nested functions and lambdas are code objects; their repr holds a memory address
+            if isinstance(constant, types.CodeType):
+                add(constant)
+            else:
+                digest.update(repr(constant).encode('utf-8'))
+
+    add(inspect.unwrap(function).__code__)
+    return digest.hexdigest()
+
+
+@functools.lru_cache(maxsize=None)
+def source_fingerprint(package_dir=os.path.dirname(os.path.abspath(__file__))):
+    """Hash of every .py file in the superstore package (names and contents), computed once per process."""
+    digest = hashlib.blake2b(digest_size=8)
+    for root, directories, files in os.walk(package_dir):
+        directories.sort()
+        for name in sorted(files):
+            if name.endswith('.py'):
+                path = os.path.join(root, name)
+                digest.update(os.path.relpath(path, package_dir).encode('utf-8'))
+                with open(path, 'rb') as file:
+                    digest.update(file.read())
+    return digest.hexdigest()
+
+
+def _argument_key(value):
+    # DataFrames are identified by their contents, everything else by its repr
+    if isinstance(value, pd.DataFrame):
+        return 'DataFrame:' + data_fingerprint(value)
+    return repr(value)
+
+
+# ============================================================================
+# Disk cache with least-recently-used eviction
+# ============================================================================
+
+class ResultCache:
+    """Folder of pickled results, one file per key, trimmed to a number of entries and bytes."""
+
+    def __init__(self, directory, max_entries=DEFAULT_MAX_ENTRIES, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.pkl")
+
+    def get(self, key):
+        """(True, result) when the key is stored, otherwise (False, None)."""
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as file:
+                result = pickle.load(file)
+        except Exception:
+            # Missing, truncated, or pickled by code that has since changed (AttributeError,
+            # ModuleNotFoundError, ...): recompute; put() replaces the file
+            with self._lock:
+                self.misses += 1
+            return False, None
+        os.utime(path)  # Mark as most recently used
+        with self._lock:
+            self.hits += 1
+        return True, result
+
+    def put(self, key, result):
+        path = self._path(key)
+        temporary = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temporary, 'wb') as file:
+            pickle.dump(result, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporary, path)  # Readers never see half a file
+        self.evict()
+
+    def entries(self):
+        """(modification time, bytes, path) of every stored result, least recently used first."""
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith('.pkl'):
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue  # Removed by another process meanwhile
+                entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+        return sorted(entries)
+
+    def evict(self):
+        """Deletes least recently used entries until both limits are met; returns how many were deleted."""
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        deleted = 0
+        while entries and (len(entries) > self.max_entries or total > self.max_bytes):
+            _, size, path = entries.pop(0)
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+            deleted += 1
+        return deleted
+
+    def clear(self):
+        for _, _, path in self.entries():
+            os.remove(path)
+
+    def stats(self):
+        entries = self.entries()
+        lookups = self.hits + self.misses
+        return {'entries': len(entries), 'bytes': sum(size for _, size, _ in entries),
+                'hits': self.hits, 'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0}
+
+
+_cache = None
+
+
+def configure(directory, max_entries=DEFAULT_MAX_ENTRIES, max_bytes=DEFAULT_MAX_BYTES):
+    """Turns memoization on, storing results in `directory`."""
+    global _cache
+    _cache = ResultCache(directory, max_entries, max_bytes)
+    return _cache
+
+
+def disable():
+    global _cache
+    _cache = None
+
+
+def result_cache():
+    """The active ResultCache, or None while memoization is off."""
+    return _cache
+
+
+def memoized(version='1'):
+    """Decorator storing a function's results in the active ResultCache (a no-op while it is off)."""
+    def decorate(function):
+        prefix = f"{CACHE_FORMAT}|{function.__module__}.{function.__qualname__}|{version}|{code_fingerprint(function)}"
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            cache = _cache
+            if cache is None:
+                return function(*args, **kwargs)
+            parts = [prefix, source_fingerprint()] + [_argument_key(arg) for arg in args]
+            parts += [f"{name}={_argument_key(value)}" for name, value in sorted(kwargs.items())]
+            key = hashlib.sha256('|'.join(parts).encode('utf-8')).hexdigest()
+            found, result = cache.get(key)
+            if not found:
+                result = function(*args, **kwargs)
+                cache.put(key, result)
+            return result
+
+        return wrapper
+    return decorate
+
+
+# Allow switching memoization on without code changes
+if os.environ.get('SUPERSTORE_CACHE_DIR'):
+    configure(os.environ['SUPERSTORE_CACHE_DIR'])
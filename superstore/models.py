@@ -0,0 +1,211 @@
+# Business entity classes for the Superstore dataset
+# ============================================================================
+# Customer, Category, Product, Shipment and Order model the real-world
+# entities behind each dataset row, and OrderHeader groups the Order lines
+# that share an Order ID. They were first written in Task 1 (see
+# that script for the OOP concepts they demonstrate) and live here so the
+# Task scripts and the command line tool can share them.
+# ============================================================================
+
+import re
+
+
+# ======================================================
+# Class 1: Customer
+# Demonstrates Encapsulation and Abstraction
+# ======================================================
+
+class Customer:
+    def __init__(self, customer_id, customer_name, region):
+        self.customer_id = customer_id
+        self.customer_name = customer_name
+        self.region = region
+
+    def get_customer_name(self):  # Getter method to access private attribute (Encapsulation)
+        return self.customer_name
+
+    def get_region(self):
+        return self.region
+
+    # Example of abstraction: hiding how info is formatted
+    def get_customer_info(self):
+        return f"{self.customer_name} (ID: {self.customer_id}) - Region: {self.region}"
+        # Returns formatted customer info without shouwing how it's constructed
+
+    # Example of a class method: counts total unique customers
+    @classmethod
+    def count_customers(cls, dataframe):  # Uses pandas to count unique Customer IDs in the dataset
+        return dataframe["Customer ID"].nunique()
+
+    @staticmethod
+    def validate_customer_id(customer_id):
+        """
+        Validates that the customer ID follows the format 'AA-12345'
+          - Starts with two uppercase letters
+          - Followed by a hyphen '-'
+          - Followed by exactly 5 digits
+        """
+        pattern = r"^[A-Z]{2}-\d{5}$"
+        return bool(re.match(pattern, customer_id))
+
+    @classmethod
+    def from_dimension(cls, customer_row, geography_row):
+        # Creates a customer from star schema rows (see superstore/schema.py)
+        return cls(customer_row['Customer ID'], customer_row['Customer Name'], geography_row['Region'])
+
+
+# ======================================================
+# CLASS 2: Category
+# Demonstrates simple data grouping
+# ======================================================
+class Category:
+    def __init__(self, category_name, sub_category):  # Store category and sub-category names
+
+        self.category_name = category_name
+        self.sub_category = sub_category
+
+    def show_info(self):
+        # Returns formatted category info
+        return f"Category: {self.category_name} | Sub-category: {self.sub_category}"
+
+    @classmethod
+    def from_dimension(cls, product_row):
+        # Category and sub-category are attributes of the Product dimension
+        return cls(product_row['Category'], product_row['Sub-Category'])
+
+
+# ======================================================
+# CLASS 3: Product
+# Demonstrates Constructors, Instance Methods, and Abstraction
+# ======================================================
+class Product:
+    # Store key attributes about the product
+    def __init__(self, product_id, category, sub_category, name, sales, quantity, discount, profit):
+        self.product_id = product_id
+        self.category = category
+        self.sub_category = sub_category
+        self.name = name
+        self.sales = sales
+        self.quantity = quantity
+        self.discount = discount
+        self.profit = profit
+
+    def total_sales(self):
+        # Calculates total sales value
+        return self.sales * self.quantity
+
+    def profit_margin(self):
+        # Calculates profit percentage safely
+        return (self.profit / self.sales) * 100 if self.sales > 0 else 0
+
+    def show_info(self):
+        # Polymorphism: similar method name used in other classes but with different meaning
+        return f"Product: {self.name} | Sales: ${self.sales:.2f} | Profit Margin: {self.profit_margin():.2f}%"
+
+
+# ======================================================
+# CLASS 4: Shipment
+# Demonstrates basic data representation and Abstraction
+# ======================================================
+
+class Shipment:
+    def __init__(self, ship_mode, ship_date, city):
+        # Store delivery information
+        self.ship_mode = ship_mode
+        self.ship_date = ship_date
+        self.city = city
+
+    def show_info(self):
+        # Returns formatted delivery information
+        return f"Shipped via {self.ship_mode} to {self.city} on {self.ship_date}"
+
+    @classmethod
+    def from_dimension(cls, ship_mode_row, date_row, geography_row):
+        # Creates a shipment from the Ship Mode, Date and Geography dimension rows
+        return cls(ship_mode_row['Ship Mode'], date_row['Date'], geography_row['City'])
+
+
+# ======================================================
+# CLASS 5: Order (inherits from Product)
+# Demonstrates Inheritance and Polymorphism
+
+# ======================================================
+
+class Order(Product):
+    def __init__(self, order_id, order_date, customer: Customer, product_id, category, sub_category,
+                 name, sales, quantity, discount, profit):
+        # Reuse attributes from Product using inheritance
+        super().__init__(product_id, category, sub_category, name, sales, quantity, discount, profit)
+        # Add orderspecific attributes
+        self.order_id = order_id
+        self.order_date = order_date
+        self.customer = customer
+
+    def discounted_total(self):
+        # Abstraction: hides formula logic, just gives result
+        return self.sales * self.quantity * (1 - self.discount)
+
+    def total_sales(self):
+        # Polymorphism: overrides total_sales() method in Product
+        return self.sales * self.quantity * (1 - self.discount)
+
+    def order_summary(self):
+        # Returns full order summary
+        return (f"Order ID: {self.order_id} | Customer: {self.customer.get_customer_name()} | "
+                f"Product: {self.name} | Total after discount: ${self.total_sales():.2f}")
+
+    @classmethod
+    def from_dataset(cls, row):
+        # Creates customer automatically from dataset row
+        customer = Customer(row['Customer ID'], row['Customer Name'], row['Region'])
+        # Create order using dataset info
+        return cls(row['Order ID'], row['Order Date'], customer,
+                   row['Product ID'], row['Category'], row['Sub-Category'],
+                   row['Product Name'], row['Sales'], row['Quantity'],
+                   row['Discount'], row['Profit'])
+
+    @classmethod
+    def from_dimension(cls, order_row, date_row, customer, product_row, fact_row):
+        # Creates an order from star schema rows: the fact row supplies the measures
+        return cls(order_row['Order ID'], date_row['Date'], customer,
+                   product_row['Product ID'], product_row['Category'], product_row['Sub-Category'],
+                   product_row['Product Name'], fact_row['Sales'], fact_row['Quantity'],
+                   fact_row['Discount'], fact_row['Profit'])
+
+
+# ======================================================
+# CLASS 6: OrderHeader (groups Order lines)
+# Demonstrates Composition: an order header is made of Order lines
+# ======================================================
+
+class OrderHeader:
+    # An Order above is one line (one product); a whole order is every line sharing its Order ID
+    def __init__(self, order_id, order_date, customer: Customer, lines, ship_delay=None):
+        self.order_id = order_id
+        self.order_date = order_date
+        self.customer = customer
+        self.lines = lines  # List of Order objects
+        self.ship_delay = ship_delay  # Days from order to shipment (None if unknown)
+
+    def line_count(self):
+        return len(self.lines)
+
+    def units(self):
+        return sum(line.quantity for line in self.lines)
+
+    # Sales is already each line's amount after discount, so the order total is a plain sum
+    # (Order.discounted_total() above multiplies by quantity again, which suits the Task 1 exercise only)
+    def gross_total(self):
+        # Before discount: Sales / (1 - Discount) per line
+        return sum(line.sales / (1 - line.discount) if line.discount < 1 else line.sales for line in self.lines)
+
+    def discounted_total(self):
+        return sum(line.sales for line in self.lines)
+
+    def total_profit(self):
+        return sum(line.profit for line in self.lines)
+
+    def order_summary(self):
+        return (f"Order ID: {self.order_id} | Customer: {self.customer.get_customer_name()} | "
+                f"Lines: {self.line_count()} | Units: {self.units()} | "
+                f"Total after discount: ${self.discounted_total():.2f} | Profit: ${self.total_profit():.2f}")
@@ -0,0 +1,176 @@
+# Order-header rollup from the line items
+# ============================================================================
+# Each dataset row (and each Task 1 Order object) is one order line: one
+# product. A real order is every line sharing an Order ID, so Task 4's
+# ('Order ID', 'count') counts lines, not orders.
+#
+# OrderHeaders builds one row per order:
+# 1. Order ID is factorized into integer codes (sorted, so orders come out in
+#    Order ID order)
+# 2. a stable argsort of the codes puts each order's lines next to each other;
+#    the start of every run of equal codes is found with one comparison
+# 3. the per-order totals are segment reductions over those runs
+#    (np.add.reduceat, np.fmax.reduceat, ...): no Python loop over orders
+#
+# Per order: lines, units, Sales, the gross amount before discount, profit,
+# order date and ship delay, plus the customer. Sales is already each line's
+# extended amount after discount (not a unit price), so the order total is the
+# sum of Sales; the gross amount reverses the discount: Sales / (1 - Discount).
+# (Task 1's Order.discounted_total() multiplies Sales by Quantity again, which
+# is a teaching formula and is not used here.) OrderHeader objects (models.py)
+# are built on request.
+#
+# Example:
+#   headers = OrderHeaders.from_dataframe(df)
+#   headers.table.head()
+#   headers.basket_stats()
+#   headers.order('CA-2016-152156').order_summary()
+# ============================================================================
+
+import numpy as np
+import pandas as pd
+
+from superstore.dates import DAY_NUMBER_COLUMNS, MISSING_DAY, day_difference, from_day_numbers, parse_day_numbers
+from superstore.models import Customer, Order, OrderHeader
+from superstore.tracing import traced
+
+# Columns the rollup reads (Customer, Segment and Region are optional)
+ORDER_COLUMNS = ['Order ID', 'Order Date', 'Ship Date', 'Customer ID', 'Customer Name', 'Segment', 'Region',
+                 'Sales', 'Quantity', 'Discount', 'Profit']
+
+# Extra columns needed to build the line objects of an OrderHeader
+LINE_COLUMNS = ['Product ID', 'Category', 'Sub-Category', 'Product Name']
+
+# Header attributes copied from an order's first line
+HEADER_ATTRIBUTES = ['Customer ID', 'Customer Name', 'Segment', 'Region']
+
+
+def _segment(ufunc, values, starts):
+    # One reduction per run of lines, e.g. np.add -> per-order sums (empty when there are no orders)
+    return ufunc.reduceat(values, starts) if len(starts) else values[:0]
+
+
+def gross_sales(sales, discount):
+    """Line amount before discount (Sales is after discount); a 100% discount keeps Sales."""
+    sales, discount = np.asarray(sales, dtype=float), np.asarray(discount, dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(discount < 1, sales / (1 - discount), sales)
+
+
+def _days(dataframe, date_column):
+    # int32 day numbers, reusing prepare_dataset()'s column when it is there
+    day_column = DAY_NUMBER_COLUMNS[date_column]
+    if day_column in dataframe.columns:
+        return dataframe[day_column].to_numpy(dtype=np.int32)
+    return np.asarray(parse_day_numbers(dataframe[date_column]))
+
+
+class OrderHeaders:
+    """One row per Order ID with totals rolled up from its lines."""
+
+    def __init__(self, dataframe, table, line_order, starts):
+        self.dataframe = dataframe
+        self.table = table  # DataFrame indexed by Order ID
+        self._line_order = line_order  # Row positions grouped by order
+        self._starts = starts  # Where each order's lines begin in _line_order (plus the end)
+
+    @classmethod
+    @traced(category='groupby')
+    def from_dataframe(cls, dataframe):
+        codes, order_ids = pd.factorize(dataframe['Order ID'], sort=True)
+        # Lines with a missing Order ID belong to no order
+        order = np.argsort(codes, kind='stable')
+        order = order[codes[order] >= 0]
+        sorted_codes = codes[order]
+        # An order's run of lines starts wherever the code differs from the previous line's
+        starts = np.flatnonzero(np.r_[True, sorted_codes[1:] != sorted_codes[:-1]])[:len(order)]
+
+        def total(values):
+            return _segment(np.add, values[order], starts)
+
+        sales = dataframe['Sales'].to_numpy(dtype=float)
+        quantity = dataframe['Quantity'].to_numpy(dtype=float)
+        discount = dataframe['Discount'].to_numpy(dtype=float)
+        lines = np.diff(np.r_[starts, len(order)])
+        gross = gross_sales(sales, discount)
+        table = pd.DataFrame({
+            'Lines': lines,
+            'Units': total(quantity).astype(np.int64),
+            'Sales': total(sales),
+            'Gross Sales': total(gross),
+            'Discount Amount': total(gross - sales),
+            'Profit': total(dataframe['Profit'].to_numpy(dtype=float)),
+        }, index=pd.Index(order_ids, name='Order ID'))
+
+        first_lines = order[starts]
+        if 'Order Date' in dataframe.columns:
+            order_days = _days(dataframe, 'Order Date')
+            # Earliest order date of the order's lines (missing days are ignored)
+            days = np.where(order_days == MISSING_DAY, np.iinfo(np.int32).max, order_days)
+            first_day = _segment(np.minimum, days[order], starts)
+            first_day[first_day == np.iinfo(np.int32).max] = MISSING_DAY
+            table['Order Date'] = from_day_numbers(first_day)
+            if 'Ship Date' in dataframe.columns:
+                # The order is complete when its last line ships
+                delay = day_difference(_days(dataframe, 'Ship Date'), order_days)
+                table['Ship Delay (days)'] = _segment(np.fmax, delay[order], starts)
+        for column in HEADER_ATTRIBUTES:
+            if column in dataframe.columns:
+                table[column] = dataframe[column].to_numpy()[first_lines]
+        return cls(dataframe, table, order, np.r_[starts, len(order)])
+
+    def __len__(self):
+        return len(self.table)
+
+    # ------------------------------------------------------------------
+    # Basket statistics
+    # ------------------------------------------------------------------
+
+    def basket_size_distribution(self):
+        """Number of orders by number of lines (and by share of all orders)."""
+        counts = self.table['Lines'].value_counts().sort_index()
+        counts.index.name = 'Lines per Order'
+        return pd.DataFrame({'Orders': counts, 'Share (%)': (counts / max(len(self), 1) * 100).round(2)})
+
+    def basket_stats(self):
+        """Order-level averages: lines and units per order, order value and profit."""
+        table = self.table
+        return {
+            'Orders': len(table),
+            'Order Lines': int(table['Lines'].sum()),
+            'Avg Lines per Order': table['Lines'].mean(),
+            'Median Lines per Order': table['Lines'].median(),
+            'Max Lines per Order': int(table['Lines'].max()) if len(table) else 0,
+            'Single-Line Orders (%)': (table['Lines'] == 1).mean() * 100,
+            'Avg Units per Order': table['Units'].mean(),
+            'Avg Order Value': table['Sales'].mean(),
+            'Median Order Value': table['Sales'].median(),
+            'Avg Profit per Order': table['Profit'].mean(),
+        }
+
+    # ------------------------------------------------------------------
+    # OrderHeader objects
+    # ------------------------------------------------------------------
+
+    def line_rows(self, order_id):
+        """Row positions of one order's lines in the original DataFrame."""
+        position = self.table.index.get_loc(order_id)
+        return self._line_order[self._starts[position]:self._starts[position + 1]]
+
+    def order(self, order_id):
+        """OrderHeader object for one Order ID, with an Order object for each line."""
+        header = self.table.loc[order_id]
+        rows = self.dataframe.iloc[self.line_rows(order_id)]
+        customer = Customer(header.get('Customer ID'), header.get('Customer Name'), header.get('Region'))
+        lines = [Order(order_id, row.get('Order Date'), customer, row.get('Product ID'), row.get('Category'),
+                       row.get('Sub-Category'), row.get('Product Name'), row['Sales'], row['Quantity'],
+                       row['Discount'], row['Profit'])
+                 for _, row in rows.iterrows()]
+        delay = header.get('Ship Delay (days)')
+        return OrderHeader(order_id, header.get('Order Date'), customer, lines,
+                           None if delay is None or pd.isna(delay) else delay)
+
+    def orders(self, order_ids=None):
+        """OrderHeader objects, one at a time (every order by default)."""
+        for order_id in self.table.index if order_ids is None else order_ids:
+            yield self.order(order_id)
@@ -0,0 +1,277 @@
+# Shared-memory multi-process group-by
+# ============================================================================
+# pandas runs a group-by on one CPU core. This module spreads the Task 4
+# aggregations (sum, mean, count, min, max, nunique) over worker processes:
+# 1. The parent encodes the group keys and any text value columns into integer
+#    codes and copies the code and measure columns into
+#    multiprocessing.shared_memory blocks, once per DataFrame.
+# 2. Each worker attaches to the blocks by name (nothing is pickled except the
+#    block names) and aggregates its own range of rows with bincount into
+#    per-group partial results (sums, counts, minimums, ...).
+# 3. The parent merges the small partial arrays: sums and counts add up,
+#    minimums/maximums combine, distinct values are unioned.
+#
+# Group codes come straight from the sorted key codes (no hashing in the
+# workers), so the groups come out in the same order as a pandas group-by.
+# Small tables are aggregated in the parent process, where starting workers
+# would cost more than it saves.
+# ============================================================================
+
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+import pandas as pd
+
+# Below this many rows the aggregation runs in the calling process
+PARALLEL_THRESHOLD = 200_000
+
+# Largest number of possible key combinations aggregated without compacting the codes first
+MAX_DIRECT_GROUPS = 5_000_000
+
+MERGEABLE_AGGFUNCS = ('sum', 'mean', 'count', 'min', 'max', 'nunique')
+
+# Held while resource_tracker.register is switched off, so no other thread's block goes unregistered
+_ATTACH_LOCK = threading.Lock()
+
+
+def _attach(name):
+    # Attach to an existing block without making this process responsible for deleting it
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)  # Python 3.13+
+    except TypeError:
+        # Older Pythons register every attached block for deletion; skip that while attaching
+        with _ATTACH_LOCK:
+            register = resource_tracker.register
+            resource_tracker.register = lambda *args: None
+            try:
+                return shared_memory.SharedMemory(name=name)
+            finally:
+                resource_tracker.register = register
+
+
+# ============================================================================
+# Work done on one range of rows (in a worker or in the parent)
+# ============================================================================
+
+def _aggregate_arrays(groups, columns, tasks, multipliers, group_count, start, stop):
+    """Partial results for rows [start, stop): {task: array}, plus '__rows' per group."""
+    groups = groups[start:stop]
+    # The extra last group collects rows with a missing key; it is dropped when merging
+    partials = {'__rows': np.bincount(groups, minlength=group_count + 1)}
+    for task in tasks:
+        column, aggfunc = task
+        values = columns[column][start:stop]
+        if values.dtype.kind == 'f':
+            present = ~np.isnan(values)
+        else:
+            present = values >= 0  # Text columns are codes, -1 marks a missing value
+        group_values = groups[present]
+
+        if aggfunc == 'count':
+            partials[task] = np.bincount(group_values, minlength=group_count + 1)
+        elif aggfunc == 'sum':
+            partials[task] = np.bincount(group_values, weights=values[present], minlength=group_count + 1)
+        elif aggfunc == 'mean':
+            partials[task] = (np.bincount(group_values, weights=values[present], minlength=group_count + 1),
+                              np.bincount(group_values, minlength=group_count + 1))
+        elif aggfunc in ('min', 'max'):
+            result = np.full(group_count + 1, np.nan)
+            (np.fmin if aggfunc == 'min' else np.fmax).at(result, group_values, values[present])
+            partials[task] = result
+        elif aggfunc == 'nunique':
+            # Distinct (group, value code) pairs in this range; ranges are unioned when merging
+            partials[task] = np.unique(group_values.astype(np.int64) * multipliers[column] + values[present])
+    return partials
+
+
+def _aggregate_shared(blocks, group_block, tasks, multipliers, group_count, start, stop):
+    # Worker entry point: attach to the shared blocks by name, aggregate a range of rows, detach
+    attached = []
+
+    def view(spec):
+        name, dtype, length = spec
+        block = _attach(name)
+        attached.append(block)
+        return np.ndarray((length,), dtype=dtype, buffer=block.buf)
+
+    groups = columns = None
+    try:
+        groups = view(group_block)
+        columns = {column: view(spec) for column, spec in blocks.items()}
+        # The partial results are new arrays, so nothing returned points into shared memory
+        return _aggregate_arrays(groups, columns, tasks, multipliers, group_count, start, stop)
+    finally:
+        groups = columns = None  # Views must be released before the blocks can close
+        for block in attached:
+            block.close()
+
+
+def _merge(partials, tasks, multipliers, group_count):
+    # Combine the partial results of every row range
+    merged = {'__rows': sum(partial['__rows'] for partial in partials)}
+    for task in tasks:
+        column, aggfunc = task
+        pieces = [partial[task] for partial in partials]
+        if aggfunc in ('count', 'sum'):
+            merged[task] = sum(pieces)
+        elif aggfunc == 'mean':
+            totals = sum(piece[0] for piece in pieces)
+            counts = sum(piece[1] for piece in pieces)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                merged[task] = np.where(counts > 0, totals / np.maximum(counts, 1), np.nan)
+        elif aggfunc in ('min', 'max'):
+            merged[task] = (np.fmin if aggfunc == 'min' else np.fmax).reduce(pieces)
+        elif aggfunc == 'nunique':
+            pairs = np.unique(np.concatenate(pieces))
+            merged[task] = np.bincount(pairs // multipliers[column], minlength=group_count + 1)
+    return merged
+
+
+# ============================================================================
+# A DataFrame's columns in shared memory
+# ============================================================================
+
+class SharedFrame:
+    """Integer-coded columns of one DataFrame placed in shared memory, encoded on first use.
+
+    The DataFrame itself is passed to each call rather than stored, so a cache
+    of SharedFrames does not keep DataFrames alive. Blocks are created under a
+    lock: backends are called from thread pools, and a block created twice would
+    leave one copy that is never unlinked.
+    """
+
+    def __init__(self, length):
+        self.length = length
+        self._blocks = {}  # name -> SharedMemory block
+        self._specs = {}  # name -> (block name, dtype, length), all a worker needs to attach
+        self._key_codes = {}  # key column -> (sorted codes, uniques)
+        self._value_counts = {}  # coded column -> number of distinct values
+        self._groups = {}  # tuple of key columns -> (group spec, group count, shape, observed codes)
+        self._lock = threading.RLock()
+
+    def _share(self, name, array):
+        # Copy an array into a new shared memory block
+        array = np.ascontiguousarray(array)
+        block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+        np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[:] = array
+        self._blocks[name] = block
+        self._specs[name] = (block.name, array.dtype.str, len(array))
+        return self._specs[name]
+
+    def _view(self, name):
+        # The parent's own view of a shared block
+        _, dtype, length = self._specs[name]
+        return np.ndarray((length,), dtype=dtype, buffer=self._blocks[name].buf)
+
+    def _key(self, dataframe, column):
+        with self._lock:
+            if column not in self._key_codes:
+                self._key_codes[column] = pd.factorize(dataframe[column], sort=True)
+            return self._key_codes[column]
+
+    def value_column(self, dataframe, column, coded=False):
+        """Shares a value column: numbers as float64 (NaN = missing), or int32 codes (-1 = missing).
+
+        Text columns are always coded; `coded=True` also codes numbers (for nunique).
+        """
+        series = dataframe[column]
+        numeric = pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series)
+        name = ('__codes', column) if coded or not numeric else column
+        with self._lock:
+            if name not in self._specs:
+                if name == column:
+                    self._share(name, series.to_numpy(dtype=np.float64, na_value=np.nan))
+                else:
+                    codes, uniques = pd.factorize(series)
+                    self._value_counts[name] = len(uniques)
+                    self._share(name, codes.astype(np.int32))
+        return name
+
+    def group_codes(self, dataframe, by):
+        """Shares one group code per row for a combination of key columns."""
+        by = tuple(by)
+        with self._lock:
+            if by not in self._groups:
+                codes = [self._key(dataframe, column)[0] for column in by]
+                shape = tuple(len(self._key(dataframe, column)[1]) for column in by)
+                valid = np.logical_and.reduce([c >= 0 for c in codes])
+                group_count = int(np.prod(shape))
+                flat = np.full(self.length, group_count, dtype=np.int64)
+                if valid.any():
+                    flat[valid] = np.ravel_multi_index([c[valid] for c in codes], shape)
+                observed = None
+                if group_count > MAX_DIRECT_GROUPS:
+                    # Too many possible combinations: renumber the observed ones 0..k-1 (still sorted)
+                    observed, flat[valid] = np.unique(flat[valid], return_inverse=True)
+                    flat[~valid] = len(observed)
+                    group_count = len(observed)
+                self._share(('__groups',) + by, flat)
+                self._groups[by] = (('__groups',) + by, group_count, shape, observed)
+            return self._groups[by]
+
+    def groupby(self, dataframe, by, aggregations, pool=None, workers=1):
+        """Aggregates {output: (column, aggfunc)} per group over row ranges, in the pool if given."""
+        by = [by] if isinstance(by, str) else list(by)
+        group_name, group_count, shape, observed = self.group_codes(dataframe, by)
+
+        # Each distinct (column, aggfunc) is computed once, reading the shared block it needs
+        tasks = list(dict.fromkeys(aggregations.values()))
+        columns = {}
+        multipliers = {}
+        for column, aggfunc in tasks:
+            name = self.value_column(dataframe, column, coded=(aggfunc == 'nunique'))
+            columns[(column, aggfunc)] = name
+            if aggfunc == 'nunique':
+                # nunique pairs are encoded as group * (number of distinct values) + value code
+                multipliers[name] = max(self._value_counts[name], 1)
+        shared_tasks = [(columns[task], task[1]) for task in tasks]
+
+        bounds = np.linspace(0, self.length, max(workers, 1) + 1).astype(int)
+        ranges = [(start, stop) for start, stop in zip(bounds[:-1], bounds[1:]) if stop > start]
+        if pool is None or len(ranges) <= 1:
+            views = {name: self._view(name) for name in set(columns.values())}
+            partials = [_aggregate_arrays(self._view(group_name), views, shared_tasks, multipliers, group_count,
+                                          start, stop)
+                        for start, stop in ranges]
+            views = None
+        else:
+            specs = {name: self._specs[name] for name in set(columns.values())}
+            futures = [pool.submit(_aggregate_shared, specs, self._specs[group_name], shared_tasks, multipliers,
+                                   group_count, start, stop)
+                       for start, stop in ranges]
+            partials = [future.result() for future in futures]
+
+        # Keep the observed groups only and turn their codes back into key values
+        if partials:
+            merged = _merge(partials, shared_tasks, multipliers, group_count)
+            present = np.flatnonzero(merged['__rows'][:group_count] > 0)
+        else:
+            merged, present = {}, np.zeros(0, dtype=np.int64)
+        flat_codes = present if observed is None else observed[present]
+        key_codes = np.unravel_index(flat_codes, shape)
+        index = pd.MultiIndex.from_arrays([self._key(dataframe, column)[1].take(codes)
+                                           for column, codes in zip(by, key_codes)], names=by)
+        return pd.DataFrame({output: merged[(columns[task], task[1])][present] if partials else []
+                             for output, task in aggregations.items()}, index=index)
+
+    def close(self):
+        """Frees the shared memory blocks."""
+        with self._lock:
+            for block in self._blocks.values():
+                block.close()
+                block.unlink()
+            self._blocks.clear()
+            self._specs.clear()
+            self._groups.clear()
+
+
+def default_workers():
+    return os.cpu_count() or 1
+
+
+def make_pool(workers=None):
+    """Process pool for the parallel group-by."""
+    return ProcessPoolExecutor(max_workers=workers or default_workers())
@@ -0,0 +1,219 @@
+# Memoized DAG pipeline for the analysis stages
+# ============================================================================
+# The Task scripts share a chain of stages: load -> parse/prepare -> derive ->
+# aggregate -> report. Run separately, each script repeats the whole chain.
+
+# A Pipeline holds named stages, each declaring the stages it takes as inputs.
+# Running the pipeline:
+# - works out which stages are needed for the requested targets
+# - runs every stage whose inputs are ready at the same time on a thread pool
+# - memoizes each result in memory, so a stage runs at most once per pipeline
+# - optionally stores results on disk under a content hash of
+#   (stage name, version, code, parameters, input hashes). The code part is
+#   the stage function's bytecode plus the superstore package source (as in
+#   memo.py), so editing a stage or a helper starts new entries. The load
+#   stage's hash includes a fingerprint of the CSV file contents, so editing
+#   the data invalidates everything downstream while unchanged results are
+#   reused. Files are written to a temporary name and renamed, and a file
+#   that cannot be loaded is recomputed.
+# ============================================================================
+
+import hashlib
+import os
+import pickle
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from superstore import reports, tracing
+from superstore.loader import CSV_FILE_PATH, is_partitioned, load_superstore, partition_files, prepare_dataset
+from superstore.memo import code_fingerprint, source_fingerprint
+from superstore.scenarios import create_customer_orders, create_sample_orders
+
+
+def file_fingerprint(path, block_size=1024 * 1024):
+    """SHA-256 of a file's contents (or of every partition's name and contents), read in blocks."""
+    digest = hashlib.sha256()
+    paths = partition_files(path) if is_partitioned(path) else [path]
+    for part in paths:
+        if len(paths) > 1:
+            digest.update(part.encode('utf-8'))
+        with open(part, 'rb') as file:
+            for block in iter(lambda: file.read(block_size), b''):
+                digest.update(block)
+    return digest.hexdigest()
+
+
+class Stage:
+    """One step of the pipeline: a function, the stages it reads and fixed parameters."""
+
+    def __init__(self, name, function, inputs=(), params=None, version='1', cache=True):
+        self.name = name
+        self.function = function
+        self.inputs = list(inputs)
+        self.params = params or {}
+        self.version = version
+        self.cache = cache  # False for stages with side effects (e.g. writing files)
+
+
+class Pipeline:
+    """Runs stages in dependency order, concurrently where possible, each at most once."""
+
+    def __init__(self, max_workers=None, cache_dir=None):
+        self.stages = {}
+        self.max_workers = max_workers
+        self.cache_dir = cache_dir
+        self.results = {}
+        self.keys = {}
+        self.stats = {}  # name -> {'source': 'computed' | 'disk', 'seconds': ...}
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    def add(self, name, function, inputs=(), version='1', cache=True, **params):
+        """Registers a stage; its function is called as function(*input_results, **params)."""
+        if name in self.stages:
+            raise ValueError(f"Stage '{name}' is already defined")
+        for input_name in inputs:
+            if input_name not in self.stages:
+                raise ValueError(f"Stage '{name}' depends on unknown stage '{input_name}'")
+        self.stages[name] = Stage(name, function, inputs, params, version, cache)
+        return self
+
+    # ------------------------------------------------------------------
+    # Planning
+    # ------------------------------------------------------------------
+
+    def _required(self, targets):
+        # Every stage the targets depend on, directly or indirectly
+        required = set()
+        pending = list(targets)
+        while pending:
+            name = pending.pop()
+            if name not in self.stages:
+                raise KeyError(f"Unknown stage '{name}'")
+            if name not in required:
+                required.add(name)
+                pending.extend(self.stages[name].inputs)
+        return required
+
+    def _key(self, stage):
+        # Content hash of the stage definition plus the hashes of its inputs
+        code = code_fingerprint(stage.function) if hasattr(stage.function, '__code__') else repr(stage.function)
+        parts = [stage.name, stage.version, code, source_fingerprint(), repr(sorted(stage.params.items()))]
+        parts += [self.keys[name] for name in stage.inputs]
+        return hashlib.sha256('|'.join(parts).encode('utf-8')).hexdigest()
+
+    def _cache_path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.pkl")
+
+    def _load_cached(self, key):
+        # (True, result) for a readable cache file; a missing, truncated or outdated one is a miss
+        try:
+            with open(self._cache_path(key), 'rb') as file:
+                return True, pickle.load(file)
+        except Exception:
+            return False, None
+
+    def _store(self, key, result):
+        path = self._cache_path(key)
+        temporary = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temporary, 'wb') as file:
+            pickle.dump(result, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporary, path)  # An interrupted run never leaves half a file under the real name
+
+    # ------------------------------------------------------------------
+    # Execution
+    # ------------------------------------------------------------------
+
+    def _execute(self, stage, key):
+        with tracing.span(stage.name, category='pipeline'):
+            return self._execute_stage(stage, key)
+
+    def _execute_stage(self, stage, key):
+        started = time.perf_counter()
+        use_disk = self.cache_dir and stage.cache
+        found, result = self._load_cached(key) if use_disk else (False, None)
+        if found:
+            source = 'disk'
+        else:
+            result = stage.function(*[self.results[name] for name in stage.inputs], **stage.params)
+            source = 'computed'
+            if use_disk:
+                self._store(key, result)
+        return result, {'source': source, 'seconds': time.perf_counter() - started}
+
+    def run(self, targets=None):
+        """Runs the targets (default: every stage) and returns {stage name: result}."""
+        targets = list(self.stages) if targets is None else list(targets)
+        to_run = {name for name in self._required(targets) if name not in self.results}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            running = {}
+            while to_run or running:
+                # Submit every stage whose inputs are all finished
+                ready = [name for name in to_run
+                         if all(dep in self.results for dep in self.stages[name].inputs)]
+                for name in ready:
+                    stage = self.stages[name]
+                    self.keys[name] = self._key(stage)
+                    running[pool.submit(self._execute, stage, self.keys[name])] = name
+                    to_run.discard(name)
+
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    name = running.pop(future)
+                    self.results[name], self.stats[name] = future.result()
+
+        return {name: self.results[name] for name in targets}
+
+
+# ============================================================================
+# The standard pipeline covering all four Task scripts
+# ============================================================================
+
+def _load(csv_file_path, fingerprint):
+    # `fingerprint` is unused here; it only makes the stage hash follow the file contents
+    return load_superstore(csv_file_path)
+
+
+def _prepare(df):
+    # Work on a copy so the memoized raw data stays as loaded
+    return prepare_dataset(df.copy())
+
+
+def build_pipeline(csv_file_path=CSV_FILE_PATH, max_workers=None, cache_dir=None, output_dir=None):
+    """Builds the shared load -> prepare -> report DAG for Tasks 1-4.
+
+    Pass `output_dir` to include the Task 3 CSV exports (they are never cached).
+    """
+    pipeline = Pipeline(max_workers=max_workers, cache_dir=cache_dir)
+
+    # Load stage: the fingerprint parameter ties its hash to the file contents
+    pipeline.add('load', _load, csv_file_path=csv_file_path,
+                 fingerprint=file_fingerprint(csv_file_path))
+    pipeline.add('prepare', _prepare, inputs=['load'])
+
+    # Shared by every Task script (profiling runs on the data as loaded)
+    pipeline.add('profile', reports.profile, inputs=['load'])
+
+    # Task 1 scenarios (Order objects built from the sample rows)
+    pipeline.add('task1_customer_orders', create_customer_orders, inputs=['load'])
+    pipeline.add('task1_sample_orders', create_sample_orders, inputs=['load'])
+
+    # Task 2 and Task 3
+    pipeline.add('task2_numpy_stats', reports.numpy_stats, inputs=['load'])
+    pipeline.add('task3_sales_performance', reports.sales_performance, inputs=['load'])
+    pipeline.add('task3_customer_segmentation', reports.customer_segmentation, inputs=['load'])
+    if output_dir is not None:
+        pipeline.add('task3_exports', reports.export_subsets, inputs=['load'], cache=False, output_dir=output_dir)
+
+    # Task 4 reports work on the prepared data
+    pipeline.add('task4_category_region', reports.category_region, inputs=['prepare'])
+    pipeline.add('task4_product_profitability', reports.product_profitability, inputs=['prepare'], top_n=10)
+    pipeline.add('task4_segment', reports.segment, inputs=['prepare'])
+    pipeline.add('task4_category_segment_pivots', reports.category_segment_pivots, inputs=['prepare'])
+    pipeline.add('task4_monthly_trend', reports.monthly_trend, inputs=['prepare'])
+    pipeline.add('task4_discount', reports.discount, inputs=['prepare'])
+    pipeline.add('task4_subcategory', reports.subcategory, inputs=['prepare'])
+    pipeline.add('task4_kpi', reports.kpi, inputs=['prepare'])
+    return pipeline
@@ -0,0 +1,92 @@
+# One-pass pivot engine with algebraic margins
+# ============================================================================
+# pd.pivot_table(..., margins=True) scans the data once for the cells and then
+# again for every margin, and each pivot table is a separate call. Task 4 builds
+# two pivots (sum of Profit and mean of Sales) over the same Category x Segment
+# dimensions, so the rows were grouped four or more times.
+
+# This engine groups the rows once and keeps small "partials" per cell (sum,
+# count, min, max of each measure). Every requested table is then finished
+# from those partials, and the margins are derived from them too:
+# - the sum of a row/column is the sum of its cell sums
+# - the mean of a row/column is (sum of cell sums) / (sum of cell counts)
+# - min and max are the min/max of the cell values
+# so the margins never touch the original rows again.
+# ============================================================================
+
+import pandas as pd
+
+from superstore.dateindex import windowed
+from superstore.tracing import traced
+
+# Aggregations the engine knows how to finish and combine from partials
+SUPPORTED_AGGFUNCS = ('sum', 'mean', 'count', 'min', 'max')
+
+# Partials needed for each aggregation
+_PARTIALS_NEEDED = {'sum': ['sum'], 'mean': ['sum', 'count'], 'count': ['count'],
+                    'min': ['min'], 'max': ['max']}
+
+# How partials combine when several cells are rolled up into a margin
+_COMBINE = {'sum': 'sum', 'count': 'sum', 'min': 'min', 'max': 'max'}
+
+
+def _finish(partials, measure, aggfunc):
+    # Turn the partial columns of one measure into the requested aggregation
+    if aggfunc == 'mean':
+        return partials[(measure, 'sum')] / partials[(measure, 'count')]
+    return partials[(measure, aggfunc)]
+
+
+def _roll_up(partials, level=None):
+    # Combine partials over all cells (level=None) or per index/column value
+    rules = {column: _COMBINE[column[1]] for column in partials.columns}
+    if level is None:
+        return partials.agg(rules)
+    return partials.groupby(level=level).agg(rules)
+
+
+@windowed
+@traced(category='pivot')
+def multi_pivot(dataframe, index, columns, values, margins=True, margins_name='Total'):
+    """Builds several pivot tables over the same index/columns from one grouped pass.
+
+    `values` is a list of (measure, aggfunc) pairs, e.g. [('Profit', 'sum'), ('Sales', 'mean')].
+    Returns a dictionary keyed by those pairs, each value laid out like pd.pivot_table().
+    """
+    for measure, aggfunc in values:
+        if aggfunc not in SUPPORTED_AGGFUNCS:
+            raise ValueError(f"Unsupported aggfunc '{aggfunc}', choose from {SUPPORTED_AGGFUNCS}")
+
+    # Work out the partials each measure needs, then compute them all in one groupby
+    needed = {}
+    for measure, aggfunc in values:
+        for partial in _PARTIALS_NEEDED[aggfunc]:
+            needed.setdefault(measure, [])
+            if partial not in needed[measure]:
+                needed[measure].append(partial)
+    partials = dataframe.groupby([index, columns], observed=True).agg(needed)
+
+    if margins:
+        row_totals = _roll_up(partials, level=index)      # One value per index entry
+        column_totals = _roll_up(partials, level=columns)  # One value per column entry
+        grand_total = _roll_up(partials)                  # Single overall value
+
+    tables = {}
+    for measure, aggfunc in values:
+        table = _finish(partials, measure, aggfunc).unstack(columns)
+        if margins:
+            table[margins_name] = _finish(row_totals, measure, aggfunc)
+            bottom_row = _finish(column_totals, measure, aggfunc)
+            bottom_row[margins_name] = _finish(grand_total, measure, aggfunc)
+            table.loc[margins_name] = bottom_row
+        table.columns.name = columns
+        table.index.name = index
+        tables[(measure, aggfunc)] = table
+    return tables
+
+
+@windowed
+def pivot(dataframe, index, columns, value, aggfunc='sum', margins=True, margins_name='Total'):
+    """Single pivot table through the same engine (drop-in for one pd.pivot_table call)."""
+    return multi_pivot(dataframe, index, columns, [(value, aggfunc)],
+                       margins=margins, margins_name=margins_name)[(value, aggfunc)]
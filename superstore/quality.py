@@ -0,0 +1,293 @@
+# Data-quality rule engine
+# ============================================================================
+# Apart from Customer.validate_customer_id() nothing checked the data. Here
+# every check is declared once as a Rule: a name, a description, the columns
+# it reads and a vectorized test returning True for each violating row.
+# Helper functions build the common kinds of rule (value range, date order,
+# ID pattern, missing values, duplicates).
+#
+# A Validator "compiles" the registered rules against the columns present and
+# runs them all in one pass over each chunk of rows. Work shared by several
+# rules is done once per chunk: dates are turned into day numbers once, and ID
+# patterns are matched once per distinct value (then looked up by code)
+# instead of once per row. The result is a violation count per rule plus a
+# few sample Row IDs to look at. Duplicates are found with 64-bit row hashes,
+# remembered across chunks in a hash set (8 bytes per distinct row plus set
+# overhead). That memory grows with the data, so duplicate rules are marked
+# `stateful` and incremental ingestion leaves them out unless asked for.
+#
+# Example:
+#   validate(df)                                    # one table row per rule
+#   validate_csv('Sample - Superstore.csv', chunksize=500_000)
+# ============================================================================
+
+import numpy as np
+import pandas as pd
+
+from superstore.dates import DAY_NUMBER_COLUMNS, MISSING_DAY, parse_day_numbers
+from superstore.loader import CSV_FILE_PATH, READ_OPTIONS
+from superstore.tracing import traced
+
+# Sample Row IDs kept per rule
+DEFAULT_SAMPLE_SIZE = 5
+
+# ID formats of the Superstore dataset, e.g. CG-12520, CA-2016-152156, FUR-BO-10001798
+CUSTOMER_ID_PATTERN = r'[A-Z]{2}-\d{5}'
+ORDER_ID_PATTERN = r'[A-Z]{2}-\d{4}-\d{6}'
+PRODUCT_ID_PATTERN = r'[A-Z]{3}-[A-Z]{2}-\d{8}'
+
+
+class Rule:
+    """One declared check: `check(chunk)` gets a ChunkView and returns a boolean violation mask.
+
+    A `stateful` rule remembers something about every row seen so far (its memory grows with the data).
+    """
+
+    def __init__(self, name, description, columns, check, stateful=False):
+        self.name = name
+        self.description = description
+        self.columns = list(columns)
+        self.check = check
+        self.stateful = stateful
+
+
+class ChunkView:
+    """One chunk of rows plus the derived arrays rules share, each computed at most once."""
+
+    def __init__(self, chunk, state):
+        self.chunk = chunk
+        self.state = state  # Per-validator memory that survives between chunks
+        self._cache = {}
+
+    def _memo(self, key, compute):
+        if key not in self._cache:
+            self._cache[key] = compute()
+        return self._cache[key]
+
+    def values(self, column):
+        return self._memo(('values', column), lambda: self.chunk[column].to_numpy())
+
+    def missing(self, column):
+        return self._memo(('missing', column), lambda: self.chunk[column].isna().to_numpy())
+
+    def days(self, column):
+        """int32 day numbers of a date column (reusing prepare_dataset()'s column when present)."""
+        day_column = DAY_NUMBER_COLUMNS.get(column)
+
+        def compute():
+            if day_column in self.chunk.columns:
+                return self.chunk[day_column].to_numpy(dtype=np.int32)
+            return np.asarray(parse_day_numbers(self.chunk[column], errors='coerce'))
+        return self._memo(('days', column), compute)
+
+    def fails_pattern(self, column, pattern):
+        """True where a present value does not fully match the pattern (tested once per distinct value)."""
+        def compute():
+            codes, uniques = pd.factorize(self.chunk[column])
+            matches = pd.Series(uniques).astype(str).str.fullmatch(pattern).to_numpy(dtype=bool)
+            return (codes >= 0) & ~matches[np.maximum(codes, 0)]
+        return self._memo(('pattern', column, pattern), compute)
+
+    def row_hashes(self, columns):
+        """64-bit hash of each row's values in the columns."""
+        def compute():
+            frame = self.chunk[list(columns)]
+            # Numbers are hashed as float64, so a column read as int in one chunk and float in another
+            # (e.g. Postal Code with a missing value) still hashes the same
+            numeric = frame.select_dtypes('number').columns
+            frame = frame.astype({column: np.float64 for column in numeric})
+            return pd.util.hash_pandas_object(frame, index=False).to_numpy()
+        return self._memo(('hashes', tuple(columns)), compute)
+
+
+# ============================================================================
+# Kinds of rule
+# ============================================================================
+
+def outside_range(column, low=None, high=None):
+    """Violation when a present value is below `low` or above `high`."""
+    def check(chunk):
+        values = chunk.values(column)
+        bad = np.zeros(len(values), dtype=bool)
+        if low is not None:
+            bad |= values < low
+        if high is not None:
+            bad |= values > high
+        return bad
+    return [column], check
+
+
+def not_positive(column):
+    """Violation when a value is zero or negative."""
+    return [column], lambda chunk: chunk.values(column) <= 0
+
+
+def date_before(column, earlier_column):
+    """Violation when `column` is before `earlier_column` (rows with a missing date are skipped)."""
+    def check(chunk):
+        days, earlier = chunk.days(column), chunk.days(earlier_column)
+        return (days < earlier) & (days != MISSING_DAY) & (earlier != MISSING_DAY)
+    return [column, earlier_column], check
+
+
+def invalid_date(column):
+    """Violation when a value is present but cannot be read as a date."""
+    def check(chunk):
+        return (chunk.days(column) == MISSING_DAY) & ~chunk.missing(column)
+    return [column], check
+
+
+def malformed(column, pattern):
+    """Violation when a present value does not match the ID pattern."""
+    return [column], lambda chunk: chunk.fails_pattern(column, pattern)
+
+
+def missing_any(columns):
+    """Violation when any of the columns is missing."""
+    return list(columns), lambda chunk: np.logical_or.reduce([chunk.missing(column) for column in columns])
+
+
+def duplicated(columns):
+    """Violation for every repeat of an earlier row with the same values in `columns` (across chunks)."""
+    def check(chunk):
+        hashes = chunk.row_hashes(columns)
+        seen = chunk.state.setdefault(('seen', tuple(columns)), set())
+        # Repeats inside the chunk, or of a row in an earlier chunk: cost proportional to the chunk only
+        hash_list = hashes.tolist()
+        in_seen = np.fromiter((value in seen for value in hash_list), dtype=bool, count=len(hash_list))
+        seen.update(hash_list)
+        return pd.Series(hashes).duplicated().to_numpy() | in_seen
+    return list(columns), check
+
+
+# ============================================================================
+# Registry of rules (in report order)
+# ============================================================================
+
+RULES = {}
+
+
+def register_rule(name, description, rule, stateful=False):
+    """Declares (or replaces) a rule; `rule` is a (columns, check) pair from the helpers above."""
+    columns, check = rule
+    RULES[name] = Rule(name, description, columns, check, stateful)
+    return RULES[name]
+
+
+def stateless_rules():
+    """Names of the rules whose memory does not grow with the rows checked."""
+    return [name for name, rule in RULES.items() if not rule.stateful]
+
+
+# Every column except Row ID, which is unique even for a copied row
+_RECORD_COLUMNS = ['Order ID', 'Order Date', 'Ship Date', 'Ship Mode', 'Customer ID', 'Customer Name', 'Segment',
+                   'Country', 'City', 'State', 'Postal Code', 'Region', 'Product ID', 'Category', 'Sub-Category',
+                   'Product Name', 'Sales', 'Quantity', 'Discount', 'Profit']
+
+register_rule('Missing key values', "Order ID, Customer ID, Product ID, Order Date or Sales is empty",
+              missing_any(['Order ID', 'Customer ID', 'Product ID', 'Order Date', 'Sales']))
+register_rule('Invalid Order Date', "Order Date cannot be read as a date", invalid_date('Order Date'))
+register_rule('Invalid Ship Date', "Ship Date cannot be read as a date", invalid_date('Ship Date'))
+register_rule('Ship before order', "Ship Date is earlier than Order Date", date_before('Ship Date', 'Order Date'))
+register_rule('Discount outside [0, 1]', "Discount is negative or above 100%", outside_range('Discount', 0, 1))
+register_rule('Zero or negative sales', "Sales <= 0 (profit margin would divide by zero)",
+              not_positive('Sales'))
+register_rule('Quantity below 1', "Quantity is zero or negative", not_positive('Quantity'))
+register_rule('Malformed Customer ID', "Customer ID is not like AA-12345",
+              malformed('Customer ID', CUSTOMER_ID_PATTERN))
+register_rule('Malformed Order ID', "Order ID is not like CA-2016-152156", malformed('Order ID', ORDER_ID_PATTERN))
+register_rule('Malformed Product ID', "Product ID is not like FUR-BO-10001798",
+              malformed('Product ID', PRODUCT_ID_PATTERN))
+register_rule('Duplicate Row ID', "Row ID repeats an earlier row", duplicated(['Row ID']), stateful=True)
+register_rule('Duplicate rows', "Every column except Row ID repeats an earlier row",
+              duplicated(_RECORD_COLUMNS), stateful=True)
+
+
+# ============================================================================
+# Validator
+# ============================================================================
+
+class Validator:
+    """Runs the rules over chunks of rows, keeping violation counts and sample Row IDs."""
+
+    def __init__(self, rules=None, sample_size=DEFAULT_SAMPLE_SIZE):
+        # Rules are kept by name (looked up in RULES), so a Validator can be pickled with a checkpoint
+        self.rule_names = list(rules or RULES)
+        self.sample_size = sample_size
+        self.rows = 0
+        self.counts = {}  # rule name -> violations so far
+        self.samples = {}  # rule name -> first Row IDs found
+        self.skipped = []  # rules whose columns were not in the data
+        self.state = {}
+        self._compiled = None
+
+    def _compile(self, columns):
+        # Keep the rules whose columns are all present (decided once, on the first chunk)
+        self._compiled = [name for name in self.rule_names if all(column in columns for column in RULES[name].columns)]
+        self.skipped = [name for name in self.rule_names if name not in self._compiled]
+        for name in self._compiled:
+            self.counts[name] = 0
+            self.samples[name] = []
+
+    @property
+    def columns(self):
+        """Every column the rules read (also Row ID, for the samples)."""
+        columns = ['Row ID']
+        for name in self.rule_names:
+            columns.extend(column for column in RULES[name].columns if column not in columns)
+        return columns
+
+    def update(self, chunk):
+        """Checks one chunk of rows against every rule."""
+        if self._compiled is None:
+            self._compile(chunk.columns)
+        view = ChunkView(chunk, self.state)
+        if 'Row ID' in chunk.columns:
+            row_ids = chunk['Row ID'].to_numpy()
+        else:
+            row_ids = np.arange(self.rows, self.rows + len(chunk))  # Positions when there is no Row ID
+        for name in self._compiled:
+            violations = RULES[name].check(view)
+            self.counts[name] += int(np.count_nonzero(violations))
+            sample = self.samples[name]
+            if len(sample) < self.sample_size:
+                sample.extend(row_ids[np.flatnonzero(violations)[:self.sample_size - len(sample)]].tolist())
+        self.rows += len(chunk)
+        return self
+
+    def results(self):
+        """One row per rule: description, violation count and percentage, sample Row IDs."""
+        names = self._compiled or []
+        report = pd.DataFrame({
+            'Description': [RULES[name].description for name in names],
+            'Violations': [self.counts[name] for name in names],
+            'Sample Row IDs': [self.samples[name] for name in names],
+        }, index=pd.Index(names, name='Rule'))
+        report.insert(2, 'Violation %', (report['Violations'] / max(self.rows, 1) * 100).round(3))
+        return report
+
+    def passed(self):
+        return all(count == 0 for count in self.counts.values())
+
+
+@traced(category='quality')
+def validate(dataframe, rules=None, chunksize=None, sample_size=DEFAULT_SAMPLE_SIZE):
+    """Runs every rule over the DataFrame (optionally chunk by chunk) and returns the report table."""
+    validator = Validator(rules, sample_size)
+    if chunksize is None:
+        validator.update(dataframe)
+    else:
+        for start in range(0, len(dataframe), chunksize):
+            validator.update(dataframe.iloc[start:start + chunksize])
+    return validator.results()
+
+
+@traced(category='quality')
+def validate_csv(csv_file_path=CSV_FILE_PATH, rules=None, chunksize=1_000_000, sample_size=DEFAULT_SAMPLE_SIZE):
+    """Streams a CSV in chunks through the rules, reading only the columns they need."""
+    validator = Validator(rules, sample_size)
+    header = pd.read_csv(csv_file_path, nrows=0, **READ_OPTIONS).columns
+    columns = [column for column in validator.columns if column in header]
+    for chunk in pd.read_csv(csv_file_path, usecols=columns, chunksize=chunksize, **READ_OPTIONS):
+        validator.update(chunk)
+    return validator.results()
@@ -0,0 +1,269 @@
+# Analysis reports shared by the Task scripts and the command line tool
+# ============================================================================
+# Each function below computes one analysis and returns its result table(s)
+# without printing, so Task 4 and `python -m superstore` produce the same
+# numbers from the same code.
+
+# REPORT_COLUMNS lists the dataset columns each report reads. The command line
+# tool passes them to the loader so only those columns are parsed from the CSV
+# (e.g. the KPI block never parses Product Name strings).
+
+# Every report also takes `start` / `end` keyword arguments to restrict it to
+# an Order Date window, found by binary search (see dateindex.py), and is
+# @memoized: once memo.configure() is called, an unchanged report on
+# unchanged data is loaded from disk instead of recomputed.
+# ============================================================================
+
+import os
+
+import numpy as np
+import pandas as pd
+
+from superstore.backends import get_backend
+from superstore.binning import banded_summary
+from superstore.dateindex import windowed
+from superstore.kpi import KPI_COLUMNS, compute_kpis
+from superstore.memo import memoized
+from superstore.pivot import multi_pivot
+from superstore.sketches import grouped_distinct_count
+from superstore.timeseries import mom_growth, period_table
+from superstore.tracing import traced
+
+# Columns each report needs (None means every column)
+REPORT_COLUMNS = {
+    'profile': None,
+    'numpy_stats': ['Sales', 'Profit', 'Discount'],
+    'export': None,
+    'sales_performance': ['Category', 'Region', 'Sales', 'Profit'],
+    'customer_segmentation': ['Customer ID', 'Customer Name', 'Sales', 'Order ID'],
+    'category_region': ['Category', 'Region', 'Sales', 'Profit', 'Order ID'],
+    'product_profitability': ['Product Name', 'Profit', 'Sales', 'Quantity', 'Order ID'],
+    'segment': ['Segment', 'Sales', 'Profit', 'Quantity', 'Discount', 'Order ID', 'Customer ID'],
+    'category_segment_pivots': ['Category', 'Segment', 'Profit', 'Sales'],
+    'monthly_trend': ['Order Date', 'Category', 'Profit'],
+    'discount': ['Discount', 'Profit', 'Sales'],
+    'subcategory': ['Sub-Category', 'Profit', 'Sales', 'Quantity', 'Order ID'],
+    'kpi': KPI_COLUMNS,
+}
+
+
+# ============================================================================
+# Data profiling (shared by every Task script)
+# ============================================================================
+
+@memoized()
+@windowed
+@traced(category='report')
+def profile(dataframe):
+    """Shape, memory, summary statistics, missing values and duplicate count."""
+    missing = pd.DataFrame({
+        'Column': dataframe.columns,
+        'Missing Count': dataframe.isnull().sum(),
+        'Missing %': (dataframe.isnull().sum() / len(dataframe) * 100).round(2)
+    })
+    missing = missing[missing['Missing Count'] > 0].sort_values('Missing Count', ascending=False)
+    return {
+        'rows': dataframe.shape[0],
+        'columns': dataframe.shape[1],
+        'memory_mb': dataframe.memory_usage(deep=True).sum() / 1024**2,
+        'describe': dataframe.describe(),
+        'missing': missing,
+        'duplicates': int(dataframe.duplicated().sum()),
+    }
+
+
+# ============================================================================
+# Task 2: NumPy statistics
+# ============================================================================
+
+@memoized()
+@windowed
+@traced(category='report')
+def numpy_stats(dataframe):
+    """Vectorised NumPy statistics and the two business insights from Task 2."""
+    sales_array = dataframe['Sales'].to_numpy()
+    profit_array = dataframe['Profit'].to_numpy()
+    discount_array = dataframe['Discount'].to_numpy()
+    loss_indices = np.where(profit_array < 0)[0]
+    return {
+        'Average Sales': np.mean(sales_array),
+        'Median Sales': np.median(sales_array),
+        'Sales Std. Deviation': np.std(sales_array),
+        'Average Profit': np.mean(profit_array),
+        'Median Profit': np.median(profit_array),
+        'Profit Std. Deviation': np.std(profit_array),
+        'Average Discount': np.mean(discount_array),
+        'Discount/Profit Correlation': np.corrcoef(discount_array, profit_array)[0, 1],
+        'Top 5 Profit Indices': np.argsort(profit_array)[-5:],
+        'Negative Profit Orders': len(loss_indices),
+        'Total Loss': profit_array[loss_indices].sum(),
+    }
+
+
+# ============================================================================
+# Task 3: exports and business scenarios
+# ============================================================================
+
+@windowed
+@traced(category='export')
+def export_subsets(dataframe, output_dir='.'):
+    """Writes the Task 3 CSV exports and returns the file paths written."""
+    exports = {
+        'technology_orders.csv': dataframe[dataframe['Category'] == 'Technology'],
+        'high_profit_orders.csv': dataframe[dataframe['Profit'] > 500],
+        'west_region_orders.csv': dataframe[dataframe['Region'] == 'West'][
+            ['Order ID', 'Customer Name', 'Category', 'Sales', 'Profit', 'Quantity']],
+    }
+    paths = []
+    for file_name, subset in exports.items():
+        path = os.path.join(output_dir, file_name)
+        subset.to_csv(path, index=False)
+        paths.append(path)
+    return paths
+
+
+@memoized()
+@windowed
+@traced(category='groupby')
+def sales_performance(dataframe, backend=None):
+    """Total sales and average profit by Category and Region, largest sales first."""
+    sales_perf = get_backend(backend).groupby_agg(dataframe, ['Category', 'Region'], {
+        'total_sales': ('Sales', 'sum'),
+        'average_profit': ('Profit', 'mean')
+    }).reset_index()
+    return sales_perf.sort_values(by='total_sales', ascending=False)
+
+
+def assign_tier(spent):
+    # High (> $5000), Medium ($2000-$5000), Low (< $2000)
+    if spent > 5000:
+        return "High"
+    elif spent >= 2000:
+        return "Medium"
+    else:
+        return "Low"
+
+
+@memoized()
+@windowed
+@traced(category='groupby')
+def customer_segmentation(dataframe):
+    """Total spending, unique orders and spending tier per customer, biggest spenders first."""
+    customer_segment = dataframe.groupby(['Customer ID', 'Customer Name']).agg(
+        total_spent=pd.NamedAgg(column='Sales', aggfunc='sum')
+    )
+    customer_segment['total_orders'] = grouped_distinct_count(dataframe, ['Customer ID', 'Customer Name'], 'Order ID')
+    customer_segment = customer_segment.reset_index()
+    customer_segment['Tier'] = customer_segment['total_spent'].apply(assign_tier)
+    return customer_segment.sort_values(by='total_spent', ascending=False)
+
+
+# ============================================================================
+# Task 4: exploration reports
+# ============================================================================
+
+@memoized()
+@windowed
+@traced(category='groupby')
+def category_region(dataframe, backend=None):
+    """Sales, profit, order count and profit margin by Category and Region."""
+    analysis = get_backend(backend).groupby_agg(dataframe, ['Category', 'Region'], {
+        'Sales': ('Sales', 'sum'),
+        'Profit': ('Profit', 'sum'),
+        'Order Count': ('Order ID', 'count')
+    }).round(2)
+    analysis['Profit Margin (%)'] = ((analysis['Profit'] / analysis['Sales']) * 100).round(2)
+    return analysis
+
+
+@memoized()
+@windowed
+@traced(category='groupby')
+def product_profitability(dataframe, top_n=10, backend=None):
+    """The top_n most profitable products with their profit per unit."""
+    products = get_backend(backend).groupby_agg(dataframe, 'Product Name', {
+        'Profit': ('Profit', 'sum'),
+        'Sales': ('Sales', 'sum'),
+        'Quantity': ('Quantity', 'sum'),
+        'Times Ordered': ('Order ID', 'count')
+    }).round(2)
+    top_products = products.sort_values('Profit', ascending=False).head(top_n)
+    top_products['Profit per Unit'] = (top_products['Profit'] / top_products['Quantity']).round(2)
+    return top_products
+
+
+@memoized()
+@windowed
+@traced(category='groupby')
+def segment(dataframe, backend=None):
+    """Order value, profit and customer metrics per customer Segment."""
+    analysis = get_backend(backend).groupby_agg(dataframe, 'Segment', {
+        'Total Sales': ('Sales', 'sum'),
+        'Avg Order Value': ('Sales', 'mean'),
+        'Total Profit': ('Profit', 'sum'),
+        'Avg Profit per Order': ('Profit', 'mean'),
+        'Avg Quantity per Order': ('Quantity', 'mean'),
+        'Avg Discount (%)': ('Discount', 'mean'),
+        'Total Orders': ('Order ID', 'count')
+    })
+    # A median cannot be combined from partial results, so pandas always computes it
+    analysis.insert(2, 'Median Order Value', dataframe.groupby('Segment')['Sales'].median())
+    analysis = analysis.round(2)
+    analysis['Unique Customers'] = grouped_distinct_count(dataframe, 'Segment', 'Customer ID')
+    analysis['Avg Profit per Customer'] = (analysis['Total Profit'] / analysis['Unique Customers']).round(2)
+    return analysis
+
+
+@memoized()
+@windowed
+@traced(category='pivot')
+def category_segment_pivots(dataframe):
+    """Profit (sum) and average order value (mean Sales) by Category x Segment, with totals."""
+    pivots = multi_pivot(dataframe, index='Category', columns='Segment',
+                         values=[('Profit', 'sum'), ('Sales', 'mean')],
+                         margins=True, margins_name='Total')
+    return pivots[('Profit', 'sum')].round(2), pivots[('Sales', 'mean')].round(2)
+
+
+@memoized()
+@windowed
+@traced(category='groupby')
+def monthly_trend(dataframe):
+    """Monthly profit by Category and the month-over-month growth (%) for every month."""
+    monthly_profit_wide = period_table(dataframe, by='Category', value='Profit', freq='monthly').round(2)
+    monthly_profit_wide.index.name = 'Year-Month'  # The label Task 4 has always printed
+    return monthly_profit_wide, mom_growth(monthly_profit_wide)
+
+
+@memoized()
+@windowed
+@traced(category='groupby')
+def discount(dataframe):
+    """Profit, sales, order count and profit margin per discount bin."""
+    analysis = banded_summary(dataframe, 'Discount Bin', measures=['Profit', 'Sales']).round(2)
+    analysis['Profit Margin (%)'] = ((analysis['Total Profit'] / analysis['Total Sales']) * 100).round(2)
+    return analysis
+
+
+@memoized()
+@windowed
+@traced(category='groupby')
+def subcategory(dataframe, backend=None):
+    """Every Sub-Category with profit margin and profit per order, most profitable first."""
+    performance = get_backend(backend).groupby_agg(dataframe, 'Sub-Category', {
+        'Profit': ('Profit', 'sum'),
+        'Sales': ('Sales', 'sum'),
+        'Quantity': ('Quantity', 'sum'),
+        'Order Count': ('Order ID', 'count')
+    }).round(2)
+    performance['Profit Margin (%)'] = ((performance['Profit'] / performance['Sales']) * 100).round(2)
+    performance['Profit per Order'] = (performance['Profit'] / performance['Order Count']).round(2)
+    return performance.sort_values('Profit', ascending=False)
+
+
+@memoized()
+@windowed
+@traced(category='kpi')
+def kpi(dataframe):
+    """Every registered KPI computed in one pass."""
+    return compute_kpis(dataframe)
@@ -0,0 +1,177 @@
+# Task 1 business scenarios built from the entity classes
+# ============================================================================
+# Scenario 1: Customer Order Summary and Profit Analysis
+# Scenario 2: Regional Sales and Shipping Efficiency Report
+# Both work on a few sample rows, so they only need the first rows and the
+# columns listed in SCENARIO_1_COLUMNS and SCENARIO_2_COLUMNS.
+# ============================================================================
+
+from superstore.dateindex import windowed
+from superstore.dates import parse_date_string
+from superstore.models import Customer, Order, Shipment
+from superstore.tracing import traced
+
+# Columns each scenario reads from the dataset
+SCENARIO_1_COLUMNS = ['Order ID', 'Order Date', 'Customer ID', 'Customer Name', 'Region', 'Product ID',
+                      'Category', 'Sub-Category', 'Product Name', 'Sales', 'Quantity', 'Discount', 'Profit']
+SCENARIO_2_COLUMNS = SCENARIO_1_COLUMNS + ['Ship Mode', 'Ship Date', 'City']
+
+# Number of sample rows each scenario uses
+SCENARIO_1_ROWS = 5
+SCENARIO_2_ROWS = 10
+
+
+# ==========================================================
+# BUSINESS SCENARIO 1: Customer Order Summary and Profit Analysis
+# ==========================================================
+
+
+@windowed
+@traced(category='scenario')
+def create_customer_orders(dataframe):
+    """Creates and returns a list of Order objects with linked Customer and Product details."""
+    orders = []
+
+    # Use the first 5 rows to create sample orders for demonstration
+    for _, row in dataframe.head(SCENARIO_1_ROWS).iterrows():
+        # Create a Customer object
+        customer = Customer(row['Customer ID'], row['Customer Name'], row['Region'])
+
+        # Create an Order object using inherited Product attributes
+        order = Order(
+            order_id=row['Order ID'],
+            order_date=row['Order Date'],
+            customer=customer,
+            product_id=row['Product ID'],
+            category=row['Category'],
+            sub_category=row['Sub-Category'],
+            name=row['Product Name'],
+            sales=row['Sales'],
+            quantity=row['Quantity'],
+            discount=row['Discount'],
+            profit=row['Profit']
+        )
+
+        # Add the new order to the list
+        orders.append(order)
+
+    return orders
+
+
+@traced(category='scenario')
+def display_order_summaries(orders):
+    """Prints a summary of each order, showing customer info, sales, discount, and profit margin."""
+    print("\n*** CUSTOMER ORDER SUMMARY AND PROFIT ANALYSIS ***\n")
+
+    total_sales = 0
+    total_profit = 0
+
+    # Loop through each order object
+    for order in orders:
+        # Print readable summary for each order
+        print(f"Order ID: {order.order_id}")
+        print(f"Customer: {order.customer.get_customer_info()}")  # Uses encapsulated getter
+        print(f"Product: {order.name} ({order.category} - {order.sub_category})")
+        print(f"Quantity: {order.quantity}")
+        print(f"Sales (before discount): ${order.sales * order.quantity:.2f}")
+        print(f"Discount Applied: {order.discount * 100:.0f}%")
+        print(f"Final Total (after discount): ${order.discounted_total():.2f}")
+        print(f"Profit Margin: {order.profit_margin():.2f}%")
+        print("-" * 80)
+
+        # Keep running totals for business reporting
+        total_sales += order.discounted_total()
+        total_profit += order.profit
+
+    # Display overall totals
+    print("\n *** OVERALL BUSINESS PERFORMANCE ***")
+    print(f"Total Orders: {len(orders)}")
+    print(f"Total Sales (after discount): ${total_sales:.2f}")
+    print(f"Total Profit: ${total_profit:.2f}")
+    print(f"Average Profit Margin: {(total_profit / total_sales) * 100:.2f}%")
+    print("====================================================================\n")
+
+
+# ==========================================================
+# SCENARIO 2: Regional Sales and Shipping Efficiency Report
+# ==========================================================
+
+
+# Function to simulate creation of Order and Shipment objects from a few dataset rows
+@windowed
+@traced(category='scenario')
+def create_sample_orders(dataframe):
+    """Creates a list of Order objects using sample rows from the dataset."""
+    sample_orders = []
+
+    # Take only the first 10 rows for demonstration purposes
+    for _, row in dataframe.head(SCENARIO_2_ROWS).iterrows():
+        # Create a Customer object
+        customer = Customer(row["Customer ID"], row["Customer Name"], row["Region"])
+
+        # Create a Shipment object
+        shipment = Shipment(row["Ship Mode"], row["Ship Date"], row["City"])
+
+        # Create an Order object (inherits Product details)
+        order = Order(
+            order_id=row["Order ID"],
+            order_date=row["Order Date"],
+            customer=customer,
+            product_id=row["Product ID"],
+            category=row["Category"],
+            sub_category=row["Sub-Category"],
+            name=row["Product Name"],
+            sales=row["Sales"],
+            quantity=row["Quantity"],
+            discount=row["Discount"],
+            profit=row["Profit"]
+        )
+
+        # Attach shipment to the order (composition relationship)
+        order.shipment = shipment
+
+        # Add to the list
+        sample_orders.append(order)
+
+    return sample_orders
+
+
+# Function to calculate regional performance
+@traced(category='scenario')
+def analyse_regional_sales(orders):
+    """Groups orders by region and calculates key metrics (total sales, order count, average shipping delay)."""
+
+    region_data = {}
+
+    for order in orders:
+        region = order.customer.get_region()  # Get region from Customer object
+        # parse_date_string caches each distinct date, so repeated dates are only parsed once
+        ship_date = parse_date_string(order.shipment.ship_date)
+        order_date = parse_date_string(order.order_date)
+
+        # Calculate shipping delay in days
+        shipping_delay = (ship_date - order_date).days
+
+        # Add region data if not already
+        if region not in region_data:
+            region_data[region] = {
+                "total_sales": 0,
+                "order_count": 0,
+                "total_shipping_delay": 0
+            }
+
+        # Update metrics for the region
+        region_data[region]["total_sales"] += order.total_sales()
+        region_data[region]["order_count"] += 1
+        region_data[region]["total_shipping_delay"] += shipping_delay
+
+    # Print region-wise summary
+    print("\n *** REGIONAL SALES AND SHIPPING EFFICIENCY REPORT ***\n")
+    print("*" * 50)
+    for region, stats in region_data.items():
+        avg_delay = stats["total_shipping_delay"] / stats["order_count"]
+        print(f"Region: {region}")
+        print(f"  Total Orders: {stats['order_count']}")
+        print(f"  Total Sales: ${stats['total_sales']:.2f}")
+        print(f"  Average Shipping Delay: {avg_delay:.1f} days")
+        print("-" * 55)
@@ -0,0 +1,243 @@
+# Dictionary-encoded star schema
+# ============================================================================
+# Every dataset row repeats the full strings for the customer, product, city,
+# state, category, ... A star schema stores each distinct combination once:
+# - dimension tables: one row per distinct Customer, Product, Geography,
+#   Ship Mode and Order ID, numbered 0..n-1 (the dimension "key"), plus a Date
+#   dimension with one row per calendar day keyed by its day number
+# - a fact table: only int32 keys and the numeric measures (Sales, Quantity,
+#   Discount, Profit) for every row
+#
+# Group-bys on the fact table work on integer codes instead of hashing strings
+# again, and the fact table is a small fraction of the original memory.
+# Dimension keys follow the sorted order of their values, so grouping by codes
+# gives groups in the same order as grouping by the strings.
+#
+# The Task 1 classes can be created from dimension rows (see order()).
+#
+# Example:
+#   schema = StarSchema.from_dataframe(df)
+#   schema.aggregate(['Category', 'Region'], {'Sales': ('Sales', 'sum')})
+#   schema.order(0).order_summary()
+# ============================================================================
+
+import numpy as np
+import pandas as pd
+
+from superstore.dates import MISSING_DAY, from_day_numbers, parse_day_numbers
+from superstore.models import Category, Customer, Order, Shipment
+from superstore.tracing import traced
+
+# Dimensions: name -> (key column in the fact table, attribute columns)
+# Order is a "degenerate" dimension: it only holds the Order ID string
+DIMENSIONS = {
+    'Order': ('Order Key', ['Order ID']),
+    'Customer': ('Customer Key', ['Customer ID', 'Customer Name', 'Segment']),
+    'Product': ('Product Key', ['Product ID', 'Product Name', 'Category', 'Sub-Category']),
+    'Geography': ('Geography Key', ['Country', 'City', 'State', 'Postal Code', 'Region']),
+    'Ship Mode': ('Ship Mode Key', ['Ship Mode']),
+}
+
+# Date columns stored in the fact table as int32 day numbers (keys into the Date dimension)
+DATE_KEYS = {'Order Date': 'Order Day', 'Ship Date': 'Ship Day'}
+
+# Numeric columns kept as they are in the fact table
+MEASURES = ['Row ID', 'Sales', 'Quantity', 'Discount', 'Profit']
+
+
+def _encode(frame):
+    """Integer code per row for the combination of columns, plus the table of distinct combinations."""
+    if frame.shape[1] == 1:
+        codes, uniques = pd.factorize(frame.iloc[:, 0], sort=True, use_na_sentinel=False)
+        return codes.astype(np.int32), pd.DataFrame({frame.columns[0]: uniques})
+    codes = frame.groupby(list(frame.columns), sort=True, dropna=False).ngroup().to_numpy(dtype=np.int32)
+    _, first_rows = np.unique(codes, return_index=True)
+    return codes, frame.iloc[first_rows].reset_index(drop=True)
+
+
+def _date_dimension(days):
+    """One row per calendar day between the first and last date, keyed by day number."""
+    valid = days[days != MISSING_DAY]
+    if len(valid) == 0:
+        return pd.DataFrame(columns=['Date', 'Year', 'Quarter', 'Month', 'Month Name', 'Day of Week'])
+    day_numbers = np.arange(valid.min(), valid.max() + 1, dtype=np.int32)
+    dates = pd.DatetimeIndex(from_day_numbers(day_numbers))
+    return pd.DataFrame({
+        'Date': dates,
+        'Year': dates.year,
+        'Quarter': dates.quarter,
+        'Month': dates.month,
+        'Month Name': dates.month_name(),
+        'Day of Week': dates.day_name(),
+    }, index=pd.Index(day_numbers, name='Day'))
+
+
+class StarSchema:
+    """Dimension tables plus an integer-keyed fact table built from the flat dataset."""
+
+    def __init__(self, fact, dimensions):
+        self.fact = fact
+        self.dimensions = dimensions  # name -> DataFrame indexed by key
+        self._attribute_codes = {}
+
+    @classmethod
+    @traced(category='prepare')
+    def from_dataframe(cls, dataframe):
+        """Encodes every dimension found in the dataframe's columns (others are skipped)."""
+        fact = {}
+        dimensions = {}
+        for name, (key, columns) in DIMENSIONS.items():
+            if all(column in dataframe.columns for column in columns):
+                fact[key], table = _encode(dataframe[columns])
+                table.index.name = key
+                dimensions[name] = table
+
+        # Dates: the fact stores day numbers, the Date dimension covers every day in range
+        day_arrays = []
+        for date_column, day_column in DATE_KEYS.items():
+            if day_column in dataframe.columns:
+                fact[day_column] = dataframe[day_column].to_numpy(dtype=np.int32)
+            elif date_column in dataframe.columns:
+                fact[day_column] = parse_day_numbers(dataframe[date_column])
+            else:
+                continue
+            day_arrays.append(fact[day_column])
+        if day_arrays:
+            dimensions['Date'] = _date_dimension(np.concatenate(day_arrays))
+
+        for column in MEASURES:
+            if column in dataframe.columns:
+                values = dataframe[column].to_numpy()
+                # Whole-number columns (Row ID, Quantity) fit in int32
+                fact[column] = values.astype(np.int32) if np.issubdtype(values.dtype, np.integer) else values
+        return cls(pd.DataFrame(fact), dimensions)
+
+    # ------------------------------------------------------------------
+    # Looking up attributes
+    # ------------------------------------------------------------------
+
+    def dimension_of(self, attribute):
+        """Name of the dimension holding an attribute column such as 'Category'."""
+        for name, (key, columns) in DIMENSIONS.items():
+            if attribute in columns and name in self.dimensions:
+                return name
+        raise KeyError(f"'{attribute}' is not an attribute of any dimension in this schema")
+
+    def attribute_codes(self, attribute):
+        """Per fact row: sorted integer code of an attribute, and the labels the codes point to.
+
+        The attribute is encoded once on the (small) dimension table and then
+        looked up through the fact table's keys with an integer take.
+        """
+        if attribute not in self._attribute_codes:
+            name = self.dimension_of(attribute)
+            key = DIMENSIONS[name][0]
+            dimension_codes, labels = pd.factorize(self.dimensions[name][attribute], sort=True)
+            self._attribute_codes[attribute] = (dimension_codes.astype(np.int32).take(self.fact[key].to_numpy()),
+                                                labels)
+        return self._attribute_codes[attribute]
+
+    def column(self, name):
+        """A fact measure, or an attribute decoded back to its labels for every row."""
+        if name in self.fact.columns:
+            return self.fact[name]
+        codes, labels = self.attribute_codes(name)
+        values = labels.take(np.where(codes < 0, 0, codes))
+        return pd.Series(values, name=name).where(codes >= 0)
+
+    def denormalize(self, columns=None):
+        """Rebuilds the flat table (all attribute and measure columns by default)."""
+        if columns is None:
+            columns = [column for name, (key, attributes) in DIMENSIONS.items() if name in self.dimensions
+                       for column in attributes]
+            columns += [column for column in MEASURES if column in self.fact.columns]
+        return pd.DataFrame({column: self.column(column) for column in columns})
+
+    # ------------------------------------------------------------------
+    # Integer group-bys
+    # ------------------------------------------------------------------
+
+    def _values(self, column):
+        # Measures as they are; attributes as nullable integer codes (so 'count' skips missing values)
+        if column in self.fact.columns:
+            return self.fact[column].to_numpy()
+        codes, _ = self.attribute_codes(column)
+        return pd.arrays.IntegerArray(codes, codes < 0)
+
+    def aggregate(self, by, aggregations):
+        """Named aggregations {output: (column, aggfunc)} grouped by attribute columns.
+
+        Gives the same table as dataframe.groupby(by).agg(...) on the flat data,
+        but groups on int32 codes. Columns can be measures or attributes (for
+        'count' and 'nunique', e.g. ('Order ID', 'count')).
+        """
+        by = [by] if isinstance(by, str) else list(by)
+        frame = {}
+        keep = np.ones(len(self.fact), dtype=bool)
+        for attribute in by:
+            codes, _ = self.attribute_codes(attribute)
+            frame[attribute] = codes
+            keep &= codes >= 0  # Like pandas, rows with a missing key are left out
+        for column, _ in aggregations.values():
+            if column not in frame:
+                frame[column] = self._values(column)
+
+        grouped = pd.DataFrame(frame)[keep].groupby(by, sort=True).agg(
+            **{name: pd.NamedAgg(column=column, aggfunc=aggfunc)
+               for name, (column, aggfunc) in aggregations.items()})
+        for name in grouped.columns:
+            # Counts and int32 sums come back as int64, like the flat-table group-by
+            if pd.api.types.is_integer_dtype(grouped[name]):
+                grouped[name] = grouped[name].astype('int64')
+
+        # Swap the integer codes in the index back to their labels
+        levels = [self.attribute_codes(attribute)[1].take(grouped.index.get_level_values(position))
+                  for position, attribute in enumerate(by)]
+        if len(by) == 1:
+            grouped.index = pd.Index(levels[0], name=by[0])
+        else:
+            grouped.index = pd.MultiIndex.from_arrays(levels, names=by)
+        return grouped
+
+    # ------------------------------------------------------------------
+    # Task 1 objects backed by dimension rows
+    # ------------------------------------------------------------------
+
+    def _dimension_row(self, name, position):
+        return self.dimensions[name].iloc[int(self.fact[DIMENSIONS[name][0]].iat[position])]
+
+    def customer(self, position):
+        """Customer object for a fact row (the region comes from the row's geography)."""
+        return Customer.from_dimension(self._dimension_row('Customer', position),
+                                       self._dimension_row('Geography', position))
+
+    def category(self, position):
+        """Category object for a fact row's product."""
+        return Category.from_dimension(self._dimension_row('Product', position))
+
+    def shipment(self, position):
+        """Shipment object for a fact row (ship mode, ship date and city)."""
+        ship_day = int(self.fact['Ship Day'].iat[position])
+        return Shipment.from_dimension(self._dimension_row('Ship Mode', position),
+                                       self.dimensions['Date'].loc[ship_day],
+                                       self._dimension_row('Geography', position))
+
+    def order(self, position):
+        """Order object for a fact row, built from its dimension rows and measures."""
+        order_day = int(self.fact['Order Day'].iat[position])
+        return Order.from_dimension(self._dimension_row('Order', position),
+                                    self.dimensions['Date'].loc[order_day],
+                                    self.customer(position),
+                                    self._dimension_row('Product', position),
+                                    self.fact.iloc[position])
+
+    # ------------------------------------------------------------------
+    # Memory
+    # ------------------------------------------------------------------
+
+    def memory_usage(self):
+        """Bytes used by the fact table and by each dimension table."""
+        usage = {'Fact': int(self.fact.memory_usage(deep=True).sum())}
+        for name, table in self.dimensions.items():
+            usage[name] = int(table.memory_usage(deep=True).sum())
+        return usage
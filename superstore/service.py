@@ -0,0 +1,321 @@
+# Local query service for Superstore aggregations
+# ============================================================================
+# Instead of re-running a whole Task script for every question, this service
+# loads the dataset once and answers parameterised queries over HTTP on
+# localhost. Results are kept in an LRU cache, so repeating a question is
+# answered from memory. The filter columns have bitmap indexes (bitmap.py), so
+# a filtered query never scans their strings, and start/end are binary
+# searches in a sorted date index (dateindex.py).
+
+# Run it with:   python -m superstore.service --port 8765
+# Example query: http://127.0.0.1:8765/query?report=groupby&by=Category,Region&measures=Sales,Profit
+#
+# Endpoints:
+# - /query   run a report (see QUERY_REPORTS) with optional filters
+# - /stats   per-query latency and cache hit rate
+# - /health  simple liveness check
+
+# Query parameters:
+# - report:   groupby | pivot | kpi | timeseries | topk
+# - region, category, segment, sub_category, ship_mode, state: filters (comma-separated values allowed)
+# - start, end: Order Date range (inclusive), e.g. start=2017-01-01
+# - by:       grouping columns for groupby (comma-separated)
+# - index, columns: pivot dimensions
+# - measures: value columns (comma-separated), aggfunc: sum | mean | count | min | max
+# - freq:     time-series frequency (daily | weekly | monthly | quarterly)
+# - key, k, capacity: topk items of `key` by each measure's positive total (Space-Saving, see sketches.py)
+# ============================================================================
+
+import argparse
+import asyncio
+import json
+import threading
+import time
+from collections import OrderedDict, deque
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+import pandas as pd
+
+from superstore.bitmap import BitmapIndex
+from superstore.dateindex import date_index
+from superstore.kpi import compute_kpis
+from superstore.loader import CSV_FILE_PATH, load_superstore, prepare_dataset
+from superstore.pivot import multi_pivot
+from superstore.sketches import SpaceSaving
+from superstore.timeseries import period_table
+
+# Query parameter name -> dataset column for the equality filters
+FILTER_COLUMNS = {'region': 'Region', 'category': 'Category', 'segment': 'Segment',
+                  'sub_category': 'Sub-Category', 'ship_mode': 'Ship Mode', 'state': 'State'}
+
+QUERY_REPORTS = ('groupby', 'pivot', 'kpi', 'timeseries', 'topk')
+
+QUERY_AGGFUNCS = ('sum', 'mean', 'count', 'min', 'max')
+
+
+class QueryError(ValueError):
+    """Raised for a bad query; reported to the client as HTTP 400."""
+
+
+# ============================================================================
+# LRU cache with hit-rate statistics
+# ============================================================================
+
+class LRUCache:
+    """Small thread-safe least-recently-used cache that counts hits and misses."""
+
+    def __init__(self, maxsize=256):
+        self.maxsize = maxsize
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            if key in self._items:
+                self._items.move_to_end(key)  # Mark as most recently used
+                self.hits += 1
+                return True, self._items[key]
+            self.misses += 1
+            return False, None
+
+    def put(self, key, value):
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)  # Drop the least recently used entry
+
+    @property
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def __len__(self):
+        return len(self._items)
+
+
+# ============================================================================
+# Query engine (no HTTP, so it can be used directly too)
+# ============================================================================
+
+def _split(value):
+    # "Sales,Profit" -> ['Sales', 'Profit']
+    return [part.strip() for part in value.split(',') if part.strip()]
+
+
+def _to_records(table):
+    # Turn a result table into JSON-friendly rows (periods and categories become text)
+    if isinstance(table, pd.Series):
+        table = table.to_frame()
+    table = table.copy()
+    if isinstance(table.columns, pd.MultiIndex):
+        table.columns = [' | '.join(map(str, column)) for column in table.columns]
+    table.columns = [str(column) for column in table.columns]
+    table = table.reset_index()
+    for column in table.columns:
+        if not pd.api.types.is_numeric_dtype(table[column]):
+            table[column] = table[column].astype(str)
+    # NaN is not valid JSON, send null instead
+    return json.loads(table.to_json(orient='records'))
+
+
+class QueryService:
+    """Keeps the prepared dataset in memory and answers cached, parameterised queries."""
+
+    def __init__(self, dataframe, cache_size=256, latency_window=1000):
+        self.df = dataframe
+        self.index = BitmapIndex(dataframe, list(FILTER_COLUMNS.values()))
+        self.cache = LRUCache(cache_size)
+        self.latencies = deque(maxlen=latency_window)  # Seconds per recent query
+        self.query_count = 0
+        self._stats_lock = threading.Lock()  # Queries run on executor threads
+
+    @classmethod
+    def from_csv(cls, csv_file_path=CSV_FILE_PATH, **kwargs):
+        return cls(prepare_dataset(load_superstore(csv_file_path)), **kwargs)
+
+    def _filter(self, params):
+        # Equality filters are answered by the bitmap index, the date range by the sorted date index
+        equals = {column: _split(params[name]) for name, column in FILTER_COLUMNS.items() if name in params}
+        rows = self.index.row_ids(equals) if equals else None
+        if 'start' in params or 'end' in params:
+            try:
+                in_range = date_index(self.df).row_ids(params.get('start'), params.get('end'))
+            except ValueError as e:
+                raise QueryError(f"Invalid date: {e}")
+            rows = in_range if rows is None else np.intersect1d(rows, in_range, assume_unique=True)
+        return self.df if rows is None else self.df.iloc[rows]
+
+    def _check_columns(self, columns):
+        missing = [c for c in columns if c not in self.df.columns]
+        if missing:
+            raise QueryError(f"Unknown column(s): {', '.join(missing)}")
+        return columns
+
+    def _run(self, params):
+        report = params.get('report', 'groupby')
+        if report not in QUERY_REPORTS:
+            raise QueryError(f"Unknown report '{report}', choose from {', '.join(QUERY_REPORTS)}")
+        data = self._filter(params)
+        measures = self._check_columns(_split(params.get('measures', 'Sales,Profit')))
+        aggfunc = params.get('aggfunc', 'sum')
+        if aggfunc not in QUERY_AGGFUNCS:
+            raise QueryError(f"Unknown aggfunc '{aggfunc}', choose from {', '.join(QUERY_AGGFUNCS)}")
+
+        if report == 'kpi':
+            # NaN (e.g. a margin on an empty selection) is not valid JSON, send null instead
+            kpis = {name: (None if pd.isna(value) else value) for name, value in compute_kpis(data).items()}
+            return {'rows': len(data), 'kpis': kpis}
+
+        if report == 'groupby':
+            by = self._check_columns(_split(params.get('by', 'Category')))
+            table = data.groupby(by, observed=True)[measures].agg(aggfunc)
+            return {'rows': len(data), 'result': _to_records(table)}
+
+        if report == 'pivot':
+            index, columns = self._check_columns([params.get('index', 'Category'), params.get('columns', 'Segment')])
+            tables = multi_pivot(data, index, columns, [(m, aggfunc) for m in measures])
+            return {'rows': len(data),
+                    'result': {f'{m} ({a})': _to_records(t) for (m, a), t in tables.items()}}
+
+        if report == 'topk':
+            # Heavy hitters per measure from a bounded number of counters, with their error bounds
+            key = self._check_columns([params.get('key', 'Product Name')])[0]
+            k, capacity = int(params.get('k', 10)), int(params.get('capacity', 100))
+            return {'rows': len(data),
+                    'result': {m: _to_records(SpaceSaving(capacity).update(data[key], data[m]).top(k)
+                                              .rename_axis(key))
+                               for m in measures}}
+
+        # Time series: one table per measure, groups as columns
+        by = self._check_columns(_split(params.get('by', 'Category')))
+        freq = params.get('freq', 'monthly')
+        return {'rows': len(data),
+                'result': {m: _to_records(period_table(data, by=by, value=m, freq=freq)) for m in measures}}
+
+    def query(self, params):
+        """Answers one query (a dict of parameters), using the cache when possible."""
+        started = time.perf_counter()
+        key = tuple(sorted(params.items()))
+        found, result = self.cache.get(key)
+        if not found:
+            try:
+                result = self._run(params)
+            except QueryError:
+                raise
+            except (KeyError, TypeError, ValueError) as e:
+                raise QueryError(str(e))
+            self.cache.put(key, result)
+        with self._stats_lock:
+            self.latencies.append(time.perf_counter() - started)
+            self.query_count += 1
+        return {'cached': found, **result}
+
+    def stats(self):
+        """Latency percentiles (milliseconds) and cache statistics."""
+        with self._stats_lock:
+            latencies = np.array(self.latencies) * 1000
+            queries = self.query_count
+        has_data = len(latencies) > 0
+        return {
+            'queries': queries,
+            'cache_entries': len(self.cache),
+            'cache_hits': self.cache.hits,
+            'cache_misses': self.cache.misses,
+            'cache_hit_rate': round(self.cache.hit_rate, 4),
+            'latency_ms_mean': round(float(latencies.mean()), 3) if has_data else None,
+            'latency_ms_p50': round(float(np.percentile(latencies, 50)), 3) if has_data else None,
+            'latency_ms_p95': round(float(np.percentile(latencies, 95)), 3) if has_data else None,
+        }
+
+
+# ============================================================================
+# Minimal asyncio HTTP server
+# ============================================================================
+
+STATUS_TEXT = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+               500: 'Internal Server Error'}
+
+
+async def _send_json(writer, status, payload):
+    body = json.dumps(payload, default=str).encode('utf-8')
+    head = (f"HTTP/1.1 {status} {STATUS_TEXT[status]}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: close\r\n\r\n").encode('latin-1')
+    writer.write(head + body)
+    await writer.drain()
+
+
+def make_handler(service):
+    """Creates the connection handler for asyncio.start_server()."""
+
+    async def handle(reader, writer):
+        try:
+            request_line = (await reader.readline()).decode('latin-1').strip()
+            # Skip the headers, we only need the request line
+            while (await reader.readline()) not in (b'\r\n', b'\n', b''):
+                pass
+            parts = request_line.split()
+            if len(parts) < 2:
+                await _send_json(writer, 400, {'error': 'Malformed request'})
+                return
+            method, target = parts[0], parts[1]
+            if method != 'GET':
+                await _send_json(writer, 405, {'error': 'Only GET is supported'})
+                return
+
+            url = urlsplit(target)
+            params = {name: values[-1] for name, values in parse_qs(url.query).items()}
+            if url.path == '/query':
+                # Run the pandas work in a thread so other requests keep being served
+                loop = asyncio.get_running_loop()
+                try:
+                    result = await loop.run_in_executor(None, service.query, params)
+                except QueryError as e:
+                    await _send_json(writer, 400, {'error': str(e)})
+                    return
+                await _send_json(writer, 200, result)
+            elif url.path == '/stats':
+                await _send_json(writer, 200, service.stats())
+            elif url.path == '/health':
+                await _send_json(writer, 200, {'status': 'ok', 'rows': len(service.df)})
+            else:
+                await _send_json(writer, 404, {'error': f"Unknown path '{url.path}'"})
+        except Exception as e:
+            await _send_json(writer, 500, {'error': str(e)})
+        finally:
+            writer.close()
+
+    return handle
+
+
+async def serve(service, host='127.0.0.1', port=8765):
+    """Starts the HTTP server and runs until cancelled."""
+    server = await asyncio.start_server(make_handler(service), host, port)
+    print(f"Superstore query service listening on http://{host}:{port}")
+    async with server:
+        await server.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve cached Superstore aggregations over HTTP on localhost.")
+    parser.add_argument('--csv', default=CSV_FILE_PATH, help="Path to the Superstore CSV file")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--cache-size', type=int, default=256, help="Maximum number of cached query results")
+    args = parser.parse_args(argv)
+
+    service = QueryService.from_csv(args.csv, cache_size=args.cache_size)
+    print(f"Dataset loaded: {len(service.df)} rows")
+    try:
+        asyncio.run(serve(service, args.host, args.port))
+    except KeyboardInterrupt:
+        print("\nService stopped.")
+
+
+if __name__ == '__main__':
+    main()
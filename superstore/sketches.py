@@ -0,0 +1,298 @@
+# Probabilistic sketches for very large Superstore histories
+# (distinct counts with HyperLogLog, top-K items with Space-Saving further below)
+# ============================================================================
+# Counting distinct customers or orders exactly (nunique) needs a hash set of
+# every value seen, which grows with the data. On a billion-row history that
+# no longer fits in memory.
+
+# A HyperLogLog sketch estimates the number of distinct values using a small,
+# fixed array of "registers" (a few KB) no matter how many rows we feed it.
+# Two sketches can be merged by taking the element-wise maximum of their
+# registers, so chunks, groups and worker processes can each build their own
+# sketch and combine them at the end.
+
+# The exact nunique() path stays the default for data of normal size; the
+# sketch is only used when asked for, or automatically above a row threshold.
+# ============================================================================
+
+import math
+
+import numpy as np
+import pandas as pd
+
+# Above this many rows distinct_count() switches to the sketch automatically
+APPROXIMATE_THRESHOLD = 50_000_000
+
+# Allowed HyperLogLog precision range (number of index bits)
+MIN_PRECISION = 4
+MAX_PRECISION = 18
+
+
+# ============================================================================
+# Hashing helpers
+# ============================================================================
+
+def _hash_values(values):
+    # pandas hashes a whole array at once into 64-bit integers (no Python loop)
+    values = np.asarray(values, dtype=object)
+    values = values[pd.notna(values)]  # Missing values are not counted, like nunique()
+    return pd.util.hash_array(values)
+
+
+def _leading_zeros(x):
+    # Counts the leading zero bits of each uint64 with a vectorised binary search
+    x = x.copy()
+    zeros = np.zeros(len(x), dtype=np.uint8)
+    for shift in (32, 16, 8, 4, 2, 1):
+        small = (x >> np.uint64(64 - shift)) == 0
+        zeros[small] += shift
+        x[small] <<= np.uint64(shift)
+    zeros[x == 0] = 64
+    return zeros
+
+
+def precision_for_error(error):
+    """Returns the smallest precision whose standard error (1.04 / sqrt(2^p)) is below `error`."""
+    precision = math.ceil(math.log2((1.04 / error) ** 2))
+    return min(max(precision, MIN_PRECISION), MAX_PRECISION)
+
+
+def _alpha(m):
+    # Bias correction constant from the HyperLogLog paper
+    if m == 16:
+        return 0.673
+    if m == 32:
+        return 0.697
+    if m == 64:
+        return 0.709
+    return 0.7213 / (1 + 1.079 / m)
+
+
+def _estimate(registers):
+    # Works on one sketch (1-D) or many sketches at once (2-D, one per row)
+    registers = np.atleast_2d(registers)
+    m = registers.shape[1]
+    return _estimate_from_sums(np.sum(np.exp2(-registers.astype(float)), axis=1),
+                               np.count_nonzero(registers == 0, axis=1), m)
+
+
+def _estimate_from_sums(inverse_sum, empty, m):
+    # The estimate only needs sum(2^-register) and the number of empty registers of each sketch,
+    # so sparse sketches (only the registers that were set) are estimated without the full array
+    raw = _alpha(m) * m * m / inverse_sum
+
+    # Small-range correction: use linear counting while many registers are still empty
+    use_linear = (raw <= 2.5 * m) & (empty > 0)
+    linear = np.zeros_like(raw)
+    np.multiply(m, np.log(m / np.maximum(empty, 1)), out=linear, where=use_linear)
+    return np.where(use_linear, linear, raw)
+
+
+# ============================================================================
+# HyperLogLog sketch
+# ============================================================================
+
+class HyperLogLog:
+    """Mergeable distinct-count sketch with a configurable relative error."""
+
+    def __init__(self, error=0.01, precision=None):
+        self.precision = precision if precision is not None else precision_for_error(error)
+        if not MIN_PRECISION <= self.precision <= MAX_PRECISION:
+            raise ValueError(f"Precision must be between {MIN_PRECISION} and {MAX_PRECISION}")
+        self.registers = np.zeros(2 ** self.precision, dtype=np.uint8)
+
+    @property
+    def standard_error(self):
+        # Expected relative error of count()
+        return 1.04 / math.sqrt(len(self.registers))
+
+    @staticmethod
+    def _positions(hashes, precision):
+        # The top `precision` bits pick a register, the rest give the rank
+        index = (hashes >> np.uint64(64 - precision)).astype(np.intp)
+        rank = _leading_zeros(hashes << np.uint64(precision)) + 1
+        rank = np.minimum(rank, 64 - precision + 1).astype(np.uint8)
+        return index, rank
+
+    def add(self, values):
+        """Adds an array (or Series) of values to the sketch."""
+        index, rank = self._positions(_hash_values(values), self.precision)
+        np.maximum.at(self.registers, index, rank)
+        return self
+
+    def merge(self, other):
+        """Combines another sketch into this one (both must use the same precision)."""
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge HyperLogLog sketches with different precision")
+        np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+
+    def count(self):
+        """Returns the estimated number of distinct values added so far."""
+        return int(round(_estimate(self.registers)[0]))
+
+
+# ============================================================================
+# Convenience functions used by the reports
+# ============================================================================
+
+def distinct_count(values, approximate=None, error=0.01):
+    """Counts distinct values, exactly by default and with HyperLogLog for very large data."""
+    if approximate is None:
+        approximate = len(values) > APPROXIMATE_THRESHOLD
+    if not approximate:
+        return int(pd.Series(values).nunique())
+    return HyperLogLog(error=error).add(values).count()
+
+
+def grouped_distinct_count(dataframe, by, column, approximate=None, error=0.01):
+    """Distinct values of `column` per group, like groupby(by)[column].nunique().
+
+    The approximate path builds one sketch per group in a single vectorised pass. The sketches are
+    sparse: only the (group, register) pairs that were set are kept, so memory grows with the rows
+    rather than with groups x 2^precision (16 KB per group at the default error).
+    """
+    if approximate is None:
+        approximate = len(dataframe) > APPROXIMATE_THRESHOLD
+    grouped = dataframe.groupby(by)
+    if not approximate:
+        return grouped[column].nunique()
+
+    precision = precision_for_error(error)
+    m = 2 ** precision
+    # Rows with a missing group key have no group (ngroup() gives -1 or NaN for them)
+    group_codes = grouped.ngroup().to_numpy(dtype=float, na_value=np.nan)
+    values = dataframe[column].to_numpy(dtype=object)
+    present = pd.notna(values) & (group_codes >= 0)
+    group_codes = group_codes[present].astype(np.intp)
+
+    # Largest rank per (group, register) pair that was set
+    group_index = grouped.size().index
+    index, rank = HyperLogLog._positions(pd.util.hash_array(values[present]), precision)
+    pairs, inverse = np.unique(group_codes.astype(np.int64) * m + index, return_inverse=True)
+    registers = np.zeros(len(pairs), dtype=np.uint8)
+    np.maximum.at(registers, inverse, rank)
+
+    # Per group: registers set, and sum(2^-register) where unset registers count 2^0 = 1 each
+    pair_groups = pairs // m
+    filled = np.bincount(pair_groups, minlength=len(group_index))
+    inverse_sum = (m - filled) + np.bincount(pair_groups, weights=np.exp2(-registers.astype(float)),
+                                             minlength=len(group_index))
+    estimates = np.round(_estimate_from_sums(inverse_sum, m - filled, m)).astype(np.int64)
+    return pd.Series(estimates, index=group_index, name=column)
+
+
+# ============================================================================
+# Space-Saving heavy hitters (top-K by a measure such as Profit or Sales)
+# ============================================================================
+# A Space-Saving summary keeps at most `capacity` counters. Every counter
+# stores an estimate that never underestimates the true total, plus an error
+# so that (estimate - error) never overestimates it. `floor` is the most any
+# item that is NOT currently tracked could have accumulated.
+
+# Rows are fed in chunks: each chunk is summed per key (bounded by the chunk
+# size), then merged into the summary. Two summaries merge the same way, so
+# partitions or worker processes can build their own and combine them.
+
+# Space-Saving needs non-negative weights. For signed measures like Profit the
+# per-chunk net totals are clipped at zero, so everything is tracked for the
+# "positive total": the sum of an item's positive chunk totals. For Sales and
+# Quantity that is the true total. For Profit it ignores the chunks where the
+# item lost money, so it can be well above the item's net profit (an item with
+# +100 in one chunk and -80 in another has a positive total of 100, net 20).
+# The output columns are named after the positive total to make that visible.
+
+class SpaceSaving:
+    """Bounded-memory top-K tracker with per-item error bounds."""
+
+    def __init__(self, capacity=100):
+        self.capacity = capacity
+        self.counters = pd.DataFrame({'count': pd.Series(dtype=float), 'error': pd.Series(dtype=float)})
+        self.floor = 0.0
+
+    def _merge_counters(self, counters, floor):
+        # Items missing from one side may have had up to that side's floor
+        keys = self.counters.index.union(counters.index)
+        mine = self.counters.reindex(keys, fill_value=self.floor)
+        theirs = counters.reindex(keys, fill_value=floor)
+        merged = mine + theirs
+
+        # Keep the largest counters; the biggest one dropped raises the floor
+        merged = merged.sort_values('count', ascending=False, kind='stable')
+        dropped = merged['count'].iloc[self.capacity:]
+        self.floor = max(self.floor + floor, float(dropped.max()) if len(dropped) else 0.0)
+        self.counters = merged.iloc[:self.capacity]
+
+    def update(self, keys, weights=None):
+        """Adds one chunk of keys (and optional weights; each row counts 1 if omitted)."""
+        keys = pd.Series(np.asarray(keys, dtype=object))
+        weights = pd.Series(np.ones(len(keys)) if weights is None else np.asarray(weights, dtype=float))
+        chunk_totals = weights.groupby(keys.to_numpy()).sum().clip(lower=0)
+        chunk = pd.DataFrame({'count': chunk_totals, 'error': 0.0})
+        self._merge_counters(chunk, 0.0)
+        return self
+
+    def merge(self, other):
+        """Combines another summary (e.g. from another partition) into this one."""
+        self._merge_counters(other.counters, other.floor)
+        return self
+
+    def top(self, k=10):
+        """Returns the current top-k items with bounds on their positive totals.
+
+        'Positive Estimate' never undercounts and 'Positive Lower Bound' never overcounts the
+        item's positive total; 'Guaranteed' is True when the item is certainly in the top-k by it.
+        """
+        ranked = self.counters.iloc[:k]
+        # Anything outside our top-k could have at most this much
+        threshold = max(float(self.counters['count'].iloc[k]) if len(self.counters) > k else 0.0, self.floor)
+        lower = ranked['count'] - ranked['error']
+        return pd.DataFrame({
+            'Positive Estimate': ranked['count'],
+            'Error': ranked['error'],
+            'Positive Lower Bound': lower,
+            'Guaranteed': lower >= threshold,
+        })
+
+
+class HeavyHitters:
+    """Tracks top-K items for several (key column, measure) pairs from streamed chunks."""
+
+    # Default pairs: top products and customers by profit and by sales
+    DEFAULT_TRACKED = [('Product Name', 'Profit'), ('Product Name', 'Sales'),
+                       ('Customer Name', 'Profit'), ('Customer Name', 'Sales')]
+
+    def __init__(self, tracked=None, capacity=100):
+        self.tracked = list(tracked) if tracked is not None else list(self.DEFAULT_TRACKED)
+        self.summaries = {pair: SpaceSaving(capacity) for pair in self.tracked}
+
+    @property
+    def columns(self):
+        # Columns a chunk must contain (handy for usecols when reading CSV chunks)
+        return sorted({column for pair in self.tracked for column in pair})
+
+    def update(self, chunk):
+        """Feeds one DataFrame chunk to every tracked summary."""
+        for (key_column, measure), summary in self.summaries.items():
+            summary.update(chunk[key_column].to_numpy(), chunk[measure].to_numpy())
+        return self
+
+    def merge(self, other):
+        """Merges the summaries of another HeavyHitters tracking the same pairs."""
+        for pair, summary in self.summaries.items():
+            summary.merge(other.summaries[pair])
+        return self
+
+    def top(self, key_column, measure, k=10):
+        """Current top-k items of `key_column` by `measure`."""
+        return self.summaries[(key_column, measure)].top(k)
+
+
+def stream_heavy_hitters(csv_file_path, chunksize=100_000, tracked=None, capacity=100):
+    """Reads a Superstore CSV in chunks (only the needed columns) and returns its HeavyHitters."""
+    hitters = HeavyHitters(tracked=tracked, capacity=capacity)
+    reader = pd.read_csv(csv_file_path, usecols=hitters.columns, chunksize=chunksize,
+                         on_bad_lines='skip', encoding='latin-1')
+    for chunk in reader:
+        hitters.update(chunk)
+    return hitters
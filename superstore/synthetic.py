@@ -0,0 +1,454 @@
+# Synthetic Superstore data generator for scale testing
+# ============================================================================
+# The sample dataset only has ~10k rows, which is too small to reproduce
+# scaling problems. This module generates Superstore-shaped data of any size:
+# - the same 21 columns in the same order and formats as the sample CSV
+# - products, geography, customer names and all the distributions (lines per
+#   order, quantities, ship modes, segments, discounts per state, seasonality)
+#   are learned from the sample, which becomes the "reference"
+# - customers and products grow with the row count (beyond the reference
+#   ones, new customers/products get new IDs in the same formats)
+# - profit margin falls with discount, using a line fitted per Sub-Category
+# - Order IDs (CA-2016-152156), Customer IDs (CG-12520) and Product IDs
+#   (FUR-BO-10001798) keep their formats
+#
+# The data is generated in chunks. Each chunk uses its own random generator
+# seeded with (seed, chunk number), so the output is identical for the same
+# seed, row count and chunk size no matter how many worker processes run.
+#
+# Examples:
+#   df = generate(100_000, seed=42)
+#   write_synthetic('synthetic_10m.csv', 10_000_000, seed=42, workers=8)
+#   write_synthetic('synthetic_parts', 100_000_000, partitioned=True)
+# ============================================================================
+
+import collections
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from superstore.loader import CSV_FILE_PATH, load_superstore
+from superstore.tracing import traced
+
+# Column order of the original dataset
+COLUMNS = ['Row ID', 'Order ID', 'Order Date', 'Ship Date', 'Ship Mode', 'Customer ID', 'Customer Name',
+           'Segment', 'Country', 'City', 'State', 'Postal Code', 'Region', 'Product ID', 'Category',
+           'Sub-Category', 'Product Name', 'Sales', 'Quantity', 'Discount', 'Profit']
+
+FORMATS = ('csv', 'parquet')
+DEFAULT_CHUNK_ROWS = 1_000_000
+
+# Bumped whenever the same (rows, seed) produces different data, so saved files are regenerated
+GENERATOR_VERSION = '2'
+
+# New customers take (initials, 5-digit number) pairs no reference customer uses (CG-12520),
+# so there are at most 100,000 customers per pair of initials
+CUSTOMER_NUMBERS = 100_000
+
+# Synthetic product IDs start above the reference range so they never clash with it
+SYNTHETIC_PRODUCT_NUMBER = 20_000_000  # Reference products use 10000000-1xxxxxxx
+FIRST_ORDER_NUMBER = 100_000  # Order numbers have at least 6 digits (CA-2016-152156)
+
+# Golden-ratio multiplier for hashing customer/product numbers into attributes
+_HASH_MULTIPLIER = np.uint64(0x9E3779B97F4A7C15)
+
+
+def _hash(values, salt):
+    # Deterministic pseudo-random uint64 per value, independent of any chunk
+    with np.errstate(over='ignore'):
+        mixed = (values.astype(np.uint64) + np.uint64(salt)) * _HASH_MULTIPLIER
+    return mixed ^ (mixed >> np.uint64(29))
+
+
+def _names_by_letter(names):
+    # Names grouped by their (upper-case A-Z) first letter: {letter: array of names}
+    letters = np.array([name[:1] for name in names])
+    return {letter: names[letters == letter] for letter in np.unique(letters)
+            if len(letter) == 1 and 'A' <= letter <= 'Z'}
+
+
+def _unused_numbers(used, k):
+    # The k-th (0-based) numbers not in the sorted array `used`
+    return k + np.searchsorted(used - np.arange(len(used)), k, side='right')
+
+
+def _distribution(series):
+    # Empirical distribution of a column: (values, probabilities)
+    counts = series.value_counts(sort=False).sort_index()
+    return counts.index.to_numpy(), (counts / counts.sum()).to_numpy()
+
+
+# ============================================================================
+# Reference profile learned from the sample dataset
+# ============================================================================
+
+class SyntheticProfile:
+    """Everything the generator learns from the reference data, small enough to send to workers."""
+
+    def __init__(self, reference):
+        reference = reference.dropna(subset=['Order ID', 'Customer ID', 'Product ID'])
+        self.reference_rows = len(reference)
+        order_dates = pd.to_datetime(reference['Order Date'], format='%m/%d/%Y')
+        ship_dates = pd.to_datetime(reference['Ship Date'], format='%m/%d/%Y')
+
+        # Order structure
+        self.lines_per_order = _distribution(reference.groupby('Order ID').size())
+        self.order_prefixes = _distribution(reference['Order ID'].str[:2])
+        self.quantities = _distribution(reference['Quantity'])
+
+        # Seasonality: weight of each calendar month, order days spread evenly within a month
+        months = order_dates.dt.to_period('M')
+        month_values, month_weights = _distribution(months)
+        self.month_starts = np.array([m.start_time.to_datetime64() for m in month_values]).astype('datetime64[D]')
+        self.month_lengths = np.array([m.days_in_month for m in month_values])
+        self.month_weights = month_weights
+
+        # Ship mode and the ship delay range seen for each mode
+        self.ship_modes = _distribution(reference['Ship Mode'])
+        delays = (ship_dates - order_dates).dt.days.groupby(reference['Ship Mode'])
+        self.ship_delay_min = delays.min().reindex(self.ship_modes[0]).to_numpy()
+        self.ship_delay_max = delays.max().reindex(self.ship_modes[0]).to_numpy()
+
+        # Customers from the reference, plus name parts and segment mix for new customers
+        customers = reference.drop_duplicates('Customer ID')
+        self.customer_ids = customers['Customer ID'].to_numpy()
+        self.customer_names = customers['Customer Name'].to_numpy()
+        self.customer_segments = customers['Segment'].to_numpy()
+        name_parts = customers['Customer Name'].str.split()
+        self.first_names = np.unique(name_parts.str[0].to_numpy().astype(str))
+        self.last_names = np.unique(name_parts.str[-1].to_numpy().astype(str))
+        self.segments = _distribution(customers['Segment'])
+
+        # New customers' initials: every (first name letter, last name letter) pair, with the
+        # names for each letter and the 5-digit numbers the reference already uses per pair
+        self.first_names_by_letter = _names_by_letter(self.first_names)
+        self.last_names_by_letter = _names_by_letter(self.last_names)
+        self.initials = np.array([first + last for first in sorted(self.first_names_by_letter)
+                                  for last in sorted(self.last_names_by_letter)])
+        well_formed = customers['Customer ID'].str.fullmatch(r'[A-Z]{2}-\d{5}', na=False)
+        reference_ids = customers.loc[well_formed, 'Customer ID']
+        used = pd.Series(reference_ids.str[3:].astype(int).to_numpy(), index=reference_ids.str[:2].to_numpy())
+        self.used_customer_numbers = {pair: np.unique(used.loc[[pair]].to_numpy()) if pair in used.index
+                                      else np.zeros(0, dtype=int) for pair in self.initials}
+
+        # Geography: each (City, State, Postal Code, Region) weighted by how often it appears
+        geography = reference.groupby(['City', 'State', 'Postal Code', 'Region']).size().reset_index(name='Rows')
+        self.cities = geography['City'].to_numpy()
+        self.states = geography['State'].to_numpy()
+        self.postal_codes = geography['Postal Code'].to_numpy()
+        self.regions = geography['Region'].to_numpy()
+        self.geography_weights = (geography['Rows'] / geography['Rows'].sum()).to_numpy()
+
+        # Discounts depend on the state, so keep the reference discounts grouped by state
+        state_codes, self.state_names = pd.factorize(geography['State'], sort=True)
+        self.geography_state = state_codes
+        by_state = reference.sort_values('State', kind='stable')
+        self.state_discounts = by_state['Discount'].to_numpy()
+        state_counts = by_state['State'].value_counts().reindex(self.state_names).to_numpy()
+        self.state_discount_starts = np.concatenate([[0], np.cumsum(state_counts)[:-1]])
+        self.state_discount_counts = state_counts
+
+        # Product catalogue with a unit list price (sales before discount, per item)
+        products = reference.assign(
+            **{'Unit Price': reference['Sales'] / (reference['Quantity'] * (1 - reference['Discount']))}
+        ).groupby('Product ID', sort=True).agg(
+            **{'Category': ('Category', 'first'), 'Sub-Category': ('Sub-Category', 'first'),
+               'Product Name': ('Product Name', 'first'), 'Unit Price': ('Unit Price', 'median')}
+        ).reset_index()
+        self.product_ids = products['Product ID'].to_numpy()
+        self.product_categories = products['Category'].to_numpy()
+        self.product_names = products['Product Name'].to_numpy()
+        subcategory_codes, self.subcategories = pd.factorize(products['Sub-Category'], sort=True)
+        self.product_subcategory = subcategory_codes
+        self.unit_prices = products['Unit Price'].round(3).to_numpy()
+
+        # Profit margin = intercept + slope * discount + noise, fitted per Sub-Category
+        margin = reference['Profit'] / reference['Sales']
+        self.margin_intercept = np.zeros(len(self.subcategories))
+        self.margin_slope = np.zeros(len(self.subcategories))
+        self.margin_noise = np.zeros(len(self.subcategories))
+        for code, name in enumerate(self.subcategories):
+            rows = reference['Sub-Category'] == name
+            discount, values = reference.loc[rows, 'Discount'].to_numpy(), margin[rows].to_numpy()
+            if np.unique(discount).size > 1:
+                slope, intercept = np.polyfit(discount, values, 1)
+            else:
+                slope, intercept = 0.0, values.mean()
+            self.margin_slope[code] = slope
+            self.margin_intercept[code] = intercept
+            self.margin_noise[code] = np.std(values - (intercept + slope * discount))
+        self.margin_range = (margin.min(), margin.max())
+
+    @classmethod
+    def from_csv(cls, csv_file_path=CSV_FILE_PATH):
+        return cls(load_superstore(csv_file_path))
+
+    def cardinalities(self, rows):
+        """Number of customers and products for a dataset of `rows` rows.
+
+        Customers grow in proportion to the rows (each keeps the reference's
+        orders per customer), products grow with the square root.
+        """
+        scale = rows / self.reference_rows
+        customers = max(len(self.customer_ids), int(round(len(self.customer_ids) * scale)))
+        products = max(len(self.product_ids), int(round(len(self.product_ids) * np.sqrt(scale))))
+        if customers > self.max_customers:
+            raise ValueError(f"{rows} rows need {customers} customers, but only {self.max_customers} "
+                             f"fit the AA-12345 Customer ID format")
+        return customers, products
+
+    @property
+    def max_customers(self):
+        """Most customers with well-formed IDs (new customers are dealt round-robin over the initials)."""
+        free = min(CUSTOMER_NUMBERS - len(used) for used in self.used_customer_numbers.values())
+        return len(self.customer_ids) + free * len(self.initials)
+
+
+# ============================================================================
+# Generating one chunk
+# ============================================================================
+
+def _customers(profile, numbers):
+    # (Customer ID, Customer Name, Segment) for customer numbers; new customers are hashed from their number
+    reference_count = len(profile.customer_ids)
+    unique_numbers, inverse = np.unique(numbers, return_inverse=True)
+    ids = np.empty(len(unique_numbers), dtype=object)
+    names = np.empty(len(unique_numbers), dtype=object)
+    segments = np.empty(len(unique_numbers), dtype=object)
+
+    known = unique_numbers < reference_count
+    ids[known] = profile.customer_ids[unique_numbers[known]]
+    names[known] = profile.customer_names[unique_numbers[known]]
+    segments[known] = profile.customer_segments[unique_numbers[known]]
+
+    new = unique_numbers[~known]
+    if len(new):
+        # New customer j gets initials j % (number of pairs) and that pair's (j // pairs)-th unused number
+        position = new - reference_count
+        pair_codes, ranks = position % len(profile.initials), position // len(profile.initials)
+        new_ids = np.empty(len(new), dtype=object)
+        new_names = np.empty(len(new), dtype=object)
+        for code in np.unique(pair_codes):
+            rows = pair_codes == code
+            pair = profile.initials[code]
+            numbers = _unused_numbers(profile.used_customer_numbers[pair], ranks[rows])
+            if numbers.max() >= CUSTOMER_NUMBERS:
+                raise ValueError(f"No 5-digit Customer ID left for initials {pair}")
+            firsts = profile.first_names_by_letter[pair[0]]
+            lasts = profile.last_names_by_letter[pair[1]]
+            firsts = firsts[_hash(new[rows], 1) % np.uint64(len(firsts))]
+            lasts = lasts[_hash(new[rows], 2) % np.uint64(len(lasts))]
+            new_ids[rows] = np.char.add(f'{pair}-', np.char.zfill(numbers.astype(str), 5))
+            new_names[rows] = np.char.add(np.char.add(firsts, ' '), lasts)
+        segment_draw = (_hash(new, 3) % np.uint64(1_000_000)) / 1_000_000
+        segment_codes = np.searchsorted(np.cumsum(profile.segments[1]), segment_draw, side='right')
+        segment_codes = np.minimum(segment_codes, len(profile.segments[0]) - 1)
+        ids[~known] = new_ids
+        names[~known] = new_names
+        segments[~known] = profile.segments[0][segment_codes]
+
+    return ids[inverse], names[inverse], segments[inverse]
+
+
+def _products(profile, numbers):
+    # Product columns for product numbers; numbers past the catalogue are variants of a reference product
+    reference_count = len(profile.product_ids)
+    unique_numbers, inverse = np.unique(numbers, return_inverse=True)
+    base = unique_numbers % reference_count
+    variant = unique_numbers // reference_count
+
+    ids = profile.product_ids[base].astype(str)
+    names = profile.product_names[base].astype(str)
+    new = variant > 0
+    if new.any():
+        # Keep the category prefix (e.g. FUR-BO-) and give the variant a new 8+ digit number
+        prefixes = np.char.ljust(ids[new], 7).astype('<U7')
+        ids = ids.astype(object)
+        names = names.astype(object)
+        ids[new] = np.char.add(prefixes, (unique_numbers[new] + SYNTHETIC_PRODUCT_NUMBER).astype(str))
+        names[new] = np.char.add(np.char.add(profile.product_names[base[new]].astype(str), ' Series '),
+                                 (variant[new] + 1).astype(str))
+
+    subcategory = profile.product_subcategory[base]
+    return {
+        'Product ID': ids[inverse],
+        'Category': profile.product_categories[base][inverse],
+        'Sub-Category': profile.subcategories.to_numpy()[subcategory][inverse],
+        'Product Name': names[inverse],
+        'unit_price': profile.unit_prices[base][inverse],
+        'subcategory': subcategory[inverse],
+    }
+
+
+def _format_dates(days):
+    # datetime64[D] -> 'm/d/YYYY' strings like the sample (formatted once per distinct day)
+    unique_days, inverse = np.unique(days, return_inverse=True)
+    text = np.array([f"{d.month}/{d.day}/{d.year}" for d in unique_days.astype(object)], dtype=object)
+    return text[inverse]
+
+
+def generate_chunk(profile, chunk_index, start_row, rows, seed=0, customers=None, products=None):
+    """Generates `rows` rows starting at global row `start_row`, reproducibly for (seed, chunk_index)."""
+    rng = np.random.default_rng([seed, chunk_index])
+    if customers is None or products is None:
+        customers, products = profile.cardinalities(rows)
+
+    # Orders: draw line counts until the chunk is full, trimming the last order
+    lines = rng.choice(profile.lines_per_order[0], size=rows, p=profile.lines_per_order[1])
+    order_count = int(np.searchsorted(np.cumsum(lines), rows)) + 1
+    lines = lines[:order_count]
+    lines[-1] -= lines.sum() - rows
+    line_order = np.repeat(np.arange(order_count), lines)
+
+    # One value per order, then repeated onto its lines
+    month = rng.choice(len(profile.month_starts), size=order_count, p=profile.month_weights)
+    order_days = profile.month_starts[month] + (rng.random(order_count) * profile.month_lengths[month]).astype(int)
+    ship_mode = rng.choice(len(profile.ship_modes[0]), size=order_count, p=profile.ship_modes[1])
+    ship_days = order_days + rng.integers(profile.ship_delay_min[ship_mode], profile.ship_delay_max[ship_mode] + 1)
+    prefix = rng.choice(profile.order_prefixes[0], size=order_count, p=profile.order_prefixes[1])
+    customer = rng.integers(0, customers, size=order_count)
+    geography = rng.choice(len(profile.cities), size=order_count, p=profile.geography_weights)
+
+    # Order numbers are unique across chunks: each chunk owns a block of `rows` numbers
+    order_numbers = FIRST_ORDER_NUMBER + start_row + np.arange(order_count)
+    years = order_days.astype('datetime64[Y]').astype(int) + 1970
+    order_ids = np.char.add(np.char.add(np.char.add(prefix.astype(str), '-'), years.astype(str)),
+                            np.char.add('-', order_numbers.astype(str))).astype(object)
+
+    # Line items: product, quantity, discount from the state's reference discounts
+    product = _products(profile, rng.integers(0, products, size=rows))
+    quantity = rng.choice(profile.quantities[0], size=rows, p=profile.quantities[1])
+    state = profile.geography_state[geography][line_order]
+    pick = (rng.random(rows) * profile.state_discount_counts[state]).astype(np.int64)
+    discount = profile.state_discounts[profile.state_discount_starts[state] + pick]
+
+    # Sales from list price; profit margin drops with discount (fitted per Sub-Category)
+    sales = np.round(product['unit_price'] * quantity * (1 - discount), 3)
+    code = product['subcategory']
+    margin = (profile.margin_intercept[code] + profile.margin_slope[code] * discount
+              + rng.normal(0, 1, rows) * profile.margin_noise[code])
+    profit = np.round(sales * np.clip(margin, *profile.margin_range), 4)
+
+    customer_ids, customer_names, segments = _customers(profile, customer)
+    geography_rows = geography[line_order]
+    return pd.DataFrame({
+        'Row ID': np.arange(start_row + 1, start_row + rows + 1),
+        'Order ID': order_ids[line_order],
+        'Order Date': _format_dates(order_days)[line_order],
+        'Ship Date': _format_dates(ship_days)[line_order],
+        'Ship Mode': profile.ship_modes[0][ship_mode][line_order],
+        'Customer ID': customer_ids[line_order],
+        'Customer Name': customer_names[line_order],
+        'Segment': segments[line_order],
+        'Country': 'United States',
+        'City': profile.cities[geography_rows],
+        'State': profile.states[geography_rows],
+        'Postal Code': profile.postal_codes[geography_rows],
+        'Region': profile.regions[geography_rows],
+        'Product ID': product['Product ID'],
+        'Category': product['Category'],
+        'Sub-Category': product['Sub-Category'],
+        'Product Name': product['Product Name'],
+        'Sales': sales,
+        'Quantity': quantity,
+        'Discount': discount,
+        'Profit': profit,
+    }, columns=COLUMNS)
+
+
+def _chunks(rows, chunk_rows):
+    # (chunk index, first row, row count) for every chunk
+    return [(index, start, min(chunk_rows, rows - start))
+            for index, start in enumerate(range(0, rows, chunk_rows))]
+
+
+@traced(category='generate')
+def generate(rows, seed=0, chunk_rows=DEFAULT_CHUNK_ROWS, profile=None):
+    """Generates a synthetic dataset in memory (use write_synthetic for large sizes)."""
+    profile = profile or SyntheticProfile.from_csv()
+    customers, products = profile.cardinalities(rows)
+    chunks = [generate_chunk(profile, index, start, count, seed, customers, products)
+              for index, start, count in _chunks(rows, chunk_rows)]
+    return pd.concat(chunks, ignore_index=True) if chunks else pd.DataFrame(columns=COLUMNS)
+
+
+# ============================================================================
+# Streaming to files in parallel
+# ============================================================================
+
+def _temporary_path(path):
+    # Written first, then renamed, so an interrupted run never leaves a short file under the real name.
+    # The name does not end in .csv / .parquet, so partition globs skip it.
+    return f"{path}.{os.getpid()}.tmp"
+
+
+def _write_part(profile, index, start, count, seed, customers, products, path, file_format):
+    # Worker: generate one chunk and write it as its own partition file
+    chunk = generate_chunk(profile, index, start, count, seed, customers, products)
+    temporary = _temporary_path(path)
+    if file_format == 'parquet':
+        chunk.to_parquet(temporary, index=False)
+    else:
+        # Same encoding as the single-file output, which the loader reads back as latin-1
+        chunk.to_csv(temporary, index=False, encoding='latin-1', errors='replace')
+    os.replace(temporary, path)
+    return count
+
+
+def _csv_text(profile, index, start, count, seed, customers, products):
+    # Worker: generate one chunk as CSV text (header only on the first chunk)
+    chunk = generate_chunk(profile, index, start, count, seed, customers, products)
+    return chunk.to_csv(index=False, header=(index == 0))
+
+
+@traced(category='generate')
+def write_synthetic(path, rows, seed=0, file_format='csv', partitioned=False, workers=None,
+                    chunk_rows=DEFAULT_CHUNK_ROWS, profile=None):
+    """Generates `rows` rows in parallel chunks and streams them to disk.
+
+    With `partitioned=False` the chunks are appended in order to one CSV file.
+    With `partitioned=True`, `path` is a folder and every chunk becomes its own
+    part-NNNNN.csv / .parquet file (Parquet is always partitioned and needs pyarrow).
+    Every file is written under a temporary name and renamed when complete.
+    Returns the list of files written.
+    """
+    if file_format not in FORMATS:
+        raise ValueError(f"Unknown format '{file_format}', choose from {FORMATS}")
+    if file_format == 'parquet':
+        partitioned = True
+
+    profile = profile or SyntheticProfile.from_csv()
+    customers, products = profile.cardinalities(rows)
+    chunks = _chunks(rows, chunk_rows)
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        if partitioned:
+            os.makedirs(path, exist_ok=True)
+            paths = [os.path.join(path, f"part-{index:05d}.{file_format}") for index, _, _ in chunks]
+            futures = [pool.submit(_write_part, profile, index, start, count, seed, customers, products,
+                                   part_path, file_format)
+                       for (index, start, count), part_path in zip(chunks, paths)]
+            for future in futures:
+                future.result()
+            return paths
+
+        # One file: keep a bounded number of chunks in flight and append them in order
+        in_flight = collections.deque()
+        max_in_flight = 2 * (workers or os.cpu_count() or 1)
+        temporary = _temporary_path(path)
+        try:
+            with open(temporary, 'w', encoding='latin-1', errors='replace', newline='') as file:
+                for index, start, count in chunks:
+                    in_flight.append(pool.submit(_csv_text, profile, index, start, count, seed, customers,
+                                                 products))
+                    if len(in_flight) >= max_in_flight:
+                        file.write(in_flight.popleft().result())
+                while in_flight:
+                    file.write(in_flight.popleft().result())
+        except BaseException:
+            os.remove(temporary)
+            raise
+        os.replace(temporary, path)
+        return [path]
@@ -0,0 +1,217 @@
+# Time-series engine for the Superstore dataset
+# ============================================================================
+# This module turns the order rows into "period tables" (one row per period,
+# one column per group such as Category, Region or Segment) and then computes
+# growth rates, rolling windows and seasonal comparisons on them.
+
+# Every calculation works on the whole NumPy array at once, so all periods and
+# all groups are handled together without looping over months in Python.
+# Divisions are done safely: when the previous period is zero the growth rate
+# is returned as NaN instead of raising an error or showing infinity.
+# ============================================================================
+
+import numpy as np
+import pandas as pd
+
+from superstore.dates import parse_dates
+
+# Pandas period codes for the supported time granularities
+FREQUENCIES = {'daily': 'D', 'weekly': 'W', 'monthly': 'M', 'quarterly': 'Q'}
+
+# How many periods make up one year (used for year-over-year comparisons).
+# Daily tables are compared by calendar date instead (see _last_year), so leap
+# days do not shift the comparison; weekly ones compare with 52 weeks earlier,
+# the same weekday, which drifts by a day or two per year.
+PERIODS_PER_YEAR = {'D': 365, 'W': 52, 'M': 12, 'Q': 4}
+
+
+def _freq_code(freq):
+    # Accept either a friendly name ('monthly') or a pandas code ('M')
+    return FREQUENCIES.get(freq, freq)
+
+
+def _periods_per_year(table):
+    # The period index knows its own frequency, e.g. 'M' or 'W-SUN'
+    code = table.index.freqstr.split('-')[0]
+    if code not in PERIODS_PER_YEAR:
+        raise ValueError(f"Year-over-year comparison is not supported for frequency '{code}'")
+    return PERIODS_PER_YEAR[code]
+
+
+# ============================================================================
+# Building period tables
+# ============================================================================
+
+def period_table(dataframe, by='Category', value='Profit', freq='monthly', date_column='Order Date'):
+    """Builds a wide table of summed values with one row per period and one column per group."""
+    freq = _freq_code(freq)
+    dates = parse_dates(dataframe[date_column])
+    periods = dates.dt.to_period(freq)
+    if periods.isna().all():
+        # No dated rows (e.g. a filter that matches nothing): an empty table instead of a NaT range
+        return pd.DataFrame(index=pd.PeriodIndex([], freq=freq, name='Period'))
+
+    # One grouped pass over the rows, then spread the groups out into columns
+    group_columns = [by] if isinstance(by, str) else list(by)
+    totals = dataframe.groupby([periods] + [dataframe[c] for c in group_columns])[value].sum()
+    table = totals.unstack(group_columns, fill_value=0)
+
+    # Reindex onto the full calendar so a missing month counts as zero instead of
+    # silently shifting every later comparison by one position
+    full_range = pd.period_range(periods.min(), periods.max(), freq=freq)
+    table = table.reindex(full_range, fill_value=0)
+    table.index.name = 'Period'
+    return table
+
+
+# ============================================================================
+# Vectorised array helpers
+# ============================================================================
+
+def safe_growth(current, previous):
+    """Returns percentage growth from previous to current, NaN wherever previous is zero."""
+    current = np.asarray(current, dtype=float)
+    previous = np.asarray(previous, dtype=float)
+    growth = np.full(np.broadcast(current, previous).shape, np.nan)
+    # Only divide where the base is non-zero (same idea as the profit ratio in Task 2)
+    np.divide(current - previous, previous, out=growth, where=previous != 0)
+    return growth * 100
+
+
+def _shift(values, lag):
+    # Move every row down by `lag` periods, padding the top with NaN
+    if lag < 0:
+        raise ValueError(f"lag must not be negative (got {lag})")
+    if lag == 0:
+        return np.array(values, dtype=float)  # values[:-0] would be empty
+    shifted = np.full(values.shape, np.nan)
+    if lag < len(values):
+        shifted[lag:] = values[:-lag]
+    return shifted
+
+
+def _last_year(table, values):
+    # The values of the same period one year earlier (NaN before the table starts)
+    if not table.index.freqstr.startswith('D'):
+        return _shift(values, _periods_per_year(table))
+    # Daily: the same calendar date a year earlier (29 February compares with 28 February)
+    year_ago = (table.index.to_timestamp() - pd.DateOffset(years=1)).to_period('D')
+    positions = table.index.get_indexer(year_ago)
+    shifted = np.full(values.shape, np.nan)
+    found = positions >= 0
+    shifted[found] = values[positions[found]]
+    return shifted
+
+
+def _as_table(values, like):
+    # Wrap a NumPy result back up with the same periods and groups
+    return pd.DataFrame(values, index=like.index, columns=like.columns)
+
+
+# ============================================================================
+# Growth rates
+# ============================================================================
+
+def growth_rate(table, lag=1):
+    """Calculates percentage growth against the value `lag` periods earlier for every period and group."""
+    values = table.to_numpy(dtype=float)
+    return _as_table(safe_growth(values, _shift(values, lag)), table)
+
+
+def mom_growth(table):
+    """Period-over-period growth (month-over-month on a monthly table)."""
+    return growth_rate(table, lag=1)
+
+
+def yoy_growth(table):
+    """Year-over-year growth, comparing each period with the same period one year earlier."""
+    values = table.to_numpy(dtype=float)
+    return _as_table(safe_growth(values, _last_year(table, values)), table)
+
+
+# ============================================================================
+# Rolling windows
+# ============================================================================
+
+def rolling_sum(table, window=3):
+    """Rolling sum over the last `window` periods using a cumulative sum (no per-window loop)."""
+    if window < 1:
+        raise ValueError(f"window must be at least 1 (got {window})")
+    values = table.to_numpy(dtype=float)
+    cumulative = np.cumsum(values, axis=0)
+    result = cumulative.copy()
+    # Sum of a window = cumulative total now minus cumulative total `window` periods ago
+    result[window:] = cumulative[window:] - cumulative[:-window]
+    # Windows that do not have enough history yet are left empty
+    result[:window - 1] = np.nan
+    return _as_table(result, table)
+
+
+def rolling_mean(table, window=3):
+    """Rolling average over the last `window` periods."""
+    return rolling_sum(table, window) / window
+
+
+# ============================================================================
+# Seasonality
+# ============================================================================
+
+def seasonal_comparison(table):
+    """Lines up every period with the same period last year and reports the change.
+
+    Returns a long table with one row per period and group, ready for reports.
+    """
+    values = table.to_numpy(dtype=float)
+    last_year = _last_year(table, values)
+
+    comparison = pd.DataFrame({
+        'Value': values.ravel(),
+        'Same Period Last Year': last_year.ravel(),
+        'Change': (values - last_year).ravel(),
+        'YoY Growth (%)': safe_growth(values, last_year).ravel(),
+    }, index=pd.MultiIndex.from_product([table.index, table.columns],
+                                        names=[table.index.name] + list(table.columns.names)))
+    return comparison
+
+
+def seasonal_index(table):
+    """Average value for each period of the year divided by the overall average (1.0 = a normal period)."""
+    if table.index.freqstr.startswith('M'):
+        position = table.index.month
+    elif table.index.freqstr.startswith('Q'):
+        position = table.index.quarter
+    elif table.index.freqstr.startswith('W'):
+        position = table.index.week
+    else:
+        position = table.index.dayofyear
+
+    seasonal_mean = table.groupby(position).mean()
+    overall_mean = table.to_numpy(dtype=float).mean(axis=0)
+    index_values = np.full(seasonal_mean.shape, np.nan)
+    np.divide(seasonal_mean.to_numpy(dtype=float), overall_mean, out=index_values, where=overall_mean != 0)
+    result = pd.DataFrame(index_values, index=seasonal_mean.index, columns=table.columns)
+    result.index.name = 'Period of Year'
+    return result
+
+
+# ============================================================================
+# All-in-one report
+# ============================================================================
+
+def time_series_summary(dataframe, by='Category', value='Profit', freq='monthly', window=3,
+                        date_column='Order Date'):
+    """Builds the period table and every derived series in one go.
+
+    Returns a dictionary of tables that share the same periods and groups.
+    """
+    table = period_table(dataframe, by=by, value=value, freq=freq, date_column=date_column)
+    summary = {
+        'values': table,
+        'mom_growth': mom_growth(table),
+        f'rolling_sum_{window}': rolling_sum(table, window),
+        f'rolling_mean_{window}': rolling_mean(table, window),
+    }
+    # Year-over-year only makes sense when there is more than one year of data
+    if len(table) > _periods_per_year(table):
+        summary['yoy_growth'] = yoy_growth(table)
+    return summary
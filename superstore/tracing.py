@@ -0,0 +1,212 @@
+# Per-stage timing and memory instrumentation
+# ============================================================================
+# Functions decorated with @traced record a "span" every time they run:
+# - wall time (time.perf_counter) and CPU time (time.thread_time)
+# - peak memory allocated during the call (tracemalloc, optional)
+# - rows in (length of the first DataFrame/Series argument) and rows out
+#
+# Tracing is off by default. When off, a traced function only pays for one
+# boolean check before calling straight through, so the overhead is near zero.
+#
+# Turn it on with enable() (or the environment variable SUPERSTORE_TRACE=1),
+# then export the spans with export_json() or export_chrome_trace(). The
+# Chrome trace can be opened in chrome://tracing or https://ui.perfetto.dev.
+#
+# Note: tracemalloc measures the whole process, so peak memory is most
+# accurate when traced stages do not run at the same time on several threads.
+# ============================================================================
+
+import functools
+import json
+import os
+import threading
+import time
+import tracemalloc
+
+import pandas as pd
+
+_enabled = False
+_track_memory = False
+_spans = []
+_spans_lock = threading.Lock()
+_local = threading.local()  # Per-thread stack of open spans
+_origin = time.perf_counter()  # Trace timestamps are relative to this moment
+
+
+def enable(memory=True):
+    """Starts recording spans (and peak memory with tracemalloc if `memory` is True)."""
+    global _enabled, _track_memory
+    _track_memory = memory
+    if memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+    _enabled = True
+
+
+def disable():
+    """Stops recording spans (already recorded spans are kept)."""
+    global _enabled
+    _enabled = False
+    if _track_memory and tracemalloc.is_tracing():
+        tracemalloc.stop()
+
+
+def is_enabled():
+    return _enabled
+
+
+def reset():
+    """Forgets every recorded span."""
+    with _spans_lock:
+        _spans.clear()
+
+
+def spans():
+    """A copy of the recorded spans (one dictionary per call)."""
+    with _spans_lock:
+        return list(_spans)
+
+
+def _row_count(value):
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return len(value)
+    if isinstance(value, tuple) and value and isinstance(value[0], (pd.DataFrame, pd.Series)):
+        return len(value[0])  # e.g. (pivot_profit, pivot_aov)
+    return None
+
+
+# ============================================================================
+# Recording spans
+# ============================================================================
+
+class span:
+    """Context manager that records one span; also used by the @traced decorator."""
+
+    def __init__(self, name, category='stage', rows_in=None):
+        self.name = name
+        self.category = category
+        self.rows_in = rows_in
+        self.rows_out = None
+
+    def __enter__(self):
+        if not _enabled:
+            return self
+        stack = getattr(_local, 'stack', None)
+        if stack is None:
+            stack = _local.stack = []
+
+        self._memory = _track_memory and tracemalloc.is_tracing()
+        if self._memory:
+            # Hand the peak so far to the enclosing span, then measure this span from zero
+            current, peak = tracemalloc.get_traced_memory()
+            if stack:
+                stack[-1]._max_memory = max(stack[-1]._max_memory, peak)
+            tracemalloc.reset_peak()
+            self._start_memory = current
+            self._max_memory = current
+        stack.append(self)
+        self._start_wall = time.perf_counter()
+        self._start_cpu = time.thread_time()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        if not hasattr(self, '_start_wall'):
+            return False  # Tracing was off when the span started
+        wall = time.perf_counter() - self._start_wall
+        cpu = time.thread_time() - self._start_cpu
+        stack = _local.stack
+        stack.pop()
+
+        peak_bytes = None
+        if self._memory and tracemalloc.is_tracing():
+            current, peak = tracemalloc.get_traced_memory()
+            self._max_memory = max(self._max_memory, peak)
+            peak_bytes = self._max_memory - self._start_memory
+            if stack:
+                stack[-1]._max_memory = max(stack[-1]._max_memory, self._max_memory)
+            tracemalloc.reset_peak()
+
+        record = {
+            'name': self.name,
+            'category': self.category,
+            'start_s': self._start_wall - _origin,
+            'wall_s': wall,
+            'cpu_s': cpu,
+            'peak_memory_bytes': peak_bytes,
+            'rows_in': self.rows_in,
+            'rows_out': self.rows_out,
+            'thread': threading.get_ident(),
+            'depth': len(stack),
+            'error': exc_type.__name__ if exc_type else None,
+        }
+        with _spans_lock:
+            _spans.append(record)
+        return False
+
+
+def traced(name=None, category='stage'):
+    """Decorator that records a span for every call while tracing is enabled."""
+    def decorate(function):
+        span_name = name or function.__name__
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return function(*args, **kwargs)  # Fast path when tracing is off
+            rows_in = _row_count(args[0]) if args else None
+            with span(span_name, category, rows_in) as current:
+                result = function(*args, **kwargs)
+                current.rows_out = _row_count(result)
+            return result
+
+        return wrapper
+    return decorate
+
+
+# ============================================================================
+# Exporting
+# ============================================================================
+
+def summary():
+    """Totals per span name: calls, wall/CPU seconds, largest peak memory and rows."""
+    table = pd.DataFrame(spans())
+    if table.empty:
+        return table
+    return table.groupby(['category', 'name']).agg(
+        calls=pd.NamedAgg(column='wall_s', aggfunc='count'),
+        wall_s=pd.NamedAgg(column='wall_s', aggfunc='sum'),
+        cpu_s=pd.NamedAgg(column='cpu_s', aggfunc='sum'),
+        peak_memory_mb=pd.NamedAgg(column='peak_memory_bytes', aggfunc=lambda b: b.max() / 1024**2),
+        rows_in=pd.NamedAgg(column='rows_in', aggfunc='max'),
+        rows_out=pd.NamedAgg(column='rows_out', aggfunc='max'),
+    ).sort_values('wall_s', ascending=False)
+
+
+def export_json(path):
+    """Writes every recorded span to a JSON file."""
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump({'spans': spans()}, file, indent=2)
+    return path
+
+
+def export_chrome_trace(path):
+    """Writes the spans in Chrome Trace Event format (open in chrome://tracing or Perfetto)."""
+    events = []
+    for record in spans():
+        events.append({
+            'name': record['name'],
+            'cat': record['category'],
+            'ph': 'X',  # Complete event: start timestamp plus duration
+            'ts': record['start_s'] * 1e6,  # Microseconds
+            'dur': record['wall_s'] * 1e6,
+            'pid': os.getpid(),
+            'tid': record['thread'],
+            'args': {key: record[key] for key in ('cpu_s', 'peak_memory_bytes', 'rows_in', 'rows_out', 'error')},
+        })
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, file)
+    return path
+
+
+# Allow switching tracing on without code changes
+if os.environ.get('SUPERSTORE_TRACE') == '1':
+    enable()
@@ -0,0 +1,22 @@
+# Shared fixtures: the sample dataset, raw (as read from the CSV) and prepared
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from superstore.loader import load_superstore, prepare_dataset  # noqa: E402
+
+SAMPLE_CSV = os.path.join(ROOT, 'Sample - Superstore.csv')
+
+
+@pytest.fixture(scope='session')
+def raw():
+    return load_superstore(SAMPLE_CSV)
+
+
+@pytest.fixture(scope='session')
+def prepared(raw):
+    return prepare_dataset(raw.copy())
@@ -0,0 +1,101 @@
+import os
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from superstore import backends
+from superstore.backends import BACKENDS, ParallelBackend, check_backends, compare_backends, get_backend
+
+
+def test_standard_checks_agree(prepared):
+    assert check_backends(prepared) > 0
+
+
+def test_parallel_backend_above_threshold(prepared):
+    backend = get_backend('parallel')
+    threshold, backend.threshold = backend.threshold, 0
+    try:
+        check_backends(prepared, backends=['parallel'])
+    finally:
+        backend.threshold = threshold
+
+
+def test_parallel_backend_close(prepared):
+    backend = ParallelBackend(workers=2, threshold=0)
+    expected = backend.groupby_agg(prepared, ['Region'], {'Sales': ('Sales', 'sum')})
+    pool = backend._pool
+    assert pool is not None
+    backend.close()
+    assert backend._pool is None
+    with pytest.raises(RuntimeError):
+        pool.submit(int)
+    # A later group-by starts a new pool
+    pd.testing.assert_frame_equal(backend.groupby_agg(prepared, ['Region'], {'Sales': ('Sales', 'sum')}), expected)
+    backend.close()
+
+
+@pytest.mark.parametrize('low, high', [('2016-01-01', None), (None, '2015-06-30'), ('2016-03-01', '2016-03-31')])
+def test_one_sided_date_ranges(prepared, low, high):
+    low = None if low is None else pd.Timestamp(low)
+    high = None if high is None else pd.Timestamp(high)
+    dates = prepared['Order Date']
+    expected = prepared[(dates >= (low or dates.min())) & (dates <= (high or dates.max()))]
+    for name in BACKENDS:
+        result = get_backend(name).filter(prepared, ranges={'Order Date': (low, high)})
+        assert result.index.equals(expected.index), name
+
+
+def test_missing_keys_and_empty_selection(prepared):
+    frame = prepared.head(500).copy()
+    frame.loc[frame.index[::7], 'Region'] = None
+    frame.loc[frame.index[::11], 'Profit'] = np.nan
+    check_backends(frame)
+    compare_backends(frame, 'filter', equals={'Region': 'Nowhere'})
+    compare_backends(frame, 'filter', ranges={'Order Date': (pd.Timestamp('2030-01-01'), None)})
+
+
+def test_sqlite_shared_between_threads(prepared):
+    backend = get_backend('sqlite')
+    expected = get_backend('pandas').groupby_agg(prepared, 'Region', {'Sales': ('Sales', 'sum')})
+
+    def query(_):
+        return backend.groupby_agg(prepared, 'Region', {'Sales': ('Sales', 'sum')})
+
+    with ThreadPoolExecutor(8) as pool:
+        for result in pool.map(query, range(32)):
+            pd.testing.assert_frame_equal(expected, result, check_exact=False)
+
+
+def test_numpy_backend_with_more_key_combinations_than_int64():
+    rng = np.random.default_rng(0)
+    rows = 20_000
+    # Five keys with 20,000 values each: 20,000**5 combinations do not fit an int64
+    frame = pd.DataFrame({f"Key {k}": rng.permutation(rows).astype(str) for k in range(5)})
+    frame['Sales'] = rng.random(rows)
+    frame.loc[::9, 'Key 2'] = None
+    keys = [f"Key {k}" for k in range(5)]
+    compare_backends(frame.iloc[:3000], 'groupby_agg', keys, {'Sales': ('Sales', 'sum'), 'Lines': ('Sales', 'count')},
+                     backends=['numpy'])
+    compare_backends(frame, 'groupby_agg', keys, {'Sales': ('Sales', 'max')}, backends=['numpy'])
+
+
+def test_fallback_matches_flat_codes(prepared, monkeypatch):
+    expected = get_backend('numpy').groupby_agg(prepared, ['Category', 'Region', 'Segment'], {'Sales': ('Sales', 'sum')})
+    monkeypatch.setattr(backends, 'MAX_FLAT_GROUPS', 1)
+    check_backends(prepared, backends=['numpy'])
+    pd.testing.assert_frame_equal(
+        get_backend('numpy').groupby_agg(prepared, ['Category', 'Region', 'Segment'], {'Sales': ('Sales', 'sum')}),
+        expected)
+
+
+def test_backends_are_created_on_first_use():
+    code = ("from superstore import backends, reports; "
+            "assert backends._INSTANCES == {}, backends._INSTANCES; "
+            "backends.get_backend('sqlite'); print(sorted(backends._INSTANCES))")
+    output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True,
+                            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    assert output.stdout.split() == ["['sqlite']"]
@@ -0,0 +1,25 @@
+import pytest
+
+from superstore import cli
+
+from conftest import SAMPLE_CSV
+
+
+@pytest.mark.parametrize('options, command', [
+    (['--start', '2017-01-01'], ['rank', 'products']),
+    (['--end', '2017-01-01'], ['top-items']),
+    (['--partition', 'year=2016'], ['validate']),
+    (['--backend', 'numpy'], ['generate', '--rows', '10', '--output', 'unused.csv']),
+    (['--backend', 'pandas'], ['serve']),
+])
+def test_unused_global_options_are_errors(options, command, capsys):
+    with pytest.raises(SystemExit) as exit_info:
+        cli.main(['--csv', SAMPLE_CSV] + options + command)
+    assert exit_info.value.code == 2
+    assert 'cannot be used with the' in capsys.readouterr().err
+
+
+def test_report_commands_use_the_window(capsys):
+    cli.main(['--csv', SAMPLE_CSV, '--start', '2017-01-01', '--end', '2017-06-30', '--backend', 'numpy', 'kpi'])
+    output = capsys.readouterr().out
+    assert 'Order Date window 2017-01-01 to 2017-06-30' in output
@@ -0,0 +1,73 @@
+import numpy as np
+import pandas as pd
+
+from superstore import reports
+from superstore.dateindex import date_index, date_window, sort_by_date
+
+
+def _expected(dataframe, start, end, column='Order Date'):
+    dates = pd.to_datetime(dataframe[column], format='%m/%d/%Y')
+    keep = np.ones(len(dataframe), dtype=bool)
+    if start is not None:
+        keep &= dates >= pd.Timestamp(start)
+    if end is not None:
+        keep &= dates <= pd.Timestamp(end)
+    return dataframe[keep]
+
+
+def test_window_matches_pandas_on_prepared_frame(prepared):
+    for start, end in [('2016-01-01', '2016-12-31'), (None, '2015-03-31'), ('2017-11-01', None)]:
+        window = date_window(prepared, start, end)
+        assert window.index.equals(_expected(prepared, start, end).index)
+
+
+def test_window_on_unprepared_frame(raw):
+    frame = raw.head(200)
+    window = date_window(frame, '2016-01-01', '2016-12-31')
+    assert window.index.equals(_expected(frame, '2016-01-01', '2016-12-31').index)
+    assert date_index(frame).count(end='2015-12-31', column='Ship Date') == len(
+        _expected(frame, None, '2015-12-31', 'Ship Date'))
+
+
+def test_windowed_report_on_unprepared_frame(raw):
+    frame = raw.head(200)
+    expected = _expected(frame, '2016-01-01', '2016-12-31')
+    result = reports.kpi(frame, start='2016-01-01', end='2016-12-31')
+    assert np.isclose(result['Total Revenue'], expected['Sales'].sum())
+
+
+def test_empty_window(prepared):
+    assert len(date_window(prepared, '2030-01-01', '2030-12-31')) == 0
+
+
+def test_sort_by_date_unprepared(raw):
+    frame = sort_by_date(raw.head(300))
+    dates = pd.to_datetime(frame['Order Date'], format='%m/%d/%Y')
+    assert dates.is_monotonic_increasing
+    assert date_index(frame).is_contiguous()
+
+
+def test_index_follows_in_place_changes(raw):
+    frame = raw.copy()
+    before = date_window(frame, '2016-01-01', '2016-03-31')
+    pd.testing.assert_frame_equal(before, _expected(frame, '2016-01-01', '2016-03-31'))
+
+    # Reordered in place: the cached index would point at the old row positions
+    frame.sort_values('Profit', inplace=True)
+    pd.testing.assert_frame_equal(date_window(frame, '2016-01-01', '2016-03-31'),
+                                  _expected(frame, '2016-01-01', '2016-03-31'))
+
+    # New dates assigned to the column
+    frame['Order Date'] = frame['Ship Date']
+    pd.testing.assert_frame_equal(date_window(frame, None, '2014-01-31'), _expected(frame, None, '2014-01-31'))
+
+
+def test_prepared_index_follows_in_place_sort(prepared):
+    frame = prepared.copy()
+    index = date_index(frame)
+    assert date_index(frame) is index
+    frame.sort_values('Sales', inplace=True)
+    assert date_index(frame) is not index
+    window = date_window(frame, '2017-06-01', '2017-06-30')
+    dates = frame['Order Date']
+    pd.testing.assert_frame_equal(window, frame[(dates >= '2017-06-01') & (dates <= '2017-06-30')])
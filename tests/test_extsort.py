@@ -0,0 +1,41 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import SAMPLE_CSV
+from superstore.extsort import customer_ranking, external_sort, product_ranking
+from superstore.reports import customer_segmentation, product_profitability
+
+# Small runs, blocks and fan-in so the sample data spills and merges in several passes
+SPILL = {'run_rows': 700, 'block_rows': 64, 'fan_in': 3}
+
+
+@pytest.mark.parametrize('ascending', [True, False])
+def test_external_sort_is_stable_with_missing_values_last(ascending):
+    values = np.array([3.0, np.nan, 1.0, 3.0, 2.0, np.nan, 1.0] * 300)
+    frame = pd.DataFrame({'value': values, 'order': np.arange(len(values))})
+    chunks = (frame.iloc[start:start + 250] for start in range(0, len(frame), 250))
+    result = pd.concat(external_sort(chunks, 'value', ascending, **SPILL), ignore_index=True)
+    expected = frame.sort_values('value', ascending=ascending, kind='stable', na_position='last')
+    pd.testing.assert_frame_equal(result, expected.reset_index(drop=True))
+
+
+def test_product_ranking_matches_report(prepared):
+    ranked = pd.concat(product_ranking(SAMPLE_CSV, chunksize=1_000, **SPILL), ignore_index=True)
+    expected = product_profitability(prepared, top_n=len(prepared))
+    assert len(ranked) == len(expected)
+    assert ranked['Profit'].is_monotonic_decreasing
+    np.testing.assert_allclose(ranked['Profit'], expected['Profit'])
+    ranked = ranked.set_index('Product Name')
+    assert (ranked['Times Ordered'] == expected.loc[ranked.index, 'Times Ordered']).all()
+
+
+def test_customer_ranking_matches_report(prepared):
+    ranked = pd.concat(customer_ranking(prepared, chunksize=1_000, **SPILL), ignore_index=True)
+    expected = customer_segmentation(prepared).set_index('Customer ID')
+    ranked = ranked.set_index('Customer ID')
+    assert ranked.index.sort_values().equals(expected.index.sort_values())
+    np.testing.assert_allclose(ranked['total_spent'], expected.loc[ranked.index, 'total_spent'])
+    assert (ranked['total_orders'] == expected.loc[ranked.index, 'total_orders']).all()
+    assert (ranked['Tier'] == expected.loc[ranked.index, 'Tier']).all()
+    assert (ranked['Rank'].diff().fillna(1) >= 0).all()
@@ -0,0 +1,80 @@
+import os
+import pickle
+
+import pandas as pd
+
+from superstore import reports
+from superstore.ingest import CHECKPOINT_FILE, IncrementalStore
+
+
+def _batches(raw, count=3):
+    size = len(raw) // count + 1
+    return [raw.iloc[start:start + size] for start in range(0, len(raw), size)]
+
+
+def test_views_match_reports(raw, tmp_path):
+    store = IncrementalStore(str(tmp_path))
+    for batch in _batches(raw):
+        store.append(batch)
+    pd.testing.assert_frame_equal(store.result('category_region'), reports.category_region(raw))
+    pd.testing.assert_frame_equal(store.result('segment'), reports.segment(raw))
+    pd.testing.assert_frame_equal(store.result('subcategory'), reports.subcategory(raw))
+
+
+def test_checkpoint_without_quality(raw, tmp_path):
+    store = IncrementalStore(str(tmp_path))
+    store.append(raw.head(200))
+    # A checkpoint written before the quality checks were added
+    with open(os.path.join(str(tmp_path), CHECKPOINT_FILE), 'wb') as file:
+        pickle.dump({'batches': 1, 'views': store.views}, file)
+    reopened = IncrementalStore(str(tmp_path))
+    pd.testing.assert_frame_equal(reopened.result('category_region'), store.result('category_region'))
+    assert reopened.quality.rows == 0
+
+
+def _assert_same_views(store, other):
+    for name in store.view_names:
+        expected, actual = store.result(name), other.result(name)
+        for left, right in zip(expected if isinstance(expected, tuple) else (expected,),
+                               actual if isinstance(actual, tuple) else (actual,)):
+            pd.testing.assert_frame_equal(left, right)
+
+
+def test_checkpoint_writes_only_the_delta(raw, tmp_path):
+    directory = str(tmp_path)
+    store = IncrementalStore(directory)
+    batches = _batches(raw, 10)
+    for batch in batches[:9]:
+        store.append(batch)
+    first = store.checkpoint()
+    store.append(batches[9].head(20))
+    second = store.checkpoint()
+    # The second checkpoint holds 20 rows' worth of views, not the whole history
+    assert os.path.getsize(second) < os.path.getsize(first) / 5
+    assert store.checkpoint() is None
+
+    reopened = IncrementalStore(directory)
+    assert reopened.checkpointed == len(reopened.batches)
+    _assert_same_views(store, reopened)
+    pd.testing.assert_frame_equal(reopened.quality.results(), store.quality.results())
+
+
+def test_replay_after_checkpoint_and_compact(raw, tmp_path):
+    directory = str(tmp_path)
+    store = IncrementalStore(directory)
+    batches = _batches(raw, 4)
+    store.append(batches[0])
+    store.checkpoint()
+    store.append(batches[1])
+    store.checkpoint()
+    store.append(batches[2])  # Not checkpointed: replayed on reopening
+    reopened = IncrementalStore(directory)
+    assert reopened.checkpointed == 2
+    _assert_same_views(store, reopened)
+
+    reopened.append(batches[3])
+    reopened.compact()
+    assert sorted(os.listdir(directory)) == [f"batch-0000{i}.csv" for i in range(1, 5)] + [CHECKPOINT_FILE]
+    final = IncrementalStore(directory)
+    pd.testing.assert_frame_equal(final.result('customer_segmentation').reset_index(drop=True),
+                                  reports.customer_segmentation(raw).reset_index(drop=True))
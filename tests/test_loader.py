@@ -0,0 +1,43 @@
+import pandas as pd
+import pytest
+
+from superstore.loader import load_partitions, load_superstore
+
+
+@pytest.fixture(scope='module')
+def partitions(raw, tmp_path_factory):
+    # One CSV per order year, named like year=2016.csv
+    folder = tmp_path_factory.mktemp('partitions')
+    years = pd.to_datetime(raw['Order Date'], format='%m/%d/%Y').dt.year
+    for year, rows in raw.groupby(years):
+        rows.to_csv(folder / f'year={year}.csv', index=False, encoding='latin-1')
+    return folder, years
+
+
+def test_partitions_match_the_single_file(raw, partitions):
+    folder, years = partitions
+    whole = raw.assign(year=years).sort_values('year', kind='stable').drop(columns='year').reset_index(drop=True)
+    pd.testing.assert_frame_equal(load_superstore(str(folder)), whole, check_dtype=False)
+    pd.testing.assert_frame_equal(load_partitions(str(folder), workers=1), whole, check_dtype=False)
+
+
+def test_year_filter_prunes_files(raw, partitions):
+    folder, years = partitions
+    loaded = load_partitions(str(folder), columns=['Order ID', 'Sales'], filters={'year': [2015, 2017]})
+    assert list(loaded.columns) == ['Order ID', 'Sales']
+    assert len(loaded) == years.isin([2015, 2017]).sum()
+
+
+def test_partition_without_the_shared_columns(raw, tmp_path):
+    raw.head(10).to_csv(tmp_path / 'a.csv', index=False)
+    raw.head(10).drop(columns='Sales').to_csv(tmp_path / 'b.csv', index=False)
+    with pytest.raises(ValueError, match="does not have the shared columns: missing \\['Sales'\\]"):
+        load_partitions(str(tmp_path), workers=1)
+
+
+def test_parquet_header_comes_from_the_schema(raw, tmp_path):
+    pytest.importorskip('pyarrow')
+    raw.head(20).to_parquet(tmp_path / 'part-0.parquet')
+    raw.iloc[20:50].to_parquet(tmp_path / 'part-1.parquet')
+    loaded = load_partitions(str(tmp_path), workers=1)
+    assert list(loaded.columns) == list(raw.columns) and len(loaded) == 50
@@ -0,0 +1,58 @@
+import glob
+
+import pytest
+
+from superstore import memo
+
+
+@pytest.fixture
+def cache(tmp_path):
+    yield memo.configure(str(tmp_path))
+    memo.disable()
+
+
+def _counted():
+    calls = []
+
+    @memo.memoized()
+    def total(values):
+        calls.append(values)
+        return sum(values)
+
+    return total, calls
+
+
+def test_results_are_reused(cache):
+    total, calls = _counted()
+    assert total((1, 2, 3)) == 6 and total((1, 2, 3)) == 6
+    assert len(calls) == 1 and cache.stats()['hits'] == 1
+
+
+def test_package_source_is_part_of_the_key(cache, monkeypatch):
+    total, calls = _counted()
+    total((1, 2))
+    # An edited helper module changes the package fingerprint, so the stored result is not reused
+    monkeypatch.setattr(memo, 'source_fingerprint', lambda: 'edited')
+    total((1, 2))
+    assert len(calls) == 2
+
+
+def test_source_fingerprint_follows_file_contents(tmp_path):
+    (tmp_path / 'helpers.py').write_text('RATE = 1\n')
+    before = memo.source_fingerprint(str(tmp_path))
+    (tmp_path / 'helpers.py').write_text('RATE = 2\n')
+    memo.source_fingerprint.cache_clear()
+    assert memo.source_fingerprint(str(tmp_path)) != before
+    memo.source_fingerprint.cache_clear()
+
+
+@pytest.mark.parametrize('content', [b'', b'\x80\x05\x95', b'cno_such_module\nThing\n.'])
+def test_unloadable_entries_are_misses(cache, content):
+    total, calls = _counted()
+    total((4, 5))
+    for path in glob.glob(f"{cache.directory}/*.pkl"):
+        with open(path, 'wb') as file:
+            file.write(content)  # Empty, truncated, or pickled by a module that no longer exists
+    assert total((4, 5)) == 9
+    assert len(calls) == 2
+    assert total((4, 5)) == 9 and len(calls) == 2  # The recomputed result replaced the bad file
@@ -0,0 +1,48 @@
+import numpy as np
+import pandas as pd
+
+from superstore.orders import OrderHeaders
+
+
+def _expected(frame):
+    frame = frame.assign(Gross=frame['Sales'] / (1 - frame['Discount']))
+    return frame.groupby('Order ID').agg(Lines=('Sales', 'size'), Units=('Quantity', 'sum'), Sales=('Sales', 'sum'),
+                                         Gross=('Gross', 'sum'), Profit=('Profit', 'sum'))
+
+
+def test_totals_match_pandas(prepared):
+    table = OrderHeaders.from_dataframe(prepared).table
+    expected = _expected(prepared)
+    assert table.index.equals(expected.index)
+    assert (table['Lines'] == expected['Lines']).all()
+    assert (table['Units'] == expected['Units']).all()
+    for column, expected_column in [('Sales', 'Sales'), ('Gross Sales', 'Gross'), ('Profit', 'Profit')]:
+        assert np.allclose(table[column], expected[expected_column])
+    assert np.allclose(table['Discount Amount'], expected['Gross'] - expected['Sales'])
+
+
+def test_unprepared_frame_and_missing_order_ids(raw):
+    frame = raw.head(300).copy()
+    frame.loc[frame.index[::10], 'Order ID'] = None
+    table = OrderHeaders.from_dataframe(frame).table
+    expected = _expected(frame)
+    assert table.index.equals(expected.index)
+    assert np.allclose(table['Sales'], expected['Sales'])
+    order_dates = pd.to_datetime(frame['Order Date'], format='%m/%d/%Y').groupby(frame['Order ID']).min()
+    assert (table['Order Date'] == order_dates).all()
+
+
+def test_order_header_total_is_sum_of_sales(prepared):
+    headers = OrderHeaders.from_dataframe(prepared)
+    order_id = 'CA-2014-145317'
+    header = headers.order(order_id)
+    lines = prepared[prepared['Order ID'] == order_id]
+    assert header.line_count() == len(lines)
+    assert np.isclose(header.discounted_total(), lines['Sales'].sum())
+    assert np.isclose(header.gross_total(), headers.table.loc[order_id, 'Gross Sales'])
+
+
+def test_empty_frame(prepared):
+    headers = OrderHeaders.from_dataframe(prepared.head(0))
+    assert len(headers) == 0
+    assert headers.basket_stats()['Orders'] == 0
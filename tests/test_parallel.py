@@ -0,0 +1,50 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from superstore.parallel import SharedFrame, _attach
+
+
+def test_blocks_are_created_once_across_threads(prepared):
+    frame = SharedFrame(len(prepared))
+    created = []
+    share = frame._share
+
+    def counted(name, array):
+        created.append(name)
+        return share(name, array)
+
+    frame._share = counted
+    start = threading.Barrier(8)
+
+    def aggregate(_):
+        start.wait()  # Every thread uses the frame for the first time together
+        return frame.groupby(prepared, ['Region', 'Category'], {'Sales': ('Sales', 'sum'),
+                                                                'Orders': ('Order ID', 'nunique')})
+
+    try:
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(pool.map(aggregate, range(8)))
+        assert sorted(map(str, created)) == sorted(map(str, set(created)))
+        assert len(created) == len(frame._blocks)
+        expected = prepared.groupby(['Region', 'Category'], observed=True).agg(
+            Sales=('Sales', 'sum'), Orders=('Order ID', 'nunique'))
+        for result in results:
+            pd.testing.assert_frame_equal(result, expected, check_dtype=False, check_index_type=False)
+    finally:
+        frame.close()
+
+
+def test_attach_leaves_the_resource_tracker_as_it_was():
+    from multiprocessing import resource_tracker
+
+    frame = SharedFrame(3)
+    register = resource_tracker.register
+    try:
+        name = frame._share('values', pd.Series([1.0, 2.0, 3.0]).to_numpy())[0]
+        block = _attach(name)
+        block.close()
+        assert resource_tracker.register is register
+    finally:
+        frame.close()
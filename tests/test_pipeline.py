@@ -0,0 +1,57 @@
+import glob
+
+import pytest
+
+from superstore import pipeline as pipeline_module
+from superstore.pipeline import Pipeline
+
+
+def _base(value):
+    return value
+
+
+def _pipeline(cache_dir, calls):
+    def double(value):
+        calls.append(value)
+        return value * 2
+
+    return Pipeline(cache_dir=cache_dir).add('base', _base, value=21).add('double', double, inputs=['base'])
+
+
+def test_results_come_from_disk(tmp_path):
+    calls = []
+    assert _pipeline(str(tmp_path), calls).run(['double']) == {'double': 42}
+    cached = _pipeline(str(tmp_path), calls)
+    assert cached.run(['double']) == {'double': 42}
+    assert len(calls) == 1 and cached.stats['double']['source'] == 'disk'
+    assert not glob.glob(f"{tmp_path}/*.tmp")
+
+
+def test_edited_code_is_recomputed(tmp_path, monkeypatch):
+    calls = []
+    _pipeline(str(tmp_path), calls).run(['double'])
+
+    def double(value):
+        return value + value  # Same stage name, edited body
+
+    edited = Pipeline(cache_dir=str(tmp_path)).add('base', _base, value=21).add('double', double, inputs=['base'])
+    edited.run(['double'])
+    assert edited.stats['double']['source'] == 'computed'
+
+    # Editing a helper module changes the package fingerprint
+    monkeypatch.setattr(pipeline_module, 'source_fingerprint', lambda: 'edited helper')
+    rerun = _pipeline(str(tmp_path), calls)
+    rerun.run(['double'])
+    assert rerun.stats['double']['source'] == 'computed' and len(calls) == 2
+
+
+@pytest.mark.parametrize('content', [b'', b'\x80\x05\x95', b'cno_such_module\nThing\n.'])
+def test_unreadable_cache_file_is_a_miss(tmp_path, content):
+    calls = []
+    _pipeline(str(tmp_path), calls).run(['double'])
+    for path in glob.glob(f"{tmp_path}/*.pkl"):
+        with open(path, 'wb') as file:
+            file.write(content)
+    rerun = _pipeline(str(tmp_path), calls)
+    assert rerun.run(['double']) == {'double': 42}
+    assert rerun.stats['double']['source'] == 'computed'
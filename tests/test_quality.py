@@ -0,0 +1,44 @@
+import numpy as np
+import pandas as pd
+
+from superstore.quality import CUSTOMER_ID_PATTERN, RULES, Validator, stateless_rules, validate, validate_csv
+
+from conftest import SAMPLE_CSV
+
+
+def test_counts_match_pandas(raw):
+    report = validate(raw)
+    record_columns = [column for column in raw.columns if column != 'Row ID']
+    assert report.loc['Duplicate rows', 'Violations'] == raw.duplicated(record_columns).sum()
+    assert report.loc['Duplicate Row ID', 'Violations'] == raw['Row ID'].duplicated().sum()
+    malformed = ~raw['Customer ID'].str.fullmatch(CUSTOMER_ID_PATTERN) & raw['Customer ID'].notna()
+    assert report.loc['Malformed Customer ID', 'Violations'] == malformed.sum()
+    discount = (raw['Discount'] < 0) | (raw['Discount'] > 1)
+    assert report.loc['Discount outside [0, 1]', 'Violations'] == discount.sum()
+
+
+def test_chunked_equals_whole(raw):
+    whole = validate(raw)
+    pd.testing.assert_frame_equal(whole, validate(raw, chunksize=777))
+    pd.testing.assert_frame_equal(whole, validate_csv(SAMPLE_CSV, chunksize=1000))
+
+
+def test_duplicates_across_chunks(raw):
+    frame = pd.concat([raw.head(100), raw.head(100)], ignore_index=True)
+    report = validate(frame, rules=['Duplicate Row ID', 'Duplicate rows'], chunksize=30)
+    assert report['Violations'].tolist() == [100, 100]
+    assert report.loc['Duplicate Row ID', 'Sample Row IDs'] == raw['Row ID'].head(5).tolist()
+
+
+def test_empty_and_missing_values(raw):
+    frame = raw.head(50).copy()
+    frame.loc[frame.index[:3], 'Order ID'] = np.nan
+    assert validate(frame).loc['Missing key values', 'Violations'] == 3
+    assert validate(raw.head(0))['Violations'].sum() == 0
+
+
+def test_stateless_rules_leave_out_duplicates():
+    names = stateless_rules()
+    assert 'Duplicate rows' not in names and 'Duplicate Row ID' not in names
+    assert all(not RULES[name].stateful for name in names)
+    assert Validator(names).rule_names == names
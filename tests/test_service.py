@@ -0,0 +1,58 @@
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from superstore.service import QueryError, QueryService, make_handler
+
+
+@pytest.fixture(scope='module')
+def service(prepared):
+    return QueryService(prepared)
+
+
+def test_groupby_matches_pandas(service, prepared):
+    result = service.query({'report': 'groupby', 'by': 'Region', 'measures': 'Sales', 'aggfunc': 'mean'})
+    expected = prepared.groupby('Region', observed=True)['Sales'].mean()
+    assert {row['Region']: row['Sales'] for row in result['result']} == pytest.approx(expected.to_dict())
+
+
+@pytest.mark.parametrize('report', ['groupby', 'pivot', 'timeseries'])
+def test_unknown_aggfunc_is_a_query_error(service, report):
+    with pytest.raises(QueryError, match='aggfunc'):
+        service.query({'report': report, 'aggfunc': 'nonsense'})
+
+
+def test_bad_query_is_http_400(service):
+    async def request(target):
+        reader = asyncio.StreamReader()
+        reader.feed_data(f"GET {target} HTTP/1.1\r\n\r\n".encode('latin-1'))
+        reader.feed_eof()
+        sent = []
+
+        class Writer:
+            def write(self, data):
+                sent.append(data)
+
+            async def drain(self):
+                pass
+
+            def close(self):
+                pass
+
+        await make_handler(service)(reader, Writer())
+        return b''.join(sent).decode('utf-8')
+
+    response = asyncio.run(request('/query?report=groupby&aggfunc=nonsense'))
+    assert response.startswith('HTTP/1.1 400')
+    assert 'aggfunc' in json.loads(response.split('\r\n\r\n', 1)[1])['error']
+
+
+def test_query_count_from_many_threads(prepared):
+    service = QueryService(prepared)
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(lambda n: service.query({'report': 'kpi', 'region': ['West', 'East'][n % 2]}), range(400)))
+    stats = service.stats()
+    assert stats['queries'] == 400
+    assert stats['cache_hits'] + stats['cache_misses'] == 400
@@ -0,0 +1,81 @@
+import numpy as np
+import pandas as pd
+
+from superstore.sketches import HyperLogLog, distinct_count, grouped_distinct_count
+
+
+def test_distinct_count_exact_and_approximate(prepared):
+    exact = prepared['Customer ID'].nunique()
+    assert distinct_count(prepared['Customer ID']) == exact
+    assert abs(distinct_count(prepared['Customer ID'], approximate=True) - exact) <= 0.05 * exact
+
+
+def test_grouped_approximate_matches_one_sketch_per_group(prepared):
+    approximate = grouped_distinct_count(prepared, 'Region', 'Order ID', approximate=True)
+    exact = grouped_distinct_count(prepared, 'Region', 'Order ID')
+    assert approximate.index.equals(exact.index)
+    for region, orders in prepared.groupby('Region')['Order ID']:
+        assert approximate[region] == HyperLogLog().add(orders).count()
+    assert np.all(np.abs(approximate - exact) <= 0.05 * exact)
+
+
+def test_grouped_approximate_with_missing_keys_and_values(prepared):
+    frame = prepared[['Customer ID', 'Customer Name', 'Order ID']].copy()
+    frame.loc[frame.index[::5], 'Customer ID'] = None
+    frame.loc[frame.index[::13], 'Order ID'] = None
+    exact = grouped_distinct_count(frame, ['Customer ID', 'Customer Name'], 'Order ID')
+    approximate = grouped_distinct_count(frame, ['Customer ID', 'Customer Name'], 'Order ID', approximate=True)
+    assert approximate.index.equals(exact.index)
+    # Small groups are counted exactly by linear counting
+    assert (approximate == exact).mean() > 0.99
+
+
+def test_grouped_approximate_many_groups_stays_small():
+    # 200k groups would need 200k x 16 KB of dense registers
+    frame = pd.DataFrame({'key': np.arange(400_000) // 2, 'value': np.arange(400_000) % 3})
+    result = grouped_distinct_count(frame, 'key', 'value', approximate=True)
+    assert len(result) == 200_000
+    assert (result == 2).all()
+
+
+def test_space_saving_matches_exact_top_k(raw):
+    from superstore.sketches import SpaceSaving, stream_heavy_hitters
+    from conftest import SAMPLE_CSV
+
+    exact = raw.groupby('Product Name')['Profit'].sum().sort_values(ascending=False)
+    # Enough counters for every product: the sketch is exact
+    top = SpaceSaving(capacity=raw['Product Name'].nunique()).update(raw['Product Name'], raw['Profit']).top(10)
+    assert list(top.index) == list(exact.index[:10])
+    assert np.allclose(top['Positive Estimate'], exact.iloc[:10])
+
+    # Few counters, streamed in chunks: estimates bound the truth and guaranteed items are in the true top 10
+    top = stream_heavy_hitters(SAMPLE_CSV, chunksize=1000, tracked=[('Product Name', 'Profit')],
+                               capacity=60).top('Product Name', 'Profit', 10)
+    # The bounds apply to the positive part of each chunk's net total (see SpaceSaving)
+    chunk_totals = raw.groupby([np.arange(len(raw)) // 1000, 'Product Name'])['Profit'].sum().clip(lower=0)
+    positive = chunk_totals.groupby('Product Name').sum().sort_values(ascending=False)
+    truth = positive.reindex(top.index)
+    assert (top['Positive Estimate'] >= truth - 1e-6).all() and (top['Positive Lower Bound'] <= truth + 1e-6).all()
+    assert set(top.index[top['Guaranteed']]) <= set(positive.index[:10])
+
+
+def test_space_saving_bounds_positive_totals_when_the_sign_changes():
+    from superstore.sketches import SpaceSaving
+
+    summary = SpaceSaving(capacity=2)
+    summary.update(['swing', 'steady'], [100.0, 30.0])
+    summary.update(['swing', 'steady'], [-80.0, 30.0])
+    top = summary.top(2)
+    # Net profit: swing 20, steady 60. The sketch bounds the positive totals (100 and 60), so it ranks swing first
+    assert 'Estimate' not in top.columns and 'Lower Bound' not in top.columns
+    assert top['Positive Estimate'].to_dict() == {'swing': 100.0, 'steady': 60.0}
+    assert top['Positive Lower Bound'].to_dict() == {'swing': 100.0, 'steady': 60.0}
+
+
+def test_service_topk(prepared):
+    from superstore.service import QueryService
+
+    result = QueryService(prepared).query({'report': 'topk', 'key': 'Customer Name', 'measures': 'Sales',
+                                           'k': '3', 'capacity': '1000', 'region': 'West'})
+    west = prepared[prepared['Region'] == 'West'].groupby('Customer Name')['Sales'].sum().nlargest(3)
+    assert [row['Customer Name'] for row in result['result']['Sales']] == list(west.index)
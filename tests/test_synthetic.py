@@ -0,0 +1,51 @@
+import os
+
+import pandas as pd
+import pytest
+
+from superstore.quality import CUSTOMER_ID_PATTERN, validate
+from superstore.synthetic import GENERATOR_VERSION, SyntheticProfile, generate, write_synthetic
+
+from conftest import SAMPLE_CSV
+
+
+@pytest.fixture(scope='module')
+def profile():
+    return SyntheticProfile.from_csv(SAMPLE_CSV)
+
+
+def test_generated_ids_are_well_formed(profile):
+    data = generate(60_000, seed=3, chunk_rows=20_000, profile=profile)
+    report = validate(data, rules=['Malformed Customer ID', 'Malformed Order ID', 'Malformed Product ID'])
+    # Only reference customers whose own ID is malformed (e.g. Co-12640) may be reported
+    inherited = ~data['Customer ID'].str.fullmatch(CUSTOMER_ID_PATTERN)
+    assert data.loc[inherited, 'Customer ID'].isin(profile.customer_ids).all()
+    assert report['Violations'].tolist() == [inherited.sum(), 0, 0]
+
+    # New customers get IDs no reference customer uses, one name per ID, initials matching the name
+    new = data[~data['Customer ID'].isin(profile.customer_ids)]
+    assert data['Customer ID'].nunique() > len(profile.customer_ids)
+    assert (data.groupby('Customer ID')['Customer Name'].nunique() == 1).all()
+    initials = new['Customer Name'].str.split().map(lambda parts: parts[0][0] + parts[-1][0])
+    assert (new['Customer ID'].str[:2] == initials).all()
+
+
+def test_too_many_customers_for_the_id_format(profile):
+    rows = int(profile.reference_rows * profile.max_customers / len(profile.customer_ids)) * 2
+    with pytest.raises(ValueError, match='Customer ID format'):
+        profile.cardinalities(rows)
+
+
+def test_files_appear_only_when_complete(profile, tmp_path):
+    from superstore.benchmark import prepare_datasets
+
+    path = tmp_path / 'synthetic.csv'
+    write_synthetic(str(path), 2_000, seed=1, workers=1, chunk_rows=500, profile=profile)
+    assert [p.name for p in tmp_path.iterdir()] == ['synthetic.csv']
+    assert len(pd.read_csv(path, encoding='latin-1')) == 2_000
+
+    # A leftover file from an older generator (or an interrupted run under the old name) is not reused
+    (tmp_path / 'synthetic_1000_seed0.csv').write_text('Row ID\n1\n')
+    paths = prepare_datasets([1_000], str(tmp_path), workers=1)
+    assert os.path.basename(paths[1_000]) == f'synthetic_1000_seed0_v{GENERATOR_VERSION}.csv'
+    assert len(pd.read_csv(paths[1_000], encoding='latin-1')) == 1_000
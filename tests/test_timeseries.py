@@ -0,0 +1,71 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from superstore.service import QueryService
+from superstore.timeseries import growth_rate, mom_growth, period_table, rolling_sum, yoy_growth
+
+
+def _expected(frame, by='Category', value='Profit', freq='M'):
+    periods = pd.to_datetime(frame['Order Date'], format='%m/%d/%Y').dt.to_period(freq)
+    table = frame.groupby([periods, frame[by]])[value].sum().unstack(by, fill_value=0)
+    return table.reindex(pd.period_range(periods.min(), periods.max(), freq=freq), fill_value=0)
+
+
+def test_period_table_matches_pandas(raw, prepared):
+    expected = _expected(raw)
+    for frame in (raw, prepared):
+        table = period_table(frame)
+        assert table.index.equals(expected.index)
+        assert np.allclose(table.to_numpy(), expected.to_numpy())
+
+
+def test_growth_matches_pct_change(prepared):
+    table = period_table(prepared, freq='quarterly')
+    expected = table.pct_change(fill_method=None).replace([np.inf, -np.inf], np.nan) * 100
+    pd.testing.assert_frame_equal(mom_growth(table), expected, check_freq=False)
+    expected = table.pct_change(4, fill_method=None).replace([np.inf, -np.inf], np.nan) * 100
+    pd.testing.assert_frame_equal(yoy_growth(table), expected, check_freq=False)
+    assert np.allclose(rolling_sum(table, 2).to_numpy()[1:], table.rolling(2).sum().to_numpy()[1:])
+
+
+def test_zero_and_negative_lag(prepared):
+    table = period_table(prepared)
+    growth = growth_rate(table, lag=0)
+    assert ((growth == 0) | growth.isna()).all().all()
+    with pytest.raises(ValueError):
+        growth_rate(table, lag=-1)
+
+
+def test_empty_selection(prepared):
+    assert period_table(prepared.head(0)).empty
+    service = QueryService(prepared)
+    result = service.query({'report': 'timeseries', 'region': 'Nowhere'})
+    assert result['rows'] == 0
+    assert result['result'] == {'Sales': [], 'Profit': []}
+
+
+@pytest.mark.parametrize('window', [0, -2])
+def test_rolling_window_must_be_positive(raw, window):
+    with pytest.raises(ValueError, match='window'):
+        rolling_sum(period_table(raw), window)
+
+
+def test_daily_yoy_compares_calendar_dates():
+    days = pd.period_range('2015-01-01', '2017-12-31', freq='D')
+    table = pd.DataFrame({'Sales': np.arange(len(days), dtype=float) + 1}, index=days)
+    growth = yoy_growth(table)['Sales']
+    sales = table['Sales']
+    # After the 2016 leap day, 1 March still lines up with 1 March (a 365-row shift would give 2 March)
+    for day, year_ago in [('2016-03-01', '2015-03-01'), ('2017-03-01', '2016-03-01'),
+                          ('2016-02-29', '2015-02-28'), ('2017-12-31', '2016-12-31')]:
+        today, before = sales[pd.Period(day, 'D')], sales[pd.Period(year_ago, 'D')]
+        assert growth[pd.Period(day, 'D')] == pytest.approx((today - before) / before * 100)
+    assert np.isnan(growth[pd.Period('2015-12-31', 'D')])
+
+
+def test_monthly_trend_keeps_the_task4_label(prepared):
+    from superstore import reports
+
+    wide, growth = reports.monthly_trend(prepared)
+    assert wide.index.name == 'Year-Month' and growth.index.name == 'Year-Month'
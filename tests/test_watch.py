@@ -0,0 +1,68 @@
+import pandas as pd
+
+from superstore import reports
+from superstore.loader import load_superstore, prepare_dataset
+from superstore.watch import DatasetWatcher
+
+from conftest import SAMPLE_CSV
+
+
+def _write(path, lines):
+    with open(path, 'wb') as file:
+        file.writelines(lines)
+
+
+def _sample_lines(rows=600):
+    with open(SAMPLE_CSV, 'rb') as file:
+        return [file.readline() for _ in range(rows + 1)]
+
+
+def test_results_match_reports_and_only_affected_rerun(tmp_path):
+    path = str(tmp_path / 'data.csv')
+    lines = _sample_lines()
+    _write(path, lines)
+    watcher = DatasetWatcher(path, report_names=['discount', 'kpi'], chunk_rows=100)
+    assert watcher.refresh() == ['discount', 'kpi']
+    pd.testing.assert_frame_equal(watcher.results['discount'], reports.discount(prepare_dataset(load_superstore(path))))
+
+    # Change one Discount value: the KPI block does not read Discount
+    fields = lines[250].decode('latin-1').rsplit(',', 2)
+    lines[250] = (fields[0] + ',0.45,' + fields[2]).encode('latin-1')
+    _write(path, lines)
+    assert watcher.refresh() == ['discount']
+    pd.testing.assert_frame_equal(watcher.results['discount'], reports.discount(prepare_dataset(load_superstore(path))))
+    assert watcher.refresh() == []
+
+
+def test_header_change_invalidates_chunks(tmp_path):
+    path = str(tmp_path / 'data.csv')
+    lines = _sample_lines()
+    _write(path, lines)
+    watcher = DatasetWatcher(path, report_names=['profile', 'discount'], chunk_rows=100)
+    watcher.refresh()
+
+    # Only the header changes: a column is renamed
+    lines[0] = lines[0].replace(b'Row ID', b'Row Number')
+    _write(path, lines)
+    assert watcher.refresh() == ['profile']
+    assert 'Row Number' in watcher.dataframe.columns and 'Row ID' not in watcher.dataframe.columns
+
+
+def test_removing_every_partition_clears_results(tmp_path):
+    lines = _sample_lines()
+    _write(str(tmp_path / 'part1.csv'), lines[:301])
+    _write(str(tmp_path / 'part2.csv'), lines[:1] + lines[301:])
+    watcher = DatasetWatcher(str(tmp_path), report_names=['discount', 'kpi'], chunk_rows=100)
+    watcher.refresh()
+    assert len(watcher.dataframe) == 600
+
+    for path in tmp_path.iterdir():
+        path.unlink()
+    assert watcher.refresh() == ['discount', 'kpi']
+    assert watcher.dataframe is None and watcher.results == {}
+    assert watcher.refresh() == []
+
+    # Data coming back is picked up again
+    _write(str(tmp_path / 'part1.csv'), lines[:301])
+    assert watcher.refresh() == ['discount', 'kpi']
+    assert len(watcher.dataframe) == 300 and set(watcher.results) == {'discount', 'kpi'}